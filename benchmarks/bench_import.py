@@ -0,0 +1,102 @@
+# bench_import.py
+"""
+Cold-start import benchmark.
+
+Imports each module in a fresh interpreter several times and reports the
+median import latency, plus which heavy dependencies got pulled in. With
+--check it exits non-zero if a module loads a dependency it should defer.
+
+    python benchmarks/bench_import.py --repeat 7 --json import_times.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY = ("tkinter", "docx", "matplotlib", "numpy")
+
+# Heavy modules each target must not import at module load time
+FORBIDDEN = {
+    "cocomo": ("tkinter", "docx", "matplotlib", "numpy"),
+    "report": ("tkinter", "docx", "matplotlib"),
+    "graph": ("tkinter", "docx", "matplotlib"),
+    "data_handler": ("tkinter", "docx", "matplotlib"),
+    "cli": ("tkinter", "docx", "matplotlib"),
+    "gui": ("docx", "matplotlib"),
+}
+
+PROBE = """
+import json, sys, time
+t = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - t
+print(json.dumps({{"seconds": elapsed, "loaded": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def measure(module, repeat):
+    """
+    Import module in repeat fresh interpreters; return median ms and loaded heavy deps.
+    """
+    code = PROBE.format(module=module, heavy=HEAVY)
+    times, loaded = [], []
+    for _ in range(repeat):
+        proc = subprocess.run([sys.executable, "-c", code], cwd=ROOT,
+                              capture_output=True, text=True)
+        if proc.returncode != 0:
+            return {"error": proc.stderr.strip().splitlines()[-1]}
+        result = json.loads(proc.stdout)
+        times.append(result["seconds"] * 1000)
+        loaded = result["loaded"]
+    return {
+        "median_ms": round(statistics.median(times), 2),
+        "min_ms": round(min(times), 2),
+        "loaded": loaded,
+    }
+
+
+def run(modules, repeat):
+    return {module: measure(module, repeat) for module in modules}
+
+
+def violations(results):
+    found = []
+    for module, result in results.items():
+        for dep in result.get("loaded", []):
+            if dep in FORBIDDEN.get(module, ()):
+                found.append(f"{module} imports {dep} at startup")
+    return found
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Cold-start import benchmark")
+    parser.add_argument("modules", nargs="*", default=list(FORBIDDEN))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--check", action="store_true", help="fail if a deferred dependency is imported")
+    args = parser.parse_args(argv)
+
+    results = run(args.modules, args.repeat)
+    for module, result in results.items():
+        if "error" in result:
+            print(f"{module:<14} error: {result['error']}")
+        else:
+            loaded = ", ".join(result["loaded"]) or "-"
+            print(f"{module:<14} {result['median_ms']:>9.2f} ms  (min {result['min_ms']:.2f})  heavy: {loaded}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+    problems = violations(results)
+    for problem in problems:
+        print(f"FAIL: {problem}", file=sys.stderr)
+    return 1 if args.check and problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
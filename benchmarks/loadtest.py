@@ -0,0 +1,125 @@
+# loadtest.py
+"""
+Load test for the local estimation service (server.py).
+
+Opens --concurrency keep-alive connections that each send POST /estimate
+requests back to back, then reports p50/p99 latency and requests per second.
+Without --url an in-process server is started on a free port.
+
+    python benchmarks/loadtest.py --requests 20000 --concurrency 64
+    python benchmarks/loadtest.py --url 127.0.0.1:8765
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+TYPES = ("organic", "semi-detached", "embedded")
+RATINGS = ("Low", "Nominal", "High")
+
+
+def make_request(host, rng):
+    body = json.dumps({
+        "kloc": round(rng.uniform(1, 500), 2),
+        "project_type": rng.choice(TYPES),
+        "RELY": rng.choice(RATINGS),
+        "ACAP": rng.choice(RATINGS),
+    }).encode()
+    return (f"POST /estimate HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n\r\n").encode() + body
+
+
+async def read_response(reader):
+    status_line = await reader.readline()
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        if line.lower().startswith(b"content-length:"):
+            length = int(line.split(b":")[1])
+    await reader.readexactly(length)
+    return int(status_line.split()[1])
+
+
+async def client(host, port, count, latencies, errors, seed):
+    rng = random.Random(seed)
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for _ in range(count):
+            request = make_request(host, rng)
+            start = time.perf_counter()
+            writer.write(request)
+            status = await read_response(reader)
+            latencies.append(time.perf_counter() - start)
+            if status != 200:
+                errors.append(status)
+    finally:
+        writer.close()
+
+
+async def run(host, port, total, concurrency):
+    latencies, errors = [], []
+    per_client = [total // concurrency + (1 if i < total % concurrency else 0) for i in range(concurrency)]
+    start = time.perf_counter()
+    await asyncio.gather(*(client(host, port, n, latencies, errors, i) for i, n in enumerate(per_client) if n))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    p99_index = min(len(latencies) - 1, int(len(latencies) * 0.99))
+    return {
+        "requests": len(latencies),
+        "errors": len(errors),
+        "concurrency": concurrency,
+        "seconds": round(elapsed, 3),
+        "rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(statistics.median(latencies) * 1000, 3),
+        "p99_ms": round(latencies[p99_index] * 1000, 3),
+    }
+
+
+async def run_in_process(total, concurrency, max_batch, max_delay):
+    from server import EstimationServer
+
+    server = await EstimationServer("127.0.0.1", 0, max_batch, max_delay).start()
+    try:
+        result = await run("127.0.0.1", server.port, total, concurrency)
+        result["micro_batches"] = server.batcher.batches
+    finally:
+        await server.stop()
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load test for server.py")
+    parser.add_argument("--url", help="host:port of a running server (default: start one in-process)")
+    parser.add_argument("--requests", type=int, default=10_000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--max-batch", type=int, default=1024)
+    parser.add_argument("--max-delay-ms", type=float, default=2.0)
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args(argv)
+
+    if args.url:
+        host, _, port = args.url.rpartition(":")
+        result = asyncio.run(run(host or "127.0.0.1", int(port), args.requests, args.concurrency))
+    else:
+        result = asyncio.run(run_in_process(args.requests, args.concurrency,
+                                            args.max_batch, args.max_delay_ms / 1000))
+
+    for key, value in result.items():
+        print(f"{key:<14} {value}")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(result, f, indent=2)
+    return 1 if result["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
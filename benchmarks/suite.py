@@ -0,0 +1,272 @@
+# suite.py
+"""
+Reproducible benchmark suite.
+
+Times the hot paths of the calculator - scalar estimation, EAF over many
+driver vectors, chart rendering, DOCX report generation - plus cold-start
+import time, and writes the results as JSON. With --compare it checks a run
+against a saved baseline and exits non-zero on regressions.
+
+    python benchmarks/suite.py --json baseline.json
+    python benchmarks/suite.py --compare baseline.json --threshold 0.15
+    python benchmarks/suite.py scalar_effort eaf_vectorized
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import bench_import  # noqa: E402  (sibling module in benchmarks/)
+
+TYPES = ("organic", "semi-detached", "embedded")
+SEED = 1981
+EAF_VECTORS = 100_000
+LARGE_DRIVER_TABLE = 500
+
+
+def random_drivers(rng, catalogue):
+    """A random rating for every driver in the catalogue."""
+    return {driver: rng.choice(list(catalogue.table[driver])) for driver in catalogue.drivers}
+
+
+def random_multipliers(rng, catalogue):
+    """Driver -> multiplier value, as the GUI passes to calculate_effort."""
+    return {driver: catalogue.table[driver][level] for driver, level in random_drivers(rng, catalogue).items()}
+
+
+class Benchmark:
+    """
+    A named case: setup() runs once untimed and returns the state passed to
+    run(state); each timed run performs `ops` operations.
+    """
+
+    def __init__(self, name, setup, run, ops=1, repeat=7):
+        self.name = name
+        self.setup = setup
+        self.run = run
+        self.ops = ops
+        self.repeat = repeat
+
+
+def _scalar_setup():
+    from cocomo import COCOMO
+    from data_handler import load_catalogue
+
+    rng = random.Random(SEED)
+    catalogue = load_catalogue()
+    inputs = [(rng.uniform(1, 500), rng.choice(TYPES), random_multipliers(rng, catalogue))
+              for _ in range(10_000)]
+    return COCOMO(), inputs
+
+
+def _scalar_run(state):
+    cocomo, inputs = state
+    for kloc, project_type, drivers in inputs:
+        cocomo.calculate_effort(kloc, project_type, drivers)
+
+
+def _eaf_setup():
+    from data_handler import load_catalogue
+
+    rng = random.Random(SEED)
+    catalogue = load_catalogue()
+    return catalogue, [random_drivers(rng, catalogue) for _ in range(EAF_VECTORS)]
+
+
+def _eaf_scalar_run(state):
+    catalogue, vectors = state
+    table = catalogue.table
+    for drivers in vectors:
+        eaf = 1.0
+        for driver, level in drivers.items():
+            eaf *= table[driver][level]
+
+
+def _eaf_encode_run(state):
+    catalogue, vectors = state
+    catalogue.encode_many(vectors)
+
+
+def _eaf_codes_setup():
+    catalogue, vectors = _eaf_setup()
+    return catalogue, catalogue.encode_many(vectors)
+
+
+def _eaf_vectorized_run(state):
+    catalogue, codes = state
+    catalogue.eaf(codes)
+
+
+def _plot_setup():
+    import matplotlib
+    matplotlib.use("Agg")
+    import graph
+
+    results = {"Effort (PM)": 302.1, "Development Time (Months)": 16.4, "Average Staff": 18.4}
+    path = os.path.join(tempfile.mkdtemp(prefix="cocomo-bench-"), "graph.png")
+    graph.plot_results(results, "warmup", save_path=path)
+    return graph, results, path
+
+
+def _plot_run(state):
+    graph, results, path = state
+    graph.plot_results(results, "Benchmark", save_path=path)
+
+
+def _report_setup(driver_count):
+    def setup():
+        from cocomo import COCOMO
+        from data_handler import load_catalogue
+        import report
+
+        catalogue = load_catalogue()
+        rng = random.Random(SEED)
+        cocomo = COCOMO()
+        multipliers = random_multipliers(rng, catalogue)
+        results = cocomo.calculate_effort(120, "semi-detached", multipliers)
+        # Large tables repeat the catalogue under numbered names
+        items = list(multipliers.items())
+        drivers = {(name if i < len(items) else f"{name} #{i // len(items)}"): value
+                   for i, (name, value) in ((i, items[i % len(items)]) for i in range(driver_count))}
+        output_dir = tempfile.mkdtemp(prefix="cocomo-bench-")
+        report.generate_report("warmup", "semi-detached", 120, results, drivers, cocomo, output_dir=output_dir)
+        return report, cocomo, results, drivers, output_dir
+    return setup
+
+
+def _report_run(state):
+    report, cocomo, results, drivers, output_dir = state
+    report.generate_report("Benchmark", "semi-detached", 120, results, drivers, cocomo,
+                           output_dir=output_dir, filename="benchmark.docx")
+
+
+BENCHMARKS = [
+    Benchmark("scalar_effort", _scalar_setup, _scalar_run, ops=10_000),
+    Benchmark("eaf_scalar", _eaf_setup, _eaf_scalar_run, ops=EAF_VECTORS, repeat=5),
+    Benchmark("eaf_encode", _eaf_setup, _eaf_encode_run, ops=EAF_VECTORS, repeat=5),
+    Benchmark("eaf_vectorized", _eaf_codes_setup, _eaf_vectorized_run, ops=EAF_VECTORS),
+    Benchmark("plot_results", _plot_setup, _plot_run),
+    Benchmark("report_small", _report_setup(15), _report_run),
+    Benchmark("report_large", _report_setup(LARGE_DRIVER_TABLE), _report_run, repeat=5),
+]
+
+
+def time_benchmark(bench, repeat=None):
+    try:
+        state = bench.setup()
+    except ImportError as e:
+        return {"error": f"missing dependency: {e.name}"}
+    bench.run(state)  # warm-up
+    times = []
+    for _ in range(repeat or bench.repeat):
+        t = time.perf_counter()
+        bench.run(state)
+        times.append((time.perf_counter() - t) * 1000)
+    median = statistics.median(times)
+    return {
+        "median_ms": round(median, 3),
+        "min_ms": round(min(times), 3),
+        "ops": bench.ops,
+        "us_per_op": round(median * 1000 / bench.ops, 3),
+    }
+
+
+def time_startup(repeat):
+    """Cold import of each module, reported as startup_<module> cases."""
+    results = {}
+    for module, result in bench_import.run(list(bench_import.FORBIDDEN), repeat).items():
+        if "error" in result:
+            results[f"startup_{module}"] = result
+        else:
+            results[f"startup_{module}"] = {"median_ms": result["median_ms"], "min_ms": result["min_ms"], "ops": 1}
+    return results
+
+
+def run(names=None, repeat=None, startup=True):
+    results = {}
+    for bench in BENCHMARKS:
+        if names and bench.name not in names:
+            continue
+        results[bench.name] = time_benchmark(bench, repeat)
+        print(format_result(bench.name, results[bench.name]))
+    if startup and (not names or "startup" in names):
+        for name, result in time_startup(repeat or 5).items():
+            results[name] = result
+            print(format_result(name, result))
+    return {
+        "meta": {
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "results": results,
+    }
+
+
+def format_result(name, result):
+    if "error" in result:
+        return f"{name:<22} error: {result['error']}"
+    return f"{name:<22} {result['median_ms']:>10.3f} ms  (min {result['min_ms']:.3f}, ops {result['ops']})"
+
+
+def compare(current, baseline, threshold):
+    """
+    Compare median times case by case. Returns (rows, regressions) where a
+    regression is a case slower than the baseline by more than threshold.
+    """
+    rows, regressions = [], []
+    for name, result in current["results"].items():
+        base = baseline["results"].get(name)
+        if base is None or "median_ms" not in base or "median_ms" not in result:
+            continue
+        ratio = result["median_ms"] / base["median_ms"] if base["median_ms"] else float("inf")
+        row = (name, base["median_ms"], result["median_ms"], ratio)
+        rows.append(row)
+        if ratio > 1 + threshold:
+            regressions.append(row)
+    return rows, regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="COCOMO benchmark suite")
+    parser.add_argument("cases", nargs="*", help="benchmark names to run (default: all; 'startup' for imports)")
+    parser.add_argument("--repeat", type=int, help="override the per-case repeat count")
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--compare", metavar="BASELINE", help="flag regressions against a saved JSON run")
+    parser.add_argument("--threshold", type=float, default=0.10, help="allowed slowdown before failing (default: 0.10)")
+    parser.add_argument("--no-startup", action="store_true", help="skip the import-time cases")
+    args = parser.parse_args(argv)
+
+    current = run(args.cases, args.repeat, startup=not args.no_startup)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(current, f, indent=2)
+
+    if not args.compare:
+        return 0
+
+    with open(args.compare) as f:
+        baseline = json.load(f)
+    rows, regressions = compare(current, baseline, args.threshold)
+    print(f"\n{'case':<22} {'baseline':>10} {'current':>10} {'change':>8}")
+    for name, base, now, ratio in rows:
+        flag = "  REGRESSION" if ratio > 1 + args.threshold else ""
+        print(f"{name:<22} {base:>10.3f} {now:>10.3f} {ratio - 1:>+8.1%}{flag}")
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) above {args.threshold:.0%}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,84 @@
+# cache.py
+import threading
+from collections import OrderedDict
+
+
+class EstimateCache:
+    """
+    Bounded LRU memoization cache for COCOMO.calculate_effort.
+
+    Keys are canonical tuples of (KLOC, project type, sorted driver
+    multipliers, coefficients of that type), so a change to the
+    coefficients or to the multiplier table produces new keys and stale
+    entries are never returned; they simply age out. Thread safe, so one
+    instance can be shared by the GUI, report workers and batch callers.
+    """
+
+    def __init__(self, maxsize=4096):
+        if maxsize <= 0:
+            raise ValueError("Cache size must be positive")
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(kloc, project_type, cost_drivers, coefficients):
+        """
+        Canonical key for one estimate. Raises ValueError/TypeError if an
+        input cannot be normalised; callers then skip the cache.
+        """
+        drivers = tuple(sorted((str(d), float(v)) for d, v in cost_drivers.items()))
+        return (float(kloc), project_type, drivers, tuple(coefficients))
+
+    def get(self, key):
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+        }
+
+
+_SHARED = None
+
+
+def shared_cache():
+    """
+    Process-wide cache instance shared by the GUI, reports and batch callers.
+    """
+    global _SHARED
+    if _SHARED is None:
+        _SHARED = EstimateCache()
+    return _SHARED
@@ -0,0 +1,198 @@
+# calibration.py
+"""
+Calibrate COCOMO coefficients from historical actuals.
+
+Per project type, fits log-space least squares
+    ln(Effort / EAF) = ln a + b * ln KLOC
+    ln Time          = ln c + d * ln Effort
+by streaming the history in chunks and accumulating the normal-equation
+sums, so arbitrarily large datasets are never loaded at once.
+
+    python calibration.py history.csv.gz -o coefficients.json
+
+Rows need kloc, project_type and actual_effort; actual_months is optional
+(rows without it only contribute to a and b). EAF comes from an "eaf"
+column or from driver rating columns, as in cli.py.
+"""
+import argparse
+import hashlib
+import json
+import math
+import sys
+from datetime import datetime
+
+import numpy as np
+
+from cli import chunked, detect_format, open_input, read_records
+from cocomo import COCOMO, PROJECT_TYPES, save_coefficients
+from data_handler import compile_catalogue
+
+
+class _NormalEquations:
+    """
+    Running sums for simple linear regression y = intercept + slope * x,
+    one row per project type.
+    """
+
+    def __init__(self, groups):
+        self.n = np.zeros(groups)
+        self.sx = np.zeros(groups)
+        self.sy = np.zeros(groups)
+        self.sxx = np.zeros(groups)
+        self.sxy = np.zeros(groups)
+
+    def update(self, group, x, y):
+        size = len(self.n)
+        self.n += np.bincount(group, minlength=size)
+        self.sx += np.bincount(group, weights=x, minlength=size)
+        self.sy += np.bincount(group, weights=y, minlength=size)
+        self.sxx += np.bincount(group, weights=x * x, minlength=size)
+        self.sxy += np.bincount(group, weights=x * y, minlength=size)
+
+    def solve(self, i):
+        """
+        (intercept, slope) for group i, or None if x has no spread.
+        """
+        n = self.n[i]
+        denom = n * self.sxx[i] - self.sx[i] ** 2
+        if n < 2 or denom <= 1e-12 * max(1.0, n * self.sxx[i]):
+            return None
+        slope = (n * self.sxy[i] - self.sx[i] * self.sy[i]) / denom
+        intercept = (self.sy[i] - slope * self.sx[i]) / n
+        return intercept, slope
+
+
+class Calibrator:
+    """
+    Streaming fitter for per-project-type (a, b, c, d) coefficients.
+    """
+
+    def __init__(self, cocomo=None, catalogue=None, min_samples=3):
+        self.cocomo = cocomo or COCOMO()
+        self.catalogue = catalogue or compile_catalogue()
+        self.min_samples = min_samples
+        self.effort_fit = _NormalEquations(len(PROJECT_TYPES))
+        self.time_fit = _NormalEquations(len(PROJECT_TYPES))
+        self.rows = 0
+
+    def update(self, kloc, project_types, eaf, effort, time=None):
+        """
+        Add one chunk of actuals given as arrays. time may be None or contain
+        NaN for projects without a recorded duration.
+        """
+        kloc = np.asarray(kloc, dtype=float)
+        eaf = np.asarray(eaf, dtype=float)
+        effort = np.asarray(effort, dtype=float)
+        codes = self.cocomo.encode_project_types(project_types)
+        finite = np.isfinite(kloc) & np.isfinite(eaf) & np.isfinite(effort)
+        bad = ~finite | (kloc <= 0) | (eaf <= 0) | (effort <= 0)
+        if bad.any():
+            row = self.rows + int(np.argmax(bad)) + 1
+            raise ValueError(f"Row {row}: KLOC, EAF and effort must be positive finite numbers")
+
+        log_effort = np.log(effort)
+        self.effort_fit.update(codes, np.log(kloc), log_effort - np.log(eaf))
+
+        if time is not None:
+            time = np.asarray(time, dtype=float)
+            known = np.isfinite(time) & (time > 0)
+            if known.any():
+                self.time_fit.update(codes[known], log_effort[known], np.log(time[known]))
+        self.rows += len(kloc)
+
+    def update_records(self, records):
+        """
+        Add one chunk of raw record dicts (CSV/JSONL rows).
+        """
+        n = len(records)
+        kloc, effort, time, eaf = np.empty(n), np.empty(n), np.full(n, np.nan), np.empty(n)
+        types, ratings, overrides = [], [], {}
+        for i, row in enumerate(records):
+            try:
+                kloc[i] = float(row["kloc"])
+                effort[i] = float(row["actual_effort"])
+                types.append(row["project_type"])
+                if row.get("actual_months") not in (None, ""):
+                    time[i] = float(row["actual_months"])
+                if row.get("eaf") not in (None, ""):
+                    overrides[i] = float(row["eaf"])
+                ratings.append({d: row[d] for d in self.catalogue.drivers if row.get(d) not in (None, "")})
+            except (KeyError, TypeError, ValueError) as e:
+                raise ValueError(f"Row {self.rows + i + 1}: {e}")
+
+        eaf[:] = self.catalogue.eaf(self.catalogue.encode_many(ratings))
+        for i, value in overrides.items():
+            eaf[i] = value
+        self.update(kloc, types, eaf, effort, time)
+
+    def fit(self, source=None):
+        """
+        Solve the accumulated normal equations into a versioned coefficient set.
+        Project types with fewer than min_samples rows keep their current values.
+        Raises ValueError rather than emit a coefficient that COCOMO cannot load.
+        """
+        coefficients, samples, fitted = {}, {}, []
+        for i, ptype in enumerate(PROJECT_TYPES):
+            a, b, c, d = self.cocomo.coefficients[ptype]
+            effort_sol = self.effort_fit.solve(i) if self.effort_fit.n[i] >= self.min_samples else None
+            time_sol = self.time_fit.solve(i) if self.time_fit.n[i] >= self.min_samples else None
+            if effort_sol:
+                a, b = math.exp(effort_sol[0]), effort_sol[1]
+                fitted.append(f"{ptype}:ab")
+            if time_sol:
+                c, d = math.exp(time_sol[0]), time_sol[1]
+                fitted.append(f"{ptype}:cd")
+            if not all(math.isfinite(v) and v > 0 for v in (a, b, c, d)):
+                raise ValueError(f"Calibration of {ptype} gave unusable coefficients: "
+                                 f"a={a} b={b} c={c} d={d}")
+            coefficients[ptype] = [round(a, 6), round(b, 6), round(c, 6), round(d, 6)]
+            samples[ptype] = {"effort": int(self.effort_fit.n[i]), "time": int(self.time_fit.n[i])}
+
+        digest = hashlib.sha256(json.dumps(coefficients, sort_keys=True).encode()).hexdigest()[:8]
+        created = datetime.now()
+        return {
+            "version": f"calibrated-{created.strftime('%Y%m%d%H%M%S')}-{digest}",
+            "created": created.isoformat(timespec="seconds"),
+            "source": source,
+            "rows": self.rows,
+            "fitted": fitted,
+            "samples": samples,
+            "coefficients": coefficients
+        }
+
+
+def calibrate_file(path, fmt=None, chunk_size=100_000, cocomo=None, min_samples=3):
+    """
+    Stream a CSV/JSONL history file (optionally gzip, "-" for stdin) and return the fit.
+    """
+    calibrator = Calibrator(cocomo, min_samples=min_samples)
+    with open_input(path) as src:
+        for _, rows in chunked(read_records(src, fmt or detect_format(path)), chunk_size):
+            calibrator.update_records(rows)
+    return calibrator.fit(source=path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Calibrate COCOMO coefficients from historical actuals")
+    parser.add_argument("input", help="CSV/JSONL history, optionally .gz ('-' for stdin)")
+    parser.add_argument("-o", "--output", default="coefficients.json", help="coefficient set to write")
+    parser.add_argument("--input-format", choices=["csv", "jsonl"])
+    parser.add_argument("--chunk-size", type=int, default=100_000)
+    parser.add_argument("--min-samples", type=int, default=3, help="rows needed before a type is refitted")
+    args = parser.parse_args(argv)
+
+    try:
+        result = calibrate_file(args.input, args.input_format, args.chunk_size, min_samples=args.min_samples)
+    except (OSError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+
+    save_coefficients(result, args.output)
+    for ptype, values in result["coefficients"].items():
+        print(f"{ptype:<14} a={values[0]} b={values[1]} c={values[2]} d={values[3]}  {result['samples'][ptype]}")
+    print(f"Saved {result['version']} to {args.output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,379 @@
+# cli.py
+"""
+Headless command-line estimator.
+
+Reads projects from CSV or JSONL (optionally gzip-compressed, or stdin),
+estimates them in fixed-size chunks with the vectorized COCOMO path and
+streams the results to CSV or JSONL, so memory stays flat on large inputs.
+
+Each input row needs "kloc" and "project_type". Cost driver columns
+(RELY, DATA, ...) hold rating names and default to Nominal; an "eaf"
+column overrides them. A "name" column is passed through.
+
+--model cocomo2 estimates with COCOMO II instead (project_type is then
+optional and scale factor columns PREC, FLEX, ... are read too); --model
+both runs the two engines over the same rows in one pass and prefixes the
+COCOMO II columns with "II ".
+
+    python cli.py projects.csv.gz -o results.jsonl --workers 4
+    cat projects.jsonl | python cli.py - --input-format jsonl > results.csv
+    python cli.py projects.csv --model both -o compare.csv
+"""
+import argparse
+import csv
+import gzip
+import io
+import json
+import math
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+import numpy as np
+
+from cocomo import COCOMO
+from cocomo2 import COCOMO2
+from data_handler import compile_catalogue
+
+RESULT_FIELDS = ["Effort (PM)", "Development Time (Months)", "Average Staff", "EAF"]
+OUTPUT_FIELDS = ["name", "kloc", "project_type"] + RESULT_FIELDS
+COCOMO2_FIELDS = RESULT_FIELDS + ["Scale Exponent"]
+MODELS = ("cocomo81", "cocomo2", "both")
+
+_COCOMO = None
+_COCOMO2 = None
+
+
+def output_fields(model="cocomo81"):
+    """
+    Output columns for a --model choice.
+    """
+    if model == "cocomo81":
+        return OUTPUT_FIELDS
+    if model == "cocomo2":
+        return ["name", "kloc"] + COCOMO2_FIELDS
+    return OUTPUT_FIELDS + ["II " + f for f in COCOMO2_FIELDS]
+
+
+def open_input(path):
+    """
+    Open an input path (or "-" for stdin) as text, transparently handling gzip.
+    """
+    raw = sys.stdin.buffer if path == "-" else open(path, "rb")
+    stream = io.BufferedReader(raw) if not isinstance(raw, io.BufferedReader) else raw
+    if stream.peek(2)[:2] == b"\x1f\x8b":
+        stream = gzip.GzipFile(fileobj=stream)
+    return io.TextIOWrapper(stream, encoding="utf-8", newline="")
+
+
+def open_output(path):
+    if path == "-":
+        return sys.stdout
+    if path.endswith(".gz"):
+        return gzip.open(path, "wt", encoding="utf-8", newline="")
+    return open(path, "w", encoding="utf-8", newline="")
+
+
+def detect_format(path, default="csv"):
+    name = path[:-3] if path.endswith(".gz") else path
+    if name.endswith((".jsonl", ".ndjson")):
+        return "jsonl"
+    if name.endswith(".xlsx"):
+        return "xlsx"
+    if name.endswith((".html", ".htm")):
+        return "html"
+    if os.path.isdir(path) or name.endswith(".cols"):
+        return "columns"
+    if name.endswith(".csv"):
+        return "csv"
+    return default
+
+
+def read_records(stream, fmt):
+    """
+    Yield one dict per input project.
+    """
+    if fmt == "csv":
+        yield from csv.DictReader(stream)
+        return
+    for line in stream:
+        line = line.strip()
+        if line:
+            yield json.loads(line)
+
+
+def chunked(records, size):
+    """
+    Yield (first_row_number, rows) lists of at most size records.
+    """
+    it = iter(records)
+    start = 1
+    while True:
+        rows = list(islice(it, size))
+        if not rows:
+            return
+        yield start, rows
+        start += len(rows)
+
+
+def estimate_chunk(start, rows, round_results=True, model="cocomo81"):
+    """
+    Estimate one chunk of raw records and return output rows.
+    Module level so it can run in a worker process.
+    """
+    n = len(rows)
+    kloc = np.empty(n)
+    for i, row in enumerate(rows):
+        if not isinstance(row, dict):
+            raise ValueError(f"Row {start + i}: expected an object, got {type(row).__name__}")
+        if "kloc" not in row:
+            raise ValueError(f"Row {start + i}: missing kloc")
+        kloc[i] = _positive(start + i, "kloc", row["kloc"])
+
+    out = [{"name": row.get("name", ""), "kloc": kloc[i]} for i, row in enumerate(rows)]
+    if model in ("cocomo81", "both"):
+        types, results = _estimate_cocomo81(start, rows, kloc, round_results)
+        for record, project_type in zip(out, types):
+            record["project_type"] = project_type
+        _merge(out, results, RESULT_FIELDS)
+    if model in ("cocomo2", "both"):
+        results = _estimate_cocomo2(start, rows, kloc, round_results)
+        _merge(out, results, COCOMO2_FIELDS, "II " if model == "both" else "")
+    return out
+
+
+def _positive(row_number, field, value):
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"Row {row_number}: invalid {field}: {value!r}")
+    if not (math.isfinite(number) and number > 0):
+        raise ValueError(f"Row {row_number}: {field} must be a positive number, got {value}")
+    return number
+
+
+def _merge(out, results, fields, prefix=""):
+    for field in fields:
+        key = prefix + field
+        for record, value in zip(out, results[field].tolist()):
+            record[key] = value
+
+
+def _encode_rows(start, catalogue, ratings):
+    try:
+        return catalogue.encode_many(ratings)
+    except ValueError:
+        # Re-encode row by row only to report which row is invalid
+        for i, r in enumerate(ratings):
+            try:
+                catalogue.encode(r)
+            except ValueError as e:
+                raise ValueError(f"Row {start + i}: {e}")
+        raise
+
+
+def _estimate_cocomo81(start, rows, kloc, round_results):
+    global _COCOMO
+    if _COCOMO is None:
+        _COCOMO = COCOMO()
+    catalogue = compile_catalogue()
+
+    types = []
+    ratings = []
+    overrides = {}
+    for i, row in enumerate(rows):
+        try:
+            types.append(row["project_type"])
+        except KeyError as e:
+            raise ValueError(f"Row {start + i}: {e}")
+        override = row.get("eaf")
+        if override not in (None, ""):
+            overrides[i] = _positive(start + i, "eaf", override)
+        ratings.append({d: row[d] for d in catalogue.drivers if row.get(d) not in (None, "")})
+
+    eaf = catalogue.eaf(_encode_rows(start, catalogue, ratings))
+    for i, value in overrides.items():
+        eaf[i] = value
+
+    try:
+        return types, _COCOMO.calculate_effort_batch(kloc, types, eaf, round_results=round_results)
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Rows {start}-{start + len(rows) - 1}: {e}")
+
+
+def _estimate_cocomo2(start, rows, kloc, round_results):
+    global _COCOMO2
+    if _COCOMO2 is None:
+        _COCOMO2 = COCOMO2()
+    tables = _COCOMO2.tables
+    drivers = tables.scale_factors.drivers + tables.effort_multipliers.drivers
+    ratings = [{d: row[d] for d in drivers if row.get(d) not in (None, "")} for row in rows]
+
+    try:
+        encoded = _COCOMO2.encode_batch(ratings)
+    except ValueError:
+        for i, r in enumerate(ratings):
+            try:
+                _COCOMO2.encode_batch([r])
+            except ValueError as e:
+                raise ValueError(f"Row {start + i}: {e}")
+        raise
+    try:
+        return _COCOMO2.calculate_effort_batch(kloc, *encoded, round_results=round_results)
+    except ValueError as e:
+        raise ValueError(f"Rows {start}-{start + len(rows) - 1}: {e}")
+
+
+def format_rows(rows, fmt, fields=OUTPUT_FIELDS):
+    """
+    Serialise output rows to one CSV (without header) or JSONL text block.
+    """
+    if fmt == "csv":
+        buf = io.StringIO()
+        csv.writer(buf).writerows([row[f] for f in fields] for row in rows)
+        return buf.getvalue()
+    return "".join(json.dumps(row) + "\n" for row in rows)
+
+
+def _estimate_and_format(start, rows, round_results, fmt, model="cocomo81"):
+    out = estimate_chunk(start, rows, round_results, model)
+    return len(out), format_rows(out, fmt, output_fields(model))
+
+
+def estimate_stream(records, fmt, chunk_size=100_000, workers=1, round_results=True, model="cocomo81"):
+    """
+    Lazily estimate an iterable of records, yielding (count, text) blocks in
+    input order. With workers > 1 chunks are estimated and serialised in a
+    process pool with a bounded number in flight.
+    """
+    chunks = chunked(records, chunk_size)
+    if workers <= 1:
+        for start, rows in chunks:
+            yield _estimate_and_format(start, rows, round_results, fmt, model)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for start, rows in chunks:
+            pending.append(pool.submit(_estimate_and_format, start, rows, round_results, fmt, model))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def estimate_rows(records, chunk_size=100_000, workers=1, round_results=True, model="cocomo81"):
+    """
+    Like estimate_stream but yields result dicts, for the XLSX/HTML exporters.
+    """
+    chunks = chunked(records, chunk_size)
+    if workers <= 1:
+        for start, rows in chunks:
+            yield from estimate_chunk(start, rows, round_results, model)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for start, rows in chunks:
+            pending.append(pool.submit(estimate_chunk, start, rows, round_results, model))
+            if len(pending) >= workers * 2:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def write_blocks(stream, blocks, fmt, fields=OUTPUT_FIELDS):
+    if fmt == "csv":
+        csv.writer(stream).writerow(fields)
+    count = 0
+    for n, text in blocks:
+        stream.write(text)
+        count += n
+    stream.flush()
+    return count
+
+
+def write_columns(rows, path, fields=OUTPUT_FIELDS, chunk_size=100_000, meta=None):
+    """
+    Write result rows to a memory-mappable columnar directory (see records.py).
+    """
+    from records import ColumnWriter
+
+    columns = {f: "str" if f in ("name", "project_type") else "f8" for f in fields}
+    with ColumnWriter(path, columns, meta) as writer:
+        for _, chunk in chunked(rows, chunk_size):
+            writer.append_rows(chunk)
+    return writer.rows
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Headless COCOMO batch estimator")
+    parser.add_argument("input", nargs="?", default="-", help="CSV/JSONL file, optionally .gz ('-' for stdin)")
+    parser.add_argument("-o", "--output", default="-", help="output file ('-' for stdout)")
+    parser.add_argument("--input-format", choices=["csv", "jsonl"], help="default: from file extension, else csv")
+    parser.add_argument("--output-format", choices=["csv", "jsonl", "xlsx", "html", "columns"],
+                        help="default: from file extension (a directory or *.cols means columns), else csv")
+    parser.add_argument("--chunk-size", type=int, default=100_000, help="projects per vectorized chunk")
+    parser.add_argument("--workers", type=int, default=1, help="process-parallel chunks")
+    parser.add_argument("--no-round", action="store_true", help="keep full precision in the output")
+    parser.add_argument("--model", choices=MODELS, default="cocomo81",
+                        help="estimation model; 'both' runs COCOMO 81 and COCOMO II side by side")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.chunk_size <= 0 or args.workers <= 0:
+        print("error: --chunk-size and --workers must be positive", file=sys.stderr)
+        return 2
+
+    in_fmt = args.input_format or detect_format(args.input)
+    out_fmt = args.output_format or detect_format(args.output)
+    workers = min(args.workers, os.cpu_count() or 1)
+
+    if out_fmt in ("xlsx", "html", "columns") and args.output == "-":
+        print(f"error: {out_fmt} output needs an output file (-o)", file=sys.stderr)
+        return 2
+
+    try:
+        if out_fmt in ("xlsx", "html"):
+            from export import export_html, export_xlsx
+
+            exporter = export_xlsx if out_fmt == "xlsx" else export_html
+            with open_input(args.input) as src:
+                rows = estimate_rows(read_records(src, in_fmt), args.chunk_size, workers, not args.no_round,
+                                     args.model)
+                count = exporter(rows, args.output, output_fields(args.model))
+            print(f"Estimated {count} projects", file=sys.stderr)
+            return 0
+
+        if out_fmt == "columns":
+            with open_input(args.input) as src:
+                rows = estimate_rows(read_records(src, in_fmt), args.chunk_size, workers, not args.no_round,
+                                     args.model)
+                count = write_columns(rows, args.output, output_fields(args.model), args.chunk_size,
+                                      {"model": args.model, "rounded": not args.no_round})
+            print(f"Estimated {count} projects", file=sys.stderr)
+            return 0
+
+        with open_input(args.input) as src:
+            out = open_output(args.output)
+            try:
+                blocks = estimate_stream(read_records(src, in_fmt), out_fmt, args.chunk_size,
+                                         workers, not args.no_round, args.model)
+                count = write_blocks(out, blocks, out_fmt, output_fields(args.model))
+            finally:
+                if out is not sys.stdout:
+                    out.close()
+    except (OSError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+
+    print(f"Estimated {count} projects", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
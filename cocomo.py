@@ -5,15 +5,110 @@
         # time = c * (effort ** d)
         # staff = effort / time
 
+import json
+import math
+import os
+
+from instrumentation import instrumented
+
+# Order of project types used by the integer codes of the batch API
+PROJECT_TYPES = ("organic", "semi-detached", "embedded")
+
+# Environment variable naming a calibrated coefficient set to load at startup
+COEFFICIENTS_ENV = "COCOMO_COEFFICIENTS"
+
+
+def load_coefficients(path):
+    """
+    Read a versioned coefficient set written by calibration.py.
+    Returns (version, {project_type: (a, b, c, d)}).
+    """
+    with open(path) as f:
+        data = json.load(f)
+    try:
+        coefficients = {ptype: tuple(float(v) for v in data["coefficients"][ptype]) for ptype in PROJECT_TYPES}
+    except (KeyError, TypeError, ValueError):
+        raise ValueError(f"Invalid coefficient file: {path}")
+    if any(len(values) != 4 for values in coefficients.values()):
+        raise ValueError(f"Invalid coefficient file: {path}")
+    for ptype, values in coefficients.items():
+        if not all(math.isfinite(v) and v > 0 for v in values):
+            raise ValueError(f"Invalid coefficient file: {path}: {ptype} coefficients must be positive and finite")
+    return data.get("version", os.path.basename(path)), coefficients
+
+
+def save_coefficients(coefficient_set, path):
+    with open(path, "w") as f:
+        json.dump(coefficient_set, f, indent=2)
+
+
 class COCOMO:
-    def __init__(self):
+    def __init__(self, cache=None, coefficients_path=None, store=None):
         self.coefficients = {
             "organic": (2.4, 1.05, 2.5, 0.38),
             "semi-detached": (3.0, 1.12, 2.5, 0.35),
             "embedded": (3.6, 1.20, 2.5, 0.32)
         }
+        self.coefficients_version = "boehm-1981"
+
+        # Calibrated coefficients replace Boehm's values when configured
+        coefficients_path = coefficients_path or os.environ.get(COEFFICIENTS_ENV)
+        if coefficients_path:
+            self.coefficients_version, self.coefficients = load_coefficients(coefficients_path)
+
+        # Optional cache.EstimateCache memoizing calculate_effort
+        self.cache = cache
+        # Optional store.EstimateStore recording every estimate
+        self.store = store
+
+    @instrumented("cocomo.calculate_effort")
+    def calculate_effort(self, kloc, project_type, cost_drivers, project_name=None, record=True):
+        """
+        Estimate one project. With a store attached the estimate is recorded
+        unless record is False (e.g. for live previews).
+        """
+        results = self._cached_effort(kloc, project_type, cost_drivers)
+        if record and self.store is not None:
+            self.store.record(kloc, project_type, results, cost_drivers, project_name,
+                              self.coefficients_version)
+        return results
+
+    def _cached_effort(self, kloc, project_type, cost_drivers):
+        if self.cache is None or project_type not in self.coefficients:
+            return self._calculate_effort(kloc, project_type, cost_drivers)
 
-    def calculate_effort(self, kloc, project_type, cost_drivers):
+        try:
+            key = self.cache.make_key(kloc, project_type, cost_drivers, self.coefficients[project_type])
+        except (TypeError, ValueError):
+            # Let the uncached path raise the usual error
+            return self._calculate_effort(kloc, project_type, cost_drivers)
+
+        results = self.cache.get(key)
+        if results is None:
+            results = self._calculate_effort(kloc, project_type, cost_drivers)
+            self.cache.put(key, results)
+        return dict(results)
+
+    def estimate(self, kloc, project_type, cost_drivers):
+        """
+        Like calculate_effort but returns a compact records.EstimateResult at
+        full precision (no caching or store recording).
+        """
+        from records import EstimateResult  # deferred: records needs numpy
+
+        return EstimateResult(*self._estimate(kloc, project_type, cost_drivers))
+
+    def _calculate_effort(self, kloc, project_type, cost_drivers):
+        effort, time, staff, eaf = self._estimate(kloc, project_type, cost_drivers)
+        return {
+            "Effort (PM)": round(effort, 2),
+            "Development Time (Months)": round(time, 2),
+            "Average Staff": round(staff, 2),
+            "EAF": round(eaf, 3)
+
+        }
+
+    def _estimate(self, kloc, project_type, cost_drivers):
         try:
             a, b, c, d = self.coefficients[project_type]
         except KeyError:
@@ -31,10 +126,73 @@ class COCOMO:
         time = c * (effort ** d)
         staff = effort / time
 
-        return {
-            "Effort (PM)": round(effort, 2),
-            "Development Time (Months)": round(time, 2),
-            "Average Staff": round(staff, 2),
-            "EAF": round(eaf, 3)
+        return effort, time, staff, eaf
+
+    def encode_project_types(self, project_types):
+        """
+        Convert project type names (or already encoded integers) into an
+        integer code array indexing PROJECT_TYPES.
+        """
+        import numpy as np  # deferred so scalar-only callers start fast
+
+        arr = np.asarray(project_types)
+        if arr.dtype.kind in "iu":
+            codes = arr.astype(np.intp, copy=False)
+        else:
+            lookup = {name: i for i, name in enumerate(PROJECT_TYPES)}
+            try:
+                codes = np.array([lookup[str(t)] for t in arr.ravel()], dtype=np.intp).reshape(arr.shape)
+            except KeyError:
+                raise ValueError("Invalid project type selected")
+
+        if codes.size and (codes.min() < 0 or codes.max() >= len(PROJECT_TYPES)):
+            raise ValueError("Invalid project type selected")
+        return codes
+
+    def coefficient_table(self):
+        """
+        Coefficients as a (len(PROJECT_TYPES), 4) float array of (a, b, c, d) rows.
+        """
+        import numpy as np
+
+        return np.array([self.coefficients[t] for t in PROJECT_TYPES], dtype=float)
+
+    def calculate_effort_batch(self, kloc, project_types, eaf, round_results=True, project_names=None):
+        """
+        Vectorized calculate_effort for many projects at once.
+
+        kloc and eaf are float arrays, project_types is an array of codes
+        into PROJECT_TYPES (or of type names). Returns a dict with the same
+        keys as calculate_effort whose values are arrays. Set round_results
+        to False to keep full precision.
+        """
+        import numpy as np
+
+        kloc = np.asarray(kloc, dtype=float)
+        eaf = np.asarray(eaf, dtype=float)
+        codes = self.encode_project_types(project_types)
+
+        a, b, c, d = np.moveaxis(self.coefficient_table()[codes], -1, 0)
+
+        effort = a * (kloc ** b) * eaf
+        time = c * (effort ** d)
+        staff = effort / time
+        eaf = np.broadcast_to(eaf, effort.shape)
+
+        if round_results:
+            effort, time, staff, eaf = (np.round(effort, 2), np.round(time, 2),
+                                        np.round(staff, 2), np.round(eaf, 3))
 
+        results = {
+            "Effort (PM)": effort,
+            "Development Time (Months)": time,
+            "Average Staff": staff,
+            "EAF": eaf
         }
+        if self.store is not None:
+            # The store takes flat columns whatever the batch shape
+            shape = effort.shape
+            self.store.record_batch(np.broadcast_to(kloc, shape).ravel(), np.broadcast_to(codes, shape).ravel(),
+                                    {k: np.broadcast_to(v, shape).ravel() for k, v in results.items()},
+                                    project_names, coefficients_version=self.coefficients_version)
+        return results
@@ -0,0 +1,210 @@
+# cocomo2.py
+"""
+COCOMO II Post-Architecture model.
+
+    effort = A * KSLOC^E * product(EM)          E = B + 0.01 * sum(SF)
+    time   = C * (effort / SCED)^F * SCED% / 100   F = D + 0.2 * (E - B)
+    staff  = effort / time
+
+The 5 scale factors and 17 effort multipliers (COCOMO II.2000 values) live
+in cocomo2_multipliers.json and are hot-reloaded like multipliers.json.
+Ratings are given by name in one dict, e.g. {"PREC": "High", "RELY": "Low"};
+missing drivers default to Nominal.
+"""
+import hashlib
+import json
+import os
+
+import numpy as np
+
+from data_handler import DriverCatalogue, _CatalogueCache, validate_multipliers
+from instrumentation import instrumented
+
+COCOMO2_MULTIPLIERS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cocomo2_multipliers.json")
+
+# COCOMO II.2000 calibration
+CONSTANTS = {"A": 2.94, "B": 0.91, "C": 3.67, "D": 0.28}
+
+# Schedule compression/stretch applied to TDEV for each SCED rating
+SCHEDULE_PERCENT = {"Very Low": 75, "Low": 85, "Nominal": 100, "High": 130, "Very High": 160}
+
+
+class ScaleFactorTable:
+    """
+    Integer-coded scale factors. Unlike multipliers they add up (and may be
+    zero), so a batch's sum(SF) is one gather and row sum.
+    """
+
+    def __init__(self, factors):
+        self.drivers = tuple(factors)
+        self.levels = tuple(tuple(ratings) for ratings in factors.values())
+        self.level_index = tuple({name: i for i, name in enumerate(l)} for l in self.levels)
+        self.values = np.zeros((len(self.drivers), max(len(l) for l in self.levels)))
+        for row, ratings in enumerate(factors.values()):
+            self.values[row, :len(ratings)] = list(ratings.values())
+        self.values.setflags(write=False)
+        self.nominal_codes = [index["Nominal"] for index in self.level_index]
+        self.table = {driver: dict(ratings) for driver, ratings in factors.items()}
+        self._offsets = np.arange(len(self.drivers), dtype=np.intp) * self.values.shape[1]
+
+    def encode(self, ratings):
+        """
+        Code list for the scale factors in ratings; other keys are ignored.
+        """
+        codes = list(self.nominal_codes)
+        for row, driver in enumerate(self.drivers):
+            if driver not in ratings:
+                continue
+            rating = ratings[driver]
+            try:
+                codes[row] = self.level_index[row][rating]
+            except (KeyError, TypeError):
+                raise ValueError(f"Invalid rating for {driver}: {rating}")
+        return codes
+
+    def encode_many(self, rows):
+        encoded = [self.encode(r) for r in rows]
+        if not encoded:
+            return np.empty((0, len(self.drivers)), dtype=np.int8)
+        return np.array(encoded, dtype=np.int8)
+
+    def total(self, codes):
+        """
+        sum(SF) for a code vector or an (N, 5) code matrix.
+        """
+        codes = np.asarray(codes, dtype=np.intp)
+        return self.values.ravel()[codes + self._offsets].sum(axis=-1)
+
+
+def validate_scale_factors(data):
+    if not isinstance(data, dict) or not data:
+        raise ValueError("Scale factor table must be a non-empty object")
+    for driver, ratings in data.items():
+        if not isinstance(ratings, dict) or "Nominal" not in ratings:
+            raise ValueError(f"Scale factor {driver} has no Nominal rating")
+        for rating, value in ratings.items():
+            if isinstance(value, bool) or not isinstance(value, (int, float)) or value < 0:
+                raise ValueError(f"Invalid scale factor for {driver} {rating}: {value}")
+    return data
+
+
+class COCOMO2Tables:
+    """
+    Compiled scale factors and effort multipliers of one cocomo2_multipliers.json.
+    """
+
+    def __init__(self, scale_factors, effort_multipliers, content_hash=None):
+        self.scale_factors = ScaleFactorTable(validate_scale_factors(scale_factors))
+        self.effort_multipliers = DriverCatalogue(validate_multipliers(effort_multipliers), content_hash)
+        self.content_hash = content_hash
+        if "SCED" not in self.effort_multipliers.drivers:
+            raise ValueError("Effort multipliers need a SCED driver")
+        self.sced_row = self.effort_multipliers.drivers.index("SCED")
+        self.sced_percent = np.array([SCHEDULE_PERCENT.get(level, 100)
+                                      for level in self.effort_multipliers.levels[self.sced_row]], dtype=float)
+
+    def split(self, ratings):
+        """
+        Separate one ratings dict into (scale factor, effort multiplier) dicts,
+        rejecting drivers that belong to neither.
+        """
+        sf = {d: r for d, r in ratings.items() if d in self.scale_factors.table}
+        em = {d: r for d, r in ratings.items() if d not in sf}
+        return sf, em
+
+
+def read_cocomo2_tables(path=None):
+    path = path or COCOMO2_MULTIPLIERS_PATH
+    with open(path, "rb") as f:
+        raw = f.read()
+    try:
+        data = json.loads(raw)
+        return COCOMO2Tables(data["scale_factors"], data["effort_multipliers"], hashlib.sha256(raw).hexdigest())
+    except (KeyError, TypeError, ValueError) as e:
+        raise ValueError(f"Invalid COCOMO II multiplier file {path}: {e}")
+
+
+_TABLES = _CatalogueCache(read_cocomo2_tables)
+
+
+def load_cocomo2_tables(path=None):
+    """
+    Compiled COCOMO II tables, reloaded only when the file content changes.
+    """
+    return _TABLES.get(path or COCOMO2_MULTIPLIERS_PATH)
+
+
+class COCOMO2:
+    def __init__(self, constants=None, tables_path=None):
+        self.constants = dict(CONSTANTS, **(constants or {}))
+        self.tables_path = tables_path
+
+    @property
+    def tables(self):
+        return load_cocomo2_tables(self.tables_path)
+
+    @instrumented("cocomo2.calculate_effort")
+    def calculate_effort(self, ksloc, ratings=None):
+        """
+        Estimate one project from its size and {driver: rating name} dict
+        covering any of the scale factors and effort multipliers.
+        """
+        tables = self.tables
+        sf, em = tables.split(ratings or {})
+        sf_sum = float(tables.scale_factors.total(tables.scale_factors.encode(sf)))
+        codes = tables.effort_multipliers.encode(em)
+        eaf = float(tables.effort_multipliers.eaf(codes))
+        sced_code = int(codes[tables.sced_row])
+        results = self.calculate_effort_batch(
+            ksloc, sf_sum, eaf,
+            sced_multiplier=float(tables.effort_multipliers.values[tables.sced_row, sced_code]),
+            sced_percent=float(tables.sced_percent[sced_code]),
+        )
+        return {key: float(value) for key, value in results.items()}
+
+    def encode_batch(self, rating_rows):
+        """
+        Turn rating dicts into the (sf_sum, eaf, sced_multiplier, sced_percent)
+        arrays calculate_effort_batch takes.
+        """
+        tables = self.tables
+        split = [tables.split(r) for r in rating_rows]
+        sf_sum = tables.scale_factors.total(tables.scale_factors.encode_many(sf for sf, _ in split))
+        codes = tables.effort_multipliers.encode_many(em for _, em in split)
+        eaf = tables.effort_multipliers.eaf(codes)
+        sced_codes = codes[:, tables.sced_row].astype(np.intp)
+        sced_multiplier = tables.effort_multipliers.values[tables.sced_row][sced_codes]
+        return sf_sum, eaf, sced_multiplier, tables.sced_percent[sced_codes]
+
+    def calculate_effort_batch(self, ksloc, sf_sum, eaf, sced_multiplier=1.0, sced_percent=100.0,
+                               round_results=True):
+        """
+        Vectorized estimate. ksloc, sf_sum (sum of scale factors) and eaf
+        (product of all 17 effort multipliers, SCED included) are arrays or
+        scalars; the SCED multiplier is divided back out for the schedule.
+        Returns the calculate_effort keys plus "Scale Exponent".
+        """
+        A, B, C, D = (self.constants[k] for k in "ABCD")
+        ksloc = np.asarray(ksloc, dtype=float)
+        if (ksloc <= 0).any():
+            raise ValueError("KSLOC must be positive")
+        exponent = B + 0.01 * np.asarray(sf_sum, dtype=float)
+        eaf = np.asarray(eaf, dtype=float)
+
+        effort = A * ksloc ** exponent * eaf
+        nominal_schedule_effort = effort / np.asarray(sced_multiplier, dtype=float)
+        time = C * nominal_schedule_effort ** (D + 0.2 * (exponent - B)) * np.asarray(sced_percent) / 100
+        staff = effort / time
+        eaf = np.broadcast_to(eaf, effort.shape)
+        exponent = np.broadcast_to(exponent, effort.shape)
+
+        if round_results:
+            effort, time, staff, eaf, exponent = (np.round(effort, 2), np.round(time, 2), np.round(staff, 2),
+                                                  np.round(eaf, 3), np.round(exponent, 4))
+        return {
+            "Effort (PM)": effort,
+            "Development Time (Months)": time,
+            "Average Staff": staff,
+            "EAF": eaf,
+            "Scale Exponent": exponent
+        }
@@ -1,22 +1,261 @@
-def load_multipliers():
+import hashlib
+import json
+import os
+import struct
+import threading
+from types import MappingProxyType
+
+import numpy as np
+
+MULTIPLIERS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "multipliers.json")
+
+
+def load_multipliers(path=None):
     """
-    Loads cost driver multipliers (15 EAF drivers).
+    Loads cost driver multipliers (15 EAF drivers) from multipliers.json.
     Each driver has rating levels with corresponding multiplier values.
+    The table is read-only and shared; it is re-read only when the file changes.
     """
-    return {
-        "RELY": {"Very Low": 0.75, "Low": 0.88, "Nominal": 1.00, "High": 1.15, "Very High": 1.40},
-        "DATA": {"Low": 0.94, "Nominal": 1.00, "High": 1.08, "Very High": 1.16},
-        "CPLX": {"Very Low": 0.70, "Low": 0.85, "Nominal": 1.00, "High": 1.15, "Very High": 1.30, "Extra High": 1.65},
-        "TIME": {"Nominal": 1.00, "High": 1.11, "Very High": 1.30, "Extra High": 1.66},
-        "STOR": {"Nominal": 1.00, "High": 1.06, "Very High": 1.21, "Extra High": 1.56},
-        "VIRT": {"Low": 0.87, "Nominal": 1.00, "High": 1.15, "Very High": 1.30},
-        "TURN": {"Low": 0.87, "Nominal": 1.00, "High": 1.07, "Very High": 1.15},
-        "ACAP": {"Very Low": 1.46, "Low": 1.19, "Nominal": 1.00, "High": 0.86, "Very High": 0.71},
-        "AEXP": {"Very Low": 1.29, "Low": 1.13, "Nominal": 1.00, "High": 0.91, "Very High": 0.82},
-        "PCAP": {"Very Low": 1.42, "Low": 1.17, "Nominal": 1.00, "High": 0.86, "Very High": 0.70},
-        "VEXP": {"Very Low": 1.21, "Low": 1.10, "Nominal": 1.00, "High": 0.90},
-        "LEXP": {"Very Low": 1.14, "Low": 1.07, "Nominal": 1.00, "High": 0.95},
-        "MODP": {"Very Low": 1.24, "Low": 1.10, "Nominal": 1.00, "High": 0.91, "Very High": 0.82},
-        "TOOL": {"Very Low": 1.24, "Low": 1.10, "Nominal": 1.00, "High": 0.91, "Very High": 0.83},
-        "SCED": {"Very Low": 1.23, "Low": 1.08, "Nominal": 1.00, "High": 1.04, "Very High": 1.10},
-    }
+    return load_catalogue(path).table
+
+
+class DriverCatalogue:
+    """
+    Compiled, integer-coded form of the cost driver table.
+
+    Each driver gets a row and each rating level a column code, so a batch of
+    projects is an (N, 15) code matrix and its EAF is one gather and sum over
+    the dense log-multiplier table.
+    """
+
+    def __init__(self, multipliers, content_hash=None):
+        drivers = tuple(multipliers)
+        levels = tuple(tuple(ratings) for ratings in multipliers.values())
+        values = np.full((len(drivers), max(len(l) for l in levels)), np.nan)
+        for row, ratings in enumerate(multipliers.values()):
+            values[row, :len(ratings)] = list(ratings.values())
+        self._setup(drivers, levels, values, content_hash)
+
+    @classmethod
+    def from_arrays(cls, drivers, levels, values, content_hash=None):
+        """
+        Build a catalogue around an existing (possibly memory-mapped) value table.
+        """
+        catalogue = cls.__new__(cls)
+        catalogue._setup(tuple(drivers), tuple(tuple(l) for l in levels), values, content_hash)
+        return catalogue
+
+    def _setup(self, drivers, levels, values, content_hash):
+        self.drivers = drivers
+        self.levels = levels
+        self.content_hash = content_hash
+        self.level_index = tuple({name: i for i, name in enumerate(l)} for l in levels)
+        self.level_counts = np.array([len(l) for l in levels], dtype=np.int8)
+
+        self.values = values
+        self.log_table = np.log(values)
+        self.nominal_codes = np.array([index["Nominal"] for index in self.level_index], dtype=np.int8)
+        self._nominal_list = self.nominal_codes.tolist()
+        for arr in (self.log_table, self.level_counts, self.nominal_codes):
+            arr.setflags(write=False)
+        if values.flags.writeable:
+            values.setflags(write=False)
+
+        # Read-only {driver: {rating: multiplier}} view, as load_multipliers() returns
+        self.table = MappingProxyType({
+            driver: MappingProxyType({rating: float(values[row, code]) for code, rating in enumerate(levels[row])})
+            for row, driver in enumerate(drivers)
+        })
+
+        self._flat_log = self.log_table.ravel()
+        self._offsets = np.arange(len(self.drivers), dtype=np.intp) * values.shape[1]
+
+    def encode(self, ratings):
+        """
+        Encode a {driver: rating name} dict into a code vector.
+        Missing drivers default to Nominal; unknown drivers or ratings raise ValueError.
+        """
+        return np.array(self._encode_list(ratings), dtype=np.int8)
+
+    def encode_many(self, rows):
+        """
+        Encode an iterable of rating dicts into an (N, 15) code matrix.
+        """
+        encoded = [self._encode_list(r) for r in rows]
+        if not encoded:
+            return np.empty((0, len(self.drivers)), dtype=np.int8)
+        return np.array(encoded, dtype=np.int8)
+
+    def _encode_list(self, ratings):
+        codes = self._nominal_list.copy()
+        found = 0
+        for row, driver in enumerate(self.drivers):
+            if driver not in ratings:
+                continue
+            found += 1
+            rating = ratings[driver]
+            try:
+                codes[row] = self.level_index[row][rating]
+            except (KeyError, TypeError):
+                raise ValueError(f"Invalid rating for {driver}: {rating}")
+        if found != len(ratings):
+            unknown = set(ratings) - set(self.drivers)
+            raise ValueError(f"Unknown cost drivers: {', '.join(sorted(unknown))}")
+        return codes
+
+    def decode(self, codes):
+        """
+        Turn a code vector back into a {driver: rating name} dict.
+        """
+        return {driver: self.levels[row][int(code)] for row, (driver, code) in enumerate(zip(self.drivers, codes))}
+
+    def multipliers_for(self, codes):
+        """
+        {driver: multiplier} dict for one code vector, as calculate_effort expects.
+        """
+        self._check(codes)
+        return {driver: float(self.values[row, code]) for row, (driver, code) in enumerate(zip(self.drivers, codes))}
+
+    def log_eaf(self, codes):
+        """
+        Sum of log-multipliers for a code vector or an (N, 15) code matrix.
+        """
+        codes = np.asarray(codes)
+        self._check(codes)
+        return self._flat_log[codes.astype(np.intp) + self._offsets].sum(axis=-1)
+
+    def eaf(self, codes):
+        """
+        Effort Adjustment Factor for a code vector or an (N, 15) code matrix.
+        """
+        return np.exp(self.log_eaf(codes))
+
+    def _check(self, codes):
+        codes = np.asarray(codes)
+        if codes.shape[-1] != len(self.drivers):
+            raise ValueError(f"Expected {len(self.drivers)} driver codes, got {codes.shape[-1]}")
+        if (codes < 0).any() or (codes >= self.level_counts).any():
+            raise ValueError("Driver rating code out of range")
+
+
+def validate_multipliers(data):
+    """
+    Check a parsed multipliers table: every driver maps rating names to
+    positive numbers and has a Nominal level. Raises ValueError otherwise.
+    """
+    if not isinstance(data, dict) or not data:
+        raise ValueError("Multiplier table must be a non-empty object")
+    for driver, ratings in data.items():
+        if not isinstance(ratings, dict) or not ratings:
+            raise ValueError(f"Driver {driver} must map ratings to multipliers")
+        if "Nominal" not in ratings:
+            raise ValueError(f"Driver {driver} has no Nominal rating")
+        for rating, value in ratings.items():
+            if isinstance(value, bool) or not isinstance(value, (int, float)) or not value > 0:
+                raise ValueError(f"Invalid multiplier for {driver} {rating}: {value}")
+    return data
+
+
+def read_catalogue(path=None):
+    """
+    Read, validate and compile a multipliers.json file (no caching).
+    """
+    path = path or MULTIPLIERS_PATH
+    with open(path, "rb") as f:
+        raw = f.read()
+    try:
+        data = json.loads(raw)
+    except ValueError as e:
+        raise ValueError(f"Invalid multiplier file {path}: {e}")
+    return DriverCatalogue(validate_multipliers(data), hashlib.sha256(raw).hexdigest())
+
+
+class _CatalogueCache:
+    """
+    Compiled catalogue per file. A cheap stat() on each lookup detects
+    changes; the content hash then decides whether to recompile, so
+    long-running processes pick up new tables without a restart.
+    reader(path) compiles a file into an object with a content_hash.
+    """
+
+    def __init__(self, reader=None):
+        self._reader = reader or read_catalogue
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, path):
+        path = os.path.abspath(path)
+        st = os.stat(path)
+        stamp = (st.st_mtime_ns, st.st_size)
+        entry = self._entries.get(path)
+        if entry and entry[0] == stamp:
+            return entry[1]
+
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry and entry[0] == stamp:
+                return entry[1]
+            catalogue = self._reader(path)
+            if entry and entry[1].content_hash == catalogue.content_hash:
+                catalogue = entry[1]  # touched but unchanged: keep the existing object
+            self._entries[path] = (stamp, catalogue)
+            return catalogue
+
+
+_CATALOGUES = _CatalogueCache()
+
+
+def load_catalogue(path=None):
+    """
+    Return the compiled catalogue for multipliers.json (or path), reloading
+    it only if the file content changed since the last call.
+    """
+    return _CATALOGUES.get(path or MULTIPLIERS_PATH)
+
+
+def compile_catalogue(multipliers=None):
+    """
+    Compile a driver table into a DriverCatalogue. Without arguments the
+    cached, hot-reloaded catalogue of multipliers.json is returned.
+    """
+    if multipliers is not None:
+        return DriverCatalogue(validate_multipliers(multipliers))
+    return load_catalogue()
+
+
+# --- Binary snapshot ---
+# Layout: magic, uint32 header length, JSON header, padding to 8 bytes,
+# then the float64 multiplier table in C order. Workers map it read-only.
+
+SNAPSHOT_MAGIC = b"COCOMOC1"
+
+
+def save_snapshot(catalogue, path):
+    header = json.dumps({
+        "drivers": catalogue.drivers,
+        "levels": catalogue.levels,
+        "shape": catalogue.values.shape,
+        "content_hash": catalogue.content_hash
+    }).encode()
+    offset = len(SNAPSHOT_MAGIC) + 4 + len(header)
+    padding = -offset % 8
+    with open(path, "wb") as f:
+        f.write(SNAPSHOT_MAGIC + struct.pack("<I", len(header)) + header + b" " * padding)
+        f.write(np.ascontiguousarray(catalogue.values, dtype="<f8").tobytes())
+    return path
+
+
+def load_snapshot(path):
+    """
+    Memory-map a snapshot written by save_snapshot into a DriverCatalogue.
+    """
+    with open(path, "rb") as f:
+        prefix = f.read(len(SNAPSHOT_MAGIC) + 4)
+        if prefix[:len(SNAPSHOT_MAGIC)] != SNAPSHOT_MAGIC:
+            raise ValueError(f"Not a catalogue snapshot: {path}")
+        (length,) = struct.unpack("<I", prefix[len(SNAPSHOT_MAGIC):])
+        header = json.loads(f.read(length))
+    offset = len(SNAPSHOT_MAGIC) + 4 + length
+    offset += -offset % 8
+    values = np.memmap(path, dtype="<f8", mode="r", offset=offset, shape=tuple(header["shape"]))
+    return DriverCatalogue.from_arrays(header["drivers"], header["levels"], values, header["content_hash"])
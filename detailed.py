@@ -0,0 +1,343 @@
+# detailed.py
+"""
+Detailed COCOMO for hierarchical systems.
+
+A system is a tree of subsystems and modules. Every node carries its own
+KLOC and cost driver ratings; a rating set on a subsystem applies to every
+module below it unless a lower node rates the same driver, in which case
+the nearest rating wins. Following Boehm's Detailed COCOMO, the whole system's size
+sets the nominal productivity and each module contributes its KLOC scaled by
+its phase-sensitive EAF:
+
+    effort[phase] = fraction[phase] * a * K^(b-1) * sum(kloc_i * eaf_i[phase])
+
+Each node stores its ratings as factors relative to the ones it inherits,
+so a module's EAF is the product of the factors on its path to the root.
+Each node caches its subtree KLOC and sum(kloc * eaf) per phase, so changing
+one module's KLOC or a rating only updates the nodes on its path to the root
+(plus, for a subsystem rating, the paths of descendants overriding it).
+"""
+import json
+
+from cocomo import COCOMO
+from data_handler import load_catalogue
+
+PHASES = ("RPD", "DD", "CUT", "IT")  # requirements/product design, detailed design, code & unit test, integration & test
+
+# Share of development effort per phase for each mode (Boehm, medium-size projects)
+PHASE_FRACTIONS = {
+    "organic": (0.16, 0.26, 0.42, 0.16),
+    "semi-detached": (0.17, 0.27, 0.37, 0.19),
+    "embedded": (0.18, 0.28, 0.32, 0.22),
+}
+
+_ONES = (1.0,) * len(PHASES)
+
+
+def phase_multiplier_table(catalogue=None, overrides=None):
+    """
+    {driver: {rating: (rpd, dd, cut, it)}} phase multipliers.
+
+    Ratings without a phase-specific override use the intermediate multiplier
+    in every phase, so an un-tuned table reproduces Intermediate COCOMO.
+    """
+    catalogue = catalogue or load_catalogue()
+    table = {driver: {rating: (value,) * len(PHASES) for rating, value in ratings.items()}
+             for driver, ratings in catalogue.table.items()}
+    for driver, ratings in (overrides or {}).items():
+        if driver not in table:
+            raise ValueError(f"Unknown cost driver: {driver}")
+        for rating, values in ratings.items():
+            if rating not in table[driver]:
+                raise ValueError(f"Invalid rating for {driver}: {rating}")
+            if len(values) != len(PHASES):
+                raise ValueError(f"{driver}/{rating} needs {len(PHASES)} phase multipliers")
+            table[driver][rating] = tuple(float(v) for v in values)
+    return table
+
+
+def load_phase_multipliers(path, catalogue=None):
+    """
+    Read phase-specific overrides ({driver: {rating: [rpd, dd, cut, it]}}) from JSON.
+    """
+    with open(path) as f:
+        return phase_multiplier_table(catalogue, json.load(f))
+
+
+class Module:
+    """
+    A node of the system tree. factors are this node's phase multipliers
+    divided by the ones it inherits for the same drivers. kloc_sum and
+    weighted are the cached subtree totals: KLOC, and per phase
+    sum(kloc * eaf) including this node's factors. rated_below counts, per
+    driver, the nodes in the subtree (this one included) that rate it.
+    """
+    __slots__ = ("name", "parent", "children", "kloc", "ratings", "factors", "kloc_sum", "inner", "weighted",
+                 "rated_below")
+
+    def __init__(self, name, parent=None):
+        self.name = name
+        self.parent = parent
+        self.children = []
+        self.kloc = 0.0
+        self.ratings = {}
+        self.factors = _ONES
+        self.kloc_sum = 0.0
+        # Unscaled phase sums: own KLOC plus the children's weighted sums
+        self.inner = [0.0] * len(PHASES)
+        self.weighted = [0.0] * len(PHASES)
+        self.rated_below = {}
+
+    def __repr__(self):
+        return f"Module({self.name!r}, kloc={self.kloc}, children={len(self.children)})"
+
+
+class DetailedCOCOMO:
+    def __init__(self, project_type, cocomo=None, phase_multipliers=None, phase_fractions=None,
+                 root_name="System"):
+        self.cocomo = cocomo or COCOMO()
+        if project_type not in self.cocomo.coefficients:
+            raise ValueError("Invalid project type selected")
+        self.project_type = project_type
+        self.phase_multipliers = phase_multipliers or phase_multiplier_table()
+        self.phase_fractions = tuple(phase_fractions or PHASE_FRACTIONS[project_type])
+        if len(self.phase_fractions) != len(PHASES):
+            raise ValueError(f"Expected {len(PHASES)} phase fractions")
+        self.root = Module(root_name)
+        self.modules = {root_name: self.root}
+
+    @classmethod
+    def from_dict(cls, spec, project_type, **kwargs):
+        """
+        Build a tree from nested {"name", "kloc", "ratings", "children": [...]} dicts.
+        """
+        model = cls(project_type, root_name=spec.get("name", "System"), **kwargs)
+        model._configure(model.root, spec.get("kloc", 0), spec.get("ratings"))
+        stack = [(model.root, child) for child in reversed(spec.get("children", ()))]
+        while stack:
+            parent, child = stack.pop()
+            node = model._attach(child["name"], parent)
+            model._configure(node, child.get("kloc", 0), child.get("ratings"))
+            stack.extend((node, grandchild) for grandchild in reversed(child.get("children", ())))
+        model.rebuild()
+        return model
+
+    # --- Tree edits ---
+
+    def add_module(self, name, parent=None, kloc=0.0, ratings=None):
+        """
+        Add a module under parent (a name or Module; default: the root).
+        """
+        node = self._attach(name, self._node(parent) if parent is not None else self.root)
+        self._configure(node, kloc, ratings)
+        self._refresh(node)
+        self._propagate(node.parent, node.kloc_sum, node.weighted)
+        return node
+
+    def set_kloc(self, module, kloc):
+        node = self._node(module)
+        kloc = self._check_kloc(kloc)
+        delta = kloc - node.kloc
+        node.kloc = kloc
+        self._update(node, delta)
+
+    def set_rating(self, module, driver, rating):
+        """
+        Set one driver's rating on a module; None removes it so the module
+        inherits the rating again. An explicit "Nominal" still overrides.
+        """
+        node = self._node(module)
+        ratings = dict(node.ratings)
+        if rating is None:
+            ratings.pop(driver, None)
+        else:
+            ratings[driver] = rating
+        self.set_ratings(node, ratings)
+
+    def set_ratings(self, module, ratings):
+        node = self._node(module)
+        ratings = self._check_ratings(ratings)
+        old = node.ratings
+        changed = [d for d in set(old) | set(ratings) if old.get(d) != ratings.get(d)]
+        self._count(node, [d for d in ratings if d not in old], 1)
+        self._count(node, [d for d in old if d not in ratings], -1)
+        node.ratings = ratings
+
+        # Descendants overriding a changed driver now divide out a different inherited value
+        for driver in changed:
+            for overriding in self._frontier(node, driver):
+                overriding.factors = self._factors(overriding)
+                self._update(overriding, 0.0)
+        node.factors = self._factors(node)
+        self._update(node, 0.0)
+
+    def rebuild(self):
+        """
+        Recompute every cached total bottom-up, e.g. to shed accumulated rounding.
+        """
+        order, stack = [], [self.root]
+        while stack:
+            node = stack.pop()
+            node.factors = self._factors(node)  # parents come first, so inherited values are final
+            order.append(node)
+            stack.extend(node.children)
+        for node in reversed(order):
+            self._refresh(node)
+
+    # --- Results ---
+
+    def module_eaf(self, module):
+        """
+        Effective per-phase EAF of one module: each driver takes its nearest
+        rating on the path to the root, and is applied once.
+        """
+        node = self._node(module)
+        resolved = {}
+        while node is not None:
+            for driver, rating in node.ratings.items():
+                resolved.setdefault(driver, rating)
+            node = node.parent
+        eaf = _ONES
+        for driver, rating in resolved.items():
+            eaf = tuple(e * v for e, v in zip(eaf, self.phase_multipliers[driver][rating]))
+        return eaf
+
+    def estimate(self, module=None):
+        """
+        Estimate the whole system, or the share of effort of one subtree at the
+        system's nominal productivity. Schedule and staffing are only reported
+        for the whole system.
+        """
+        a, b, c, d = self.cocomo.coefficients[self.project_type]
+        total_kloc = self.root.kloc_sum
+        node = self._node(module) if module is not None else self.root
+        if total_kloc <= 0:
+            raise ValueError("The system has no KLOC")
+
+        # Subtree sums include the subtree root's factors; the ancestors' relative
+        # factors multiply out to the ratings the subtree inherits
+        ancestors = list(_ONES)
+        parent = node.parent
+        while parent is not None:
+            ancestors = [x * f for x, f in zip(ancestors, parent.factors)]
+            parent = parent.parent
+
+        scale = a * total_kloc ** (b - 1)
+        phases = [frac * scale * s * x for frac, s, x in zip(self.phase_fractions, node.weighted, ancestors)]
+        effort = sum(phases)
+
+        results = {
+            "Effort (PM)": round(effort, 2),
+            "KLOC": round(node.kloc_sum, 3),
+            "EAF": round(effort / (scale * node.kloc_sum), 3) if node.kloc_sum else 0.0,
+            "Phases": {phase: round(value, 2) for phase, value in zip(PHASES, phases)},
+        }
+        if node is self.root:
+            time = c * (effort ** d)
+            results["Development Time (Months)"] = round(time, 2)
+            results["Average Staff"] = round(effort / time, 2)
+        return results
+
+    # --- Internals ---
+
+    def _node(self, module):
+        if isinstance(module, Module):
+            return module
+        try:
+            return self.modules[module]
+        except KeyError:
+            raise ValueError(f"Unknown module: {module}")
+
+    def _attach(self, name, parent):
+        if name in self.modules:
+            raise ValueError(f"Duplicate module name: {name}")
+        node = Module(name, parent)
+        parent.children.append(node)
+        self.modules[name] = node
+        return node
+
+    def _configure(self, node, kloc, ratings):
+        node.kloc = self._check_kloc(kloc)
+        node.ratings = self._check_ratings(ratings or {})
+        self._count(node, node.ratings, 1)
+        node.factors = self._factors(node)
+
+    @staticmethod
+    def _check_kloc(kloc):
+        kloc = float(kloc)
+        if kloc < 0:
+            raise ValueError("KLOC cannot be negative")
+        return kloc
+
+    def _check_ratings(self, ratings):
+        for driver, rating in ratings.items():
+            if driver not in self.phase_multipliers:
+                raise ValueError(f"Unknown cost driver: {driver}")
+            if rating not in self.phase_multipliers[driver]:
+                raise ValueError(f"Invalid rating for {driver}: {rating}")
+        return dict(ratings)
+
+    def _inherited(self, node, driver):
+        """Phase multipliers of the nearest rating of driver at or above node."""
+        while node is not None:
+            rating = node.ratings.get(driver)
+            if rating is not None:
+                return self.phase_multipliers[driver][rating]
+            node = node.parent
+        return _ONES
+
+    def _factors(self, node):
+        factors = _ONES
+        for driver, rating in node.ratings.items():
+            own = self.phase_multipliers[driver][rating]
+            inherited = self._inherited(node.parent, driver)
+            factors = tuple(f * v / i for f, v, i in zip(factors, own, inherited))
+        return factors
+
+    @staticmethod
+    def _count(node, drivers, delta):
+        """Adjust rated_below for drivers on node and all its ancestors."""
+        if not drivers:
+            return
+        while node is not None:
+            for driver in drivers:
+                node.rated_below[driver] = node.rated_below.get(driver, 0) + delta
+            node = node.parent
+
+    @staticmethod
+    def _frontier(node, driver):
+        """Nearest descendants of node that rate driver themselves."""
+        stack = list(node.children)
+        while stack:
+            child = stack.pop()
+            if not child.rated_below.get(driver):
+                continue
+            if driver in child.ratings:
+                yield child
+            else:
+                stack.extend(child.children)
+
+    @staticmethod
+    def _refresh(node):
+        """Recompute one node's totals from its children's cached totals."""
+        node.kloc_sum = node.kloc + sum(child.kloc_sum for child in node.children)
+        node.inner = [node.kloc + sum(child.weighted[p] for child in node.children) for p in range(len(PHASES))]
+        node.weighted = [f * s for f, s in zip(node.factors, node.inner)]
+
+    def _update(self, node, kloc_delta):
+        # Only the node's own KLOC or factors changed: adjust it, then push deltas upward
+        old = node.weighted
+        node.kloc_sum += kloc_delta
+        node.inner = [s + kloc_delta for s in node.inner]
+        node.weighted = [f * s for f, s in zip(node.factors, node.inner)]
+        self._propagate(node.parent, kloc_delta, [new - prev for new, prev in zip(node.weighted, old)])
+
+    @staticmethod
+    def _propagate(node, kloc_delta, weighted_delta):
+        while node is not None:
+            node.kloc_sum += kloc_delta
+            node.inner = [s + d for s, d in zip(node.inner, weighted_delta)]
+            new = [f * s for f, s in zip(node.factors, node.inner)]
+            weighted_delta = [n - o for n, o in zip(new, node.weighted)]
+            node.weighted = new
+            node = node.parent
@@ -0,0 +1,204 @@
+# eaf_distribution.py
+import math
+
+import numpy as np
+
+from cocomo import COCOMO
+from data_handler import compile_catalogue
+
+
+class EAFDistribution:
+    """
+    Exact distribution of EAF over the full driver rating space.
+
+    The drivers are split into two halves of roughly equal combination
+    count. Each half's log-EAF sums are enumerated and sorted once, so the
+    CDF at any point is one searchsorted of one half into the other
+    (meet-in-the-middle) instead of a walk over every combination.
+
+    By default every combination counts equally, so results are fractions
+    of combinations. weights={driver: {rating: weight}} turns it into a
+    probability distribution; unlisted drivers stay uniform.
+    """
+
+    def __init__(self, catalogue=None, weights=None):
+        self.catalogue = catalogue or compile_catalogue()
+        self.total_combinations = math.prod(int(n) for n in self.catalogue.level_counts)
+        self.weighted = bool(weights)
+
+        logs, probs = self._driver_levels(weights or {})
+        self._levels = (logs, probs)
+        left, right = self._split([len(p) for p in probs])
+        self._a, self._wa = self._enumerate([logs[i] for i in left], [probs[i] for i in left])
+        b, wb = self._enumerate([logs[i] for i in right], [probs[i] for i in right])
+        order = np.argsort(b, kind="stable")
+        self._b = b[order]
+        self._cum_wb = np.concatenate([[0.0], np.cumsum(wb[order])])
+
+        self.min_log = float(self._a.min() + self._b[0])
+        self.max_log = float(self._a.max() + self._b[-1])
+
+    def _driver_levels(self, weights):
+        unknown = set(weights) - set(self.catalogue.drivers)
+        if unknown:
+            raise ValueError(f"Unknown cost drivers: {', '.join(sorted(unknown))}")
+        logs, probs = [], []
+        for r, driver in enumerate(self.catalogue.drivers):
+            n = int(self.catalogue.level_counts[r])
+            p = np.ones(n)
+            for rating, w in weights.get(driver, {}).items():
+                code = self.catalogue.level_index[r].get(rating)
+                if code is None:
+                    raise ValueError(f"Invalid rating for {driver}: {rating}")
+                if w < 0:
+                    raise ValueError(f"Negative weight for {driver}: {rating}")
+                p[code] = w
+            if driver in weights:
+                p[[c for c in range(n) if self.catalogue.levels[r][c] not in weights[driver]]] = 0.0
+            if p.sum() <= 0:
+                raise ValueError(f"No positive weights for {driver}")
+            logs.append(self.catalogue.log_table[r, :n])
+            probs.append(p / p.sum())
+        return logs, probs
+
+    @staticmethod
+    def _split(sizes):
+        """
+        Split drivers into two halves whose combination counts are as close
+        to each other as possible (exhaustive over the 2^15 subsets).
+        """
+        logs = np.log(np.asarray(sizes, dtype=float))
+        half = logs.sum() / 2
+        masks = np.arange(1 << len(sizes))
+        bits = (masks[:, None] >> np.arange(len(sizes))) & 1
+        best = int(masks[np.argmin(np.abs(bits @ logs - half))])
+        left = [i for i in range(len(sizes)) if best >> i & 1]
+        right = [i for i in range(len(sizes)) if not best >> i & 1]
+        return left, right
+
+    @staticmethod
+    def _enumerate(logs, probs):
+        total, weight = np.zeros(1), np.ones(1)
+        for log_values, p in zip(logs, probs):
+            total = np.add.outer(total, log_values).ravel()
+            weight = np.multiply.outer(weight, p).ravel()
+        return total, weight
+
+    # --- Exact queries ---
+
+    def cdf_log(self, log_eaf, tol=1e-12):
+        """
+        Fraction (or probability) of combinations with log(EAF) <= log_eaf.
+        """
+        return self._mass(self._index(log_eaf + tol))
+
+    def _index(self, log_eaf):
+        # For each left-half sum, how many right-half sums are <= log_eaf
+        return np.searchsorted(self._b, log_eaf - self._a, side="right")
+
+    def _mass(self, idx):
+        return float(np.dot(self._wa, self._cum_wb[idx]))
+
+    def cdf(self, eaf):
+        return self.cdf_log(math.log(eaf))
+
+    def fraction_above(self, eaf):
+        """
+        Fraction (or probability) of combinations with EAF strictly above eaf.
+        """
+        return 1.0 - self.cdf(eaf)
+
+    def count_above(self, eaf):
+        """
+        Number of rating combinations with EAF strictly above eaf (unweighted only).
+        """
+        if self.weighted:
+            raise ValueError("Combination counts are only defined without weights")
+        return round(self.fraction_above(eaf) * self.total_combinations)
+
+    def quantile_log(self, q, enumerate_below=200_000):
+        """
+        Exact q-quantile of log(EAF): the smallest achievable log-EAF whose CDF reaches q.
+
+        The bracket [lo, hi] is narrowed with Illinois false position on
+        the CDF until it holds at most enumerate_below combinations, which
+        are then listed and sorted to pick the exact value.
+        """
+        if not 0 <= q <= 1:
+            raise ValueError("Quantile must be between 0 and 1")
+        q -= 1e-12  # absorb rounding in the summed weights
+
+        lo, hi = self.min_log - 1e-9, self.max_log
+        idx_lo, idx_hi = self._index(lo), self._index(hi)
+        f_lo, f_hi = 0.0, self._mass(idx_hi)
+        g_lo, g_hi = f_lo - q, f_hi - q
+        last = 0
+        for _ in range(200):
+            inside = int((idx_hi - idx_lo).sum())
+            if inside <= enumerate_below or hi - lo < 1e-12:
+                break
+            # Illinois false position on the CDF residual, bisection as a safeguard
+            t = hi - g_hi * (hi - lo) / (g_hi - g_lo) if g_hi > g_lo else (lo + hi) / 2
+            if not lo < t < hi:
+                t = (lo + hi) / 2
+            idx_t = self._index(t)
+            f_t = self._mass(idx_t)
+            if f_t >= q:
+                hi, idx_hi, f_hi, g_hi = t, idx_t, f_t, f_t - q
+                if last == 1:
+                    g_lo /= 2
+                last = 1
+            else:
+                lo, idx_lo, f_lo, g_lo = t, idx_t, f_t, f_t - q
+                if last == -1:
+                    g_hi /= 2
+                last = -1
+
+        # Enumerate the combinations in (lo, hi] and walk their sorted weights
+        counts = idx_hi - idx_lo
+        rows = np.repeat(np.arange(len(self._a)), counts)
+        starts = np.cumsum(counts) - counts
+        cols = idx_lo[rows] + (np.arange(len(rows)) - starts[rows])
+        values = self._a[rows] + self._b[cols]
+        weights = self._wa[rows] * (self._cum_wb[cols + 1] - self._cum_wb[cols])
+        order = np.argsort(values, kind="stable")
+        cum = f_lo + np.cumsum(weights[order])
+        k = min(int(np.searchsorted(cum, q, side="left")), len(order) - 1)
+        return float(values[order][k])
+
+    def quantile(self, q):
+        return math.exp(self.quantile_log(q))
+
+    def effort_quantiles(self, kloc, project_type, qs=(0.1, 0.5, 0.9), cocomo=None):
+        """
+        Exact effort quantiles at a given KLOC across the rating space.
+        """
+        cocomo = cocomo or COCOMO()
+        try:
+            a, b, c, d = cocomo.coefficients[project_type]
+        except KeyError:
+            raise ValueError("Invalid project type selected")
+        scale = a * kloc ** b
+        return {f"P{round(q * 100)}": round(scale * self.quantile(q), 2) for q in qs}
+
+    # --- Histogram ---
+
+    def histogram(self, bins=2000):
+        """
+        Distribution of EAF on a uniform log grid built by convolving the
+        per-driver log-multiplier histograms. Each driver's log-multiplier is
+        snapped to the grid, so values are approximate to 15 half-steps while
+        the masses are exact. Returns (eaf_values, probabilities).
+        """
+        step = (self.max_log - self.min_log) / bins
+        mass = np.ones(1)
+        offset = 0.0
+        for log_values, p in zip(*self._levels):
+            base = log_values.min()
+            idx = np.rint((log_values - base) / step).astype(int)
+            h = np.zeros(idx.max() + 1)
+            np.add.at(h, idx, p)
+            mass = np.convolve(mass, h)
+            offset += base
+        values = np.exp(offset + np.arange(len(mass)) * step)
+        return values, mass
@@ -0,0 +1,143 @@
+# export.py
+"""
+Streaming portfolio exporters.
+
+Each exporter consumes an iterator of result rows (dicts such as the rows
+produced by cli.estimate_chunk) and writes them incrementally, so exporting
+hundreds of thousands of estimates uses bounded memory.
+"""
+import csv
+import html
+import os
+from datetime import datetime
+from itertools import chain
+
+DEFAULT_FIELDS = ["name", "kloc", "project_type", "Effort (PM)",
+                  "Development Time (Months)", "Average Staff", "EAF"]
+
+
+def _fields_and_rows(rows, fields):
+    """
+    Use the given fields, or take them from the first row without consuming it.
+    """
+    rows = iter(rows)
+    if fields is not None:
+        return list(fields), rows
+    first = next(rows, None)
+    if first is None:
+        return list(DEFAULT_FIELDS), iter(())
+    return list(first), chain([first], rows)
+
+
+def rows_from_batch(kloc, project_types, results, names=None):
+    """
+    Lazily turn calculate_effort_batch output into export rows.
+    """
+    keys = list(results)
+    for i in range(len(kloc)):
+        row = {"name": names[i] if names is not None else "", "kloc": float(kloc[i]),
+               "project_type": project_types[i]}
+        for key in keys:
+            row[key] = float(results[key][i])
+        yield row
+
+
+def export_csv(rows, path, fields=None):
+    fields, rows = _fields_and_rows(rows, fields)
+    count = 0
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(fields)
+        for row in rows:
+            writer.writerow([row.get(k, "") for k in fields])
+            count += 1
+    return count
+
+
+def export_xlsx(rows, path, fields=None, sheet_title="Portfolio"):
+    """
+    Write an XLSX workbook with openpyxl in write-only (constant memory) mode.
+    """
+    from openpyxl import Workbook  # deferred: only needed for XLSX exports
+
+    fields, rows = _fields_and_rows(rows, fields)
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(sheet_title)
+    ws.append(fields)
+    count = 0
+    for row in rows:
+        ws.append([row.get(k) for k in fields])
+        count += 1
+    wb.save(path)
+    return count
+
+
+HTML_HEAD = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<style>
+body {{ font-family: Arial, sans-serif; margin: 24px; }}
+h1 {{ color: #003366; }}
+table {{ border-collapse: collapse; width: 100%; font-size: 13px; }}
+th {{ background: #a5d6a7; position: sticky; top: 0; }}
+th, td {{ border: 1px solid #ccc; padding: 4px 8px; text-align: left; }}
+tr:nth-child(even) {{ background: #f1f8e9; }}
+</style>
+</head>
+<body>
+<h1>{title}</h1>
+<p>Generated {date}</p>
+<table>
+<thead><tr>{header}</tr></thead>
+<tbody>
+"""
+
+HTML_TAIL = """</tbody>
+</table>
+<p>{summary}</p>
+</body>
+</html>
+"""
+
+
+def export_html(rows, path, fields=None, title="COCOMO Portfolio Report"):
+    """
+    Write a single static HTML report, streaming one table row at a time.
+    Totals are accumulated on the way and written in the footer.
+    """
+    fields, rows = _fields_and_rows(rows, fields)
+    count, total_effort = 0, 0.0
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(HTML_HEAD.format(
+            title=html.escape(title),
+            date=datetime.now().strftime('%d-%m-%Y %H:%M:%S'),
+            header="".join(f"<th>{html.escape(str(k))}</th>" for k in fields)
+        ))
+        buf = []
+        for row in rows:
+            buf.append("<tr>" + "".join(f"<td>{html.escape(str(row.get(k, '')))}</td>" for k in fields) + "</tr>\n")
+            count += 1
+            total_effort += float(row.get("Effort (PM)") or 0)
+            if len(buf) >= 1000:
+                f.write("".join(buf))
+                buf.clear()
+        f.write("".join(buf))
+        f.write(HTML_TAIL.format(summary=f"{count} projects, total effort {round(total_effort, 2)} person-months."))
+    return count
+
+
+EXPORTERS = {".csv": export_csv, ".xlsx": export_xlsx, ".html": export_html, ".htm": export_html}
+
+
+def export(rows, path, fields=None):
+    """
+    Export rows to path, choosing the format from the file extension.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    try:
+        exporter = EXPORTERS[ext]
+    except KeyError:
+        raise ValueError(f"Unsupported export format: {ext or path}")
+    return exporter(rows, path, fields)
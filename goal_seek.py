@@ -0,0 +1,189 @@
+# goal_seek.py
+import heapq
+import math
+
+import numpy as np
+
+from cocomo import COCOMO
+from data_handler import compile_catalogue
+
+
+def _coefficients(cocomo, project_type):
+    try:
+        return cocomo.coefficients[project_type]
+    except KeyError:
+        raise ValueError("Invalid project type selected")
+
+
+def _eaf(eaf, catalogue):
+    """
+    Accept an EAF number or a {driver: rating} dict.
+    """
+    if isinstance(eaf, dict):
+        return float(catalogue.eaf(catalogue.encode(eaf)))
+    eaf = float(eaf)
+    if eaf <= 0:
+        raise ValueError("EAF must be positive")
+    return eaf
+
+
+def effort_cap(project_type, months=None, staff=None, max_effort=None, cocomo=None):
+    """
+    Largest effort (PM) meeting every given limit, solved analytically.
+
+    Time = c * E^d <= months  ->  E <= (months / c)^(1/d)
+    Staff = E / Time = E^(1-d) / c <= staff  ->  E <= (staff * c)^(1/(1-d))
+
+    Returns (effort, binding constraint name).
+    """
+    cocomo = cocomo or COCOMO()
+    a, b, c, d = _coefficients(cocomo, project_type)
+
+    limits = []
+    if months is not None:
+        if months <= 0:
+            raise ValueError("Months must be positive")
+        limits.append(((months / c) ** (1 / d), "months"))
+    if staff is not None:
+        if staff <= 0:
+            raise ValueError("Staff must be positive")
+        limits.append(((staff * c) ** (1 / (1 - d)), "staff"))
+    if max_effort is not None:
+        if max_effort <= 0:
+            raise ValueError("Effort cap must be positive")
+        limits.append((float(max_effort), "effort"))
+    if not limits:
+        raise ValueError("Give at least one of months, staff or max_effort")
+    return min(limits)
+
+
+def max_kloc(project_type, eaf=1.0, months=None, staff=None, max_effort=None, cocomo=None, catalogue=None):
+    """
+    Largest KLOC that fits the given schedule, team size and/or effort cap.
+
+    eaf is a number or a {driver: rating} dict. For example "largest KLOC we
+    can ship in 12 months with 8 people" is max_kloc(type, months=12, staff=8).
+    """
+    cocomo = cocomo or COCOMO()
+    a, b, c, d = _coefficients(cocomo, project_type)
+    eaf = _eaf(eaf, catalogue or compile_catalogue())
+
+    effort, binding = effort_cap(project_type, months, staff, max_effort, cocomo)
+    kloc = (effort / (a * eaf)) ** (1 / b)
+    time = c * (effort ** d)
+    return {
+        "KLOC": round(kloc, 2),
+        "Effort (PM)": round(effort, 2),
+        "Development Time (Months)": round(time, 2),
+        "Average Staff": round(effort / time, 2),
+        "EAF": round(eaf, 3),
+        "Binding Constraint": binding
+    }
+
+
+def _level_costs(catalogue, base_codes, cost):
+    """
+    Cost of moving each driver to each level. Defaults to the number of
+    rating steps away from the baseline; cost={driver: {rating: value}} overrides.
+    """
+    cost = cost or {}
+    table = []
+    for r, driver in enumerate(catalogue.drivers):
+        overrides = cost.get(driver, {})
+        row = []
+        for code, rating in enumerate(catalogue.levels[r]):
+            row.append(float(overrides.get(rating, abs(code - int(base_codes[r])))))
+        table.append(row)
+    return table
+
+
+def cheapest_driver_mix(kloc, project_type, max_effort, baseline=None, cost=None, locked=(),
+                        max_solutions=1, cocomo=None, catalogue=None):
+    """
+    Find the lowest-cost driver rating combinations whose effort is within max_effort.
+
+    Depth-first branch-and-bound over the rating space: a branch is pruned
+    when even the smallest remaining log-multipliers cannot reach the target
+    log-EAF, or when its cost cannot beat the current max_solutions best.
+    Drivers in locked keep their baseline rating.
+
+    Returns (solutions, nodes_explored); solutions are sorted by cost.
+    """
+    cocomo = cocomo or COCOMO()
+    catalogue = catalogue or compile_catalogue()
+    a, b, c, d = _coefficients(cocomo, project_type)
+    if max_effort <= 0 or kloc <= 0:
+        raise ValueError("KLOC and effort cap must be positive")
+    if max_solutions < 1:
+        raise ValueError("max_solutions must be at least 1")
+
+    base_codes = catalogue.encode(baseline or {})
+    unknown = set(locked) - set(catalogue.drivers)
+    if unknown:
+        raise ValueError(f"Unknown cost drivers: {', '.join(sorted(unknown))}")
+
+    target = math.log(max_effort / (a * kloc ** b)) + 1e-12
+    costs = _level_costs(catalogue, base_codes, cost)
+
+    # Candidate (log, cost, code) per driver, cheapest first
+    options = []
+    for r, driver in enumerate(catalogue.drivers):
+        codes = [int(base_codes[r])] if driver in locked else range(catalogue.level_counts[r])
+        opts = sorted(((float(catalogue.log_table[r, k]), costs[r][k], k) for k in codes),
+                      key=lambda o: (o[1], o[0]))
+        options.append((r, opts))
+    # Explore drivers with the most room to reduce EAF first: tighter bounds early
+    options.sort(key=lambda item: min(o[0] for o in item[1]) - max(o[0] for o in item[1]))
+
+    n = len(options)
+    suffix_min_log = np.zeros(n + 1)
+    suffix_min_cost = np.zeros(n + 1)
+    for i in range(n - 1, -1, -1):
+        suffix_min_log[i] = suffix_min_log[i + 1] + min(o[0] for o in options[i][1])
+        suffix_min_cost[i] = suffix_min_cost[i + 1] + min(o[1] for o in options[i][1])
+
+    best = []  # max-heap on cost via negation: (-cost, counter, codes, log_sum)
+    chosen = [0] * len(catalogue.drivers)
+    nodes = 0
+    counter = 0
+
+    def cost_bound():
+        return -best[0][0] if len(best) >= max_solutions else math.inf
+
+    def search(i, log_sum, total_cost):
+        nonlocal nodes, counter
+        nodes += 1
+        if log_sum + suffix_min_log[i] > target:
+            return
+        if total_cost + suffix_min_cost[i] >= cost_bound():
+            return
+        if i == n:
+            counter += 1
+            entry = (-total_cost, counter, list(chosen), log_sum)
+            if len(best) < max_solutions:
+                heapq.heappush(best, entry)
+            else:
+                heapq.heapreplace(best, entry)
+            return
+        r, opts = options[i]
+        for log_value, level_cost, code in opts:
+            chosen[r] = code
+            search(i + 1, log_sum + log_value, total_cost + level_cost)
+
+    search(0, 0.0, 0.0)
+
+    solutions = []
+    for neg_cost, _, codes, log_sum in sorted(best, key=lambda e: (-e[0], e[1])):
+        eaf = math.exp(log_sum)
+        effort = a * kloc ** b * eaf
+        ratings = catalogue.decode(codes)
+        changes = {drv: (catalogue.levels[r][int(base_codes[r])], ratings[drv])
+                   for r, drv in enumerate(catalogue.drivers) if codes[r] != base_codes[r]}
+        solutions.append({
+            "Ratings": ratings,
+            "Changes": changes,
+            "Cost": -neg_cost,
+            "EAF": round(eaf, 3),
+            "Effort (PM)": round(effort, 2)
+        })
+    return solutions, nodes
@@ -1,34 +1,145 @@
 # graph.py
-import matplotlib.pyplot as plt
+import io
 import math
 import os
+import threading
 
-def plot_results(results, project_name, save_path=None):
+from instrumentation import instrumented
+
+METRICS = ['Effort (PM)', 'Development Time (Months)', 'Average Staff']
+
+# One Agg figure per process, reused by every render call
+_FIGURE = None
+_FIGURE_LOCK = threading.Lock()
+
+
+def _draw_results(ax, results, project_name):
+    values = [results[m] for m in METRICS]
+    ceiling_values = [math.ceil(results[m]) for m in METRICS]
+
+    x = range(len(METRICS))
+
+    ax.bar(x, values, width=0.4, label='Calculated', color='skyblue')
+    ax.bar([i + 0.4 for i in x], ceiling_values, width=0.4, label='Ceiling', color='lightgreen')
+
+    ax.set_xticks([i + 0.2 for i in x])
+    ax.set_xticklabels(METRICS)
+    ax.set_ylabel('Values')
+    ax.set_title(f'COCOMO Results: {project_name}')
+    ax.legend()
+
+
+def _reusable_figure():
     """
-    Plot a bar graph of COCOMO results and save to a file if save_path is given.
+    Lazily create the per-process Agg figure. It uses the object-oriented
+    Figure API only, so no pyplot global state is touched.
+    """
+    global _FIGURE
+    if _FIGURE is None:
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+        fig = Figure(figsize=(8, 5))
+        FigureCanvasAgg(fig)
+        _FIGURE = fig
+    return _FIGURE
+
+
+def render_png(draw, dpi=100):
+    """
+    Clear the reusable figure, call draw(ax) and return the PNG bytes.
+    """
+    with _FIGURE_LOCK:
+        fig = _reusable_figure()
+        fig.clear()
+        ax = fig.add_subplot()
+        draw(ax)
+        fig.tight_layout()
+        buf = io.BytesIO()
+        fig.savefig(buf, format='png', dpi=dpi)
+    return buf.getvalue()
+
+
+def render_results_png(results, project_name, dpi=100):
+    """
+    Render the COCOMO results bar graph in memory and return PNG bytes.
+    Safe to call from worker threads and processes.
+    """
+    return render_png(lambda ax: _draw_results(ax, results, project_name), dpi)
+
+
+def render_results_image(results, project_name, dpi=100):
+    """
+    Same as render_results_png but wrapped in a BytesIO ready for generate_report.
     """
-    metrics = ['Effort (PM)', 'Development Time (Months)', 'Average Staff']
-    values = [results[m] for m in metrics]
-    ceiling_values = [math.ceil(results[m]) for m in metrics]
+    return io.BytesIO(render_results_png(results, project_name, dpi))
+
+
+def _draw_tornado(ax, tornado, project_name):
+    rows = list(reversed(tornado["Rows"]))  # largest swing on top
+    baseline = tornado["Baseline Effort"]
+    y = range(len(rows))
+
+    ax.barh(y, [r["Low Effort"] - baseline for r in rows], left=baseline, color='lightgreen', label='Lowest effort')
+    ax.barh(y, [r["High Effort"] - baseline for r in rows], left=baseline, color='salmon', label='Highest effort')
+    ax.axvline(baseline, color='black', linewidth=1)
+
+    ax.set_yticks(list(y))
+    ax.set_yticklabels([r["Driver"] for r in rows])
+    ax.set_xlabel('Effort (PM)')
+    ax.set_title(f'Sensitivity: {project_name}')
+    ax.legend()
+
+
+def render_tornado_png(tornado, project_name, dpi=100):
+    """
+    Render a tornado chart for sensitivity.tornado() output and return PNG bytes.
+    """
+    return render_png(lambda ax: _draw_tornado(ax, tornado, project_name), dpi)
+
 
-    x = range(len(metrics))
+def _draw_staffing(ax, staff, title, months=None):
+    labels = [str(m) for m in months] if months is not None else [str(m + 1) for m in range(len(staff))]
+    x = range(len(staff))
 
-    plt.figure(figsize=(8,5))
-    plt.bar(x, values, width=0.4, label='Calculated', color='skyblue')
-    plt.bar([i + 0.4 for i in x], ceiling_values, width=0.4, label='Ceiling', color='lightgreen')
+    ax.bar(x, staff, width=0.9, color='skyblue', label='Staff')
+    ax.axhline(sum(staff) / len(staff), color='black', linewidth=1, linestyle='--', label='Average')
 
-    plt.xticks([i + 0.2 for i in x], metrics)
-    plt.ylabel('Values')
-    plt.title(f'COCOMO Results: {project_name}')
-    plt.legend()
-    plt.tight_layout()
+    # Label at most ~12 ticks so long timelines stay readable
+    step = max(1, len(labels) // 12)
+    ax.set_xticks(list(x)[::step])
+    ax.set_xticklabels(labels[::step], rotation=45 if months is not None else 0)
+    ax.set_xlabel('Month')
+    ax.set_ylabel('Staff')
+    ax.set_title(f'Staffing Profile: {title}')
+    ax.legend()
 
+
+def render_staffing_png(staff, title, months=None, dpi=100):
+    """
+    Render monthly staff (staffing.staffing_profile or portfolio_load) as a
+    bar chart and return PNG bytes. months optionally labels the bars.
+    """
+    return render_png(lambda ax: _draw_staffing(ax, list(staff), title, months), dpi)
+
+
+@instrumented("graph.plot_results")
+def plot_results(results, project_name, save_path=None):
+    """
+    Plot a bar graph of COCOMO results and save to a file if save_path is given.
+    """
     if save_path:
         # Ensure folder exists
         folder = os.path.dirname(save_path)
         if folder and not os.path.exists(folder):
             os.makedirs(folder)
-        plt.savefig(save_path)
-        plt.close()
-    else:
-        plt.show()
+        with open(save_path, 'wb') as f:
+            f.write(render_results_png(results, project_name))
+        return
+
+    import matplotlib.pyplot as plt  # deferred: matplotlib is slow to import
+
+    fig, ax = plt.subplots(figsize=(8, 5))
+    _draw_results(ax, results, project_name)
+    fig.tight_layout()
+    plt.show()
@@ -1,13 +1,97 @@
 # gui.py
+import base64
+import os
+import queue
+import threading
 import tkinter as tk
 from tkinter import ttk, messagebox
 from cocomo import COCOMO
-from data_handler import load_multipliers
-from docx import Document
-from graph import plot_results
+from cache import shared_cache
+from store import EstimateStore
+from data_handler import load_multipliers, compile_catalogue
 import math
 from info import show_cocomo_info 
-from report import generate_report
+
+# report.py (python-docx) and graph.py (matplotlib) are imported on first use
+# so the window appears without paying for them at startup.
+
+RECALC_DELAY_MS = 250   # debounce for live recalculation
+POLL_MS = 100           # how often the main loop checks background tasks
+
+
+class Cancelled(Exception):
+    pass
+
+
+class BackgroundTask:
+    """
+    Run work(step) on a worker thread. work calls step(message) between
+    stages to report progress; step raises Cancelled once cancel() was
+    requested. Completion is delivered on the Tk thread via root.after.
+    If cancel() comes after work's last step, its result is passed to
+    discard (e.g. to delete a written file) instead of on_done.
+    """
+
+    def __init__(self, root, work, total_steps, on_progress, on_done, on_error, discard=None):
+        self.root = root
+        self.work = work
+        self.total_steps = total_steps
+        self.on_progress = on_progress
+        self.on_done = on_done
+        self.on_error = on_error
+        self.discard = discard
+        self.cancelled = threading.Event()
+        self.events = queue.Queue()
+        self.steps = 0
+        self.finished = False
+
+    def start(self):
+        threading.Thread(target=self._run, daemon=True).start()
+        self.root.after(POLL_MS, self._poll)
+        return self
+
+    def cancel(self):
+        self.cancelled.set()
+
+    def running(self):
+        return not self.finished
+
+    def _step(self, message):
+        if self.cancelled.is_set():
+            raise Cancelled()
+        self.events.put(("progress", message))
+
+    def _run(self):
+        try:
+            self.events.put(("done", self.work(self._step)))
+        except Cancelled:
+            self.events.put(("cancelled", None))
+        except Exception as e:
+            self.events.put(("error", e))
+
+    def _poll(self):
+        while True:
+            try:
+                kind, value = self.events.get_nowait()
+            except queue.Empty:
+                break
+            if kind == "progress":
+                self.steps += 1
+                self.on_progress(value, self.steps, self.total_steps)
+                continue
+            self.finished = True
+            # Decided here on the Tk thread, so a cancel cannot race the outcome
+            if kind == "done" and not self.cancelled.is_set():
+                self.on_done(value)
+            elif kind == "error":
+                self.on_error(value)
+            else:
+                if kind == "done" and self.discard is not None:
+                    self.discard(value)
+                self.on_progress("Cancelled", 0, self.total_steps)
+            return
+        self.root.after(POLL_MS, self._poll)
+
 
 class COCOMOApp:
     def __init__(self, root):
@@ -16,10 +100,18 @@ class COCOMOApp:
         self.root.state("zoomed")  # Fullscreen
 
         self.multipliers = load_multipliers()
-        self.cocomo = COCOMO()
+        self.catalogue = compile_catalogue()
+        self.cocomo = COCOMO(cache=shared_cache(), store=EstimateStore())
         self.inputs = {}
 
+        self.results = None
+        self.result_widgets = None
+        self._recorded = False
+        self._recalc_job = None
+        self._task = None
+
         self.create_main_window()
+        self.bind_live_recalc()
 
     def create_main_window(self):
         # --- Main Header ---
@@ -178,137 +270,263 @@ class COCOMOApp:
         self.output_frame = right_frame
 
 
+    def bind_live_recalc(self):
+        """
+        Recalculate (debounced) whenever KLOC, project type or a driver changes.
+        Live previews are not recorded; only Calculate and report actions are.
+        """
+        self.kloc_var = tk.StringVar()
+        self.kloc_entry.configure(textvariable=self.kloc_var)
+        self.kloc_var.trace_add("write", lambda *args: self.schedule_recalc())
+
+        for widget in [self.project_type] + list(self.inputs.values()):
+            widget.bind("<<ComboboxSelected>>", lambda e: self.schedule_recalc())
+            widget.bind("<KeyRelease>", lambda e: self.schedule_recalc())
+
+    def schedule_recalc(self):
+        if self._recalc_job is not None:
+            self.root.after_cancel(self._recalc_job)
+        self._recalc_job = self.root.after(RECALC_DELAY_MS, self.live_recalc)
+
+    def live_recalc(self):
+        self._recalc_job = None
+        self.show_results(live=True)
+
+    def selected_cost_drivers(self):
+        """
+        Encode the combobox selections through the driver catalogue.
+        Raises ValueError for a rating that is not in the table.
+        """
+        ratings = {drv: cb.get() for drv, cb in self.inputs.items()}
+        codes = self.catalogue.encode(ratings)
+        return self.catalogue.multipliers_for(codes)
+
              # Report Button Function
     def report_button_click(self):
-        try:
-            project_name = self.project_name_entry.get().strip() or "Unnamed Project"
-            kloc_val = float(self.kloc_entry.get())
-            project_type = self.project_type.get()
-
-            # Prepare cost drivers
-            cost_drivers = {}
-            for drv, cb in self.inputs.items():
-                selected = cb.get()
-                multiplier = self.multipliers[drv].get(selected, 1.0)
-                cost_drivers[drv] = multiplier
-
-            # Calculate results
-            results = self.cocomo.calculate_effort(kloc_val, project_type, cost_drivers)
-
-            # Optional: generate graph before report
-            graph_path = f"{project_name.replace(' ', '_')}_graph.png"
-            plot_results(results, project_name, save_path=graph_path)  # modify plot_results to save
-
-            # Generate report
-            filename = generate_report(
+        if self.results is None or self.task_running():
+            return
+        # Read widget state on the Tk thread; the worker only gets plain values
+        project_name, project_type, kloc_val, cost_drivers, results = self.results
+        self.record_results()
+
+        def work(step):
+            from graph import render_results_png, render_staffing_png
+            from report import generate_report
+            from staffing import staffing_profile
+
+            # Render the graphs in memory and embed them directly
+            step("Rendering graph...")
+            graph_image = render_results_png(results, project_name)
+            staffing = staffing_profile(results)
+            staffing_image = render_staffing_png(staffing, project_name)
+
+            step("Writing report...")
+            return generate_report(
                 project_name=project_name,
                 project_type=project_type,
                 kloc=kloc_val,
                 results=results,
                 cost_drivers=cost_drivers,
                 cocomo=self.cocomo,
-                graph_path=graph_path
+                graph_image=graph_image,
+                staffing=staffing,
+                staffing_image=staffing_image
             )
 
+        def done(filename):
+            self.set_status("Report saved", 2, 2)
             messagebox.showinfo("Report Generated", f"Report successfully saved as:\n{filename}")
 
-        except Exception as e:
+        def discard(filename):
+            # Cancelled while the report was being written
+            try:
+                os.remove(filename)
+            except OSError:
+                pass
+
+        self.start_task(work, 2, done, discard)
+
+    def show_graph(self):
+        if self.results is None or self.task_running():
+            return
+        project_name, _, _, _, results = self.results
+
+        def work(step):
+            from graph import render_results_png
+            step("Rendering graph...")
+            return render_results_png(results, project_name)
+
+        def done(png):
+            self.set_status("Graph ready", 1, 1)
+            window = tk.Toplevel(self.root)
+            window.title(f"COCOMO Results: {project_name}")
+            image = tk.PhotoImage(data=base64.b64encode(png))
+            label = tk.Label(window, image=image)
+            label.image = image  # keep a reference
+            label.pack()
+
+        self.start_task(work, 1, done)
+
+    # --- Background task plumbing ---
+
+    def task_running(self):
+        return self._task is not None and self._task.running()
+
+    def start_task(self, work, steps, on_done, discard=None):
+        def on_error(e):
+            self.set_status("Failed", 0, steps)
             messagebox.showerror("Error", str(e))
 
+        self.set_status("Starting...", 0, steps)
+        self._task = BackgroundTask(self.root, work, steps, self.set_status, on_done, on_error, discard).start()
+
+    def cancel_task(self):
+        if self.task_running():
+            self._task.cancel()
+            self.set_status("Cancelling...", 0, 1)
 
+    def set_status(self, message, done, total):
+        if self.result_widgets is None:
+            return
+        self.result_widgets["status"].config(text=message)
+        self.result_widgets["progress"].config(maximum=max(total, 1), value=done)
 
-    def show_results(self):
+    def show_results(self, live=False):
         try:
             kloc = float(self.kloc_entry.get())
             ptype = self.project_type.get()
 
-            cost_drivers = {}
-            for drv, cb in self.inputs.items():
-                selected = cb.get()
-                multiplier = self.multipliers[drv].get(selected, 1.0)
-                cost_drivers[drv] = multiplier
+            cost_drivers = self.selected_cost_drivers()
 
-            results = self.cocomo.calculate_effort(kloc, ptype, cost_drivers)
-
-            # Clear previous results
-            for widget in self.output_frame.winfo_children():
-                if widget != self.output_frame.pack_slaves()[0]:
-                    widget.destroy()
-
-            # --- RESULTS Table ---
             project_name = self.project_name_entry.get().strip() or "Unnamed Project"
+            # Live previews are not recorded in the history store
+            results = self.cocomo.calculate_effort(kloc, ptype, cost_drivers, project_name, record=not live)
+        except Exception as e:
+            # The displayed results no longer match the inputs: don't report on them
+            self.results = None
+            # Live updates fire on every keystroke: don't pop up for half-typed input
+            if live:
+                if self.result_widgets is not None:
+                    self.result_widgets["status"].config(text=f"Waiting for valid input: {e}")
+                return
+            messagebox.showerror("Error", str(e))
+            return
+
+        self.results = (project_name, ptype, kloc, cost_drivers, results)
+        self._recorded = not live
+        if self.result_widgets is None:
+            self.build_result_widgets(results)
+
+        # --- Update the existing widgets in place ---
+        widgets = self.result_widgets
+        widgets["frame"].config(text=f"RESULTS - {project_name}")
+        for key, val in results.items():
+            widgets["values"][key].config(text=val)
+            widgets["ceilings"][key].config(text=math.ceil(val))
+        for drv in cost_drivers:
+            rating_selected = self.inputs[drv].get()
+            multiplier_val = self.multipliers[drv][rating_selected]
+            widgets["drivers"][drv].config(text=f"{drv}: {rating_selected} → {multiplier_val}")
+        if not self.task_running():
+            widgets["status"].config(text="")
+
+    def record_results(self):
+        """
+        Save the displayed estimate to the history store, once per calculation.
+        """
+        if self.results is None or self._recorded:
+            return
+        project_name, ptype, kloc, cost_drivers, _ = self.results
+        self.cocomo.calculate_effort(kloc, ptype, cost_drivers, project_name)
+        self._recorded = True
+
+    def build_result_widgets(self, results):
+        """
+        Create the result table, KNOW IT! grid, action buttons and progress
+        row once; later calculations only update their text.
+        """
+        widgets = {"values": {}, "ceilings": {}, "drivers": {}}
+
+        # --- RESULTS Table ---
+        results_frame = tk.LabelFrame(
+            self.output_frame,
+            text="RESULTS",
+            font=("Roboto", 26, "bold"),
+            bg="#e8f5e9",
+            fg="#333333",
+            bd=3,
+            relief="ridge",
+            padx=15,
+            pady=15
+        )
+        results_frame.pack(fill="x", pady=10)
+        widgets["frame"] = results_frame
+
+        # --- Header Row ---
+        tk.Label(results_frame, text="Metric", font=("Roboto", 14, "bold"),
+                 bg="#a5d6a7", fg="#333333").grid(row=0, column=0, padx=10, pady=5, sticky="nsew")
+        tk.Label(results_frame, text="Value", font=("Roboto", 14, "bold"),
+                 bg="#a5d6a7", fg="#333333").grid(row=0, column=1, padx=10, pady=5, sticky="nsew")
+        tk.Label(results_frame, text="Ceiling Value", font=("Roboto", 14, "bold"),
+                 bg="#a5d6a7", fg="#333333").grid(row=0, column=2, padx=10, pady=5, sticky="nsew")
+
+        # --- Grid Rows for Results ---
+        for i, key in enumerate(results, start=1):
+            bg_color = "#ffffff" if i % 2 == 1 else "#f1f8e9"
+            tk.Label(results_frame, text=key, font=("Roboto", 12), bg=bg_color, anchor="w").grid(row=i, column=0, sticky="nsew", padx=10, pady=3)
+            widgets["values"][key] = tk.Label(results_frame, font=("Roboto", 12), bg=bg_color, anchor="w")
+            widgets["values"][key].grid(row=i, column=1, sticky="nsew", padx=10, pady=3)
+            widgets["ceilings"][key] = tk.Label(results_frame, font=("Roboto", 12), bg=bg_color, anchor="w")
+            widgets["ceilings"][key].grid(row=i, column=2, sticky="nsew", padx=10, pady=3)
+
+        # --- Make columns expand evenly ---
+        results_frame.grid_columnconfigure(0, weight=1)
+        results_frame.grid_columnconfigure(1, weight=1)
+        results_frame.grid_columnconfigure(2, weight=1)
+
+        # --- KNOW IT! Section (3x5 grid) ---
+        know_frame = tk.LabelFrame(
+            self.output_frame, text="KNOW IT!",
+            font=("Roboto", 14, "bold"),
+            bg="#e6f2ff", fg="#003366", bd=2, relief="groove", padx=10, pady=10
+        )
+        know_frame.pack(fill="both", pady=15, anchor="w")
 
-            results_frame = tk.LabelFrame(
-                self.output_frame,
-                text=f"RESULTS - {project_name}",
-                font=("Roboto", 26, "bold"),
-                bg="#e8f5e9",
-                fg="#333333",
-                bd=3,
-                relief="ridge",
-                padx=15,
-                pady=15
-            )
-            results_frame.pack(fill="x", pady=10)
-
-            # --- Header Row ---
-            tk.Label(results_frame, text="Metric", font=("Roboto", 14, "bold"),
-                     bg="#a5d6a7", fg="#333333").grid(row=0, column=0, padx=10, pady=5, sticky="nsew")
-            tk.Label(results_frame, text="Value", font=("Roboto", 14, "bold"),
-                     bg="#a5d6a7", fg="#333333").grid(row=0, column=1, padx=10, pady=5, sticky="nsew")
-            tk.Label(results_frame, text="Ceiling Value", font=("Roboto", 14, "bold"),
-                     bg="#a5d6a7", fg="#333333").grid(row=0, column=2, padx=10, pady=5, sticky="nsew")
-
-            # --- Grid Rows for Results ---
-            for i, (key, val) in enumerate(results.items(), start=1):
-                bg_color = "#ffffff" if i % 2 == 1 else "#f1f8e9"
-                tk.Label(results_frame, text=key, font=("Roboto", 12), bg=bg_color, anchor="w").grid(row=i, column=0, sticky="nsew", padx=10, pady=3)
-                tk.Label(results_frame, text=val, font=("Roboto", 12), bg=bg_color, anchor="w").grid(row=i, column=1, sticky="nsew", padx=10, pady=3)
-                tk.Label(results_frame, text=math.ceil(val), font=("Roboto", 12), bg=bg_color, anchor="w").grid(row=i, column=2, sticky="nsew", padx=10, pady=3)
-
-            # --- Make columns expand evenly ---
-            results_frame.grid_columnconfigure(0, weight=1)
-            results_frame.grid_columnconfigure(1, weight=1)
-            results_frame.grid_columnconfigure(2, weight=1)
-
-            # --- KNOW IT! Section (3x5 grid) ---
-            know_frame = tk.LabelFrame(
-                self.output_frame, text="KNOW IT!",
-                font=("Roboto", 14, "bold"),
-                bg="#e6f2ff", fg="#003366", bd=2, relief="groove", padx=10, pady=10
+        row, col = 0, 0
+        for drv in self.inputs:
+            widgets["drivers"][drv] = tk.Label(
+                know_frame,
+                font=("Roboto", 9),
+                bg="#e6f2ff", anchor="w"
             )
-            know_frame.pack(fill="both", pady=15, anchor="w")
-
-            row, col = 0, 0
-            for i, (drv, val) in enumerate(cost_drivers.items()):
-                rating_selected = self.inputs[drv].get()
-                multiplier_val = self.multipliers[drv][rating_selected]
-                lbl_text = f"{drv}: {rating_selected} → {multiplier_val}"
-                tk.Label(
-                    know_frame, text=lbl_text,
-                    font=("Roboto", 9),
-                    bg="#e6f2ff", anchor="w"
-                ).grid(row=row, column=col, sticky="w", padx=5, pady=2)
-
-                row += 1
-                if row == 5:
-                    row = 0
-                    col += 1
-
-
-            # --- Action Buttons ---
-            btn_frame = tk.Frame(self.output_frame, bg="#e6f2ff")
-            btn_frame.pack(pady=10)
-            tk.Button(btn_frame, text="Generate Report",
-                command=self.report_button_click,
-                bg="#003366", fg="white", font=("Roboto", 11, "bold")).pack(side="left", padx=5)
-            
-            tk.Button(btn_frame, text="Generate Graph",
-                      command=lambda: plot_results(results, self.project_name_entry.get()),
-                      bg="#003366", fg="white", font=("Roboto", 11, "bold")).pack(side="left", padx=5)
-
+            widgets["drivers"][drv].grid(row=row, column=col, sticky="w", padx=5, pady=2)
 
-        except Exception as e:
-            messagebox.showerror("Error", str(e))
+            row += 1
+            if row == 5:
+                row = 0
+                col += 1
 
-      
\ No newline at end of file
+        # --- Action Buttons ---
+        btn_frame = tk.Frame(self.output_frame, bg="#e6f2ff")
+        btn_frame.pack(pady=10)
+        tk.Button(btn_frame, text="Generate Report",
+            command=self.report_button_click,
+            bg="#003366", fg="white", font=("Roboto", 11, "bold")).pack(side="left", padx=5)
+
+        tk.Button(btn_frame, text="Generate Graph",
+                  command=self.show_graph,
+                  bg="#003366", fg="white", font=("Roboto", 11, "bold")).pack(side="left", padx=5)
+
+        tk.Button(btn_frame, text="Cancel",
+                  command=self.cancel_task,
+                  bg="#8b0000", fg="white", font=("Roboto", 11, "bold")).pack(side="left", padx=5)
+
+        # --- Background task progress ---
+        status_frame = tk.Frame(self.output_frame, bg="#ffffff")
+        status_frame.pack(fill="x", padx=10)
+        widgets["progress"] = ttk.Progressbar(status_frame, mode="determinate", length=300)
+        widgets["progress"].pack(side="left", padx=5)
+        widgets["status"] = tk.Label(status_frame, text="", font=("Roboto", 10), bg="#ffffff", anchor="w")
+        widgets["status"].pack(side="left", fill="x", expand=True)
+
+        self.result_widgets = widgets
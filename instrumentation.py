@@ -0,0 +1,230 @@
+# instrumentation.py
+"""
+Opt-in timing spans for the estimation and report hot paths.
+
+Spans record call counts, wall time and, optionally, tracemalloc peaks.
+Instrumentation is off by default; enable it with enable() or by setting
+COCOMO_INSTRUMENT=1 (or =memory to also trace allocations). When
+COCOMO_METRICS_FILE is set the metrics are written there at exit, as
+Prometheus text for *.prom files and JSON otherwise.
+
+    with span("report.save"):
+        doc.save(filename)
+
+    @instrumented("cocomo.calculate_effort")
+    def calculate_effort(...): ...
+"""
+import atexit
+import functools
+import json
+import os
+import threading
+import time
+
+INSTRUMENT_ENV = "COCOMO_INSTRUMENT"
+METRICS_FILE_ENV = "COCOMO_METRICS_FILE"
+
+_enabled = False
+_trace_memory = False
+_lock = threading.Lock()
+# span name -> [calls, total seconds, max seconds, peak bytes]
+_stats = {}
+# Per-thread stack of open memory frames, so nested spans keep their peaks
+_local = threading.local()
+
+
+def enable(trace_memory=False):
+    global _enabled, _trace_memory
+    if trace_memory:
+        import tracemalloc
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+    _trace_memory = trace_memory
+    _enabled = True
+
+
+def disable():
+    global _enabled, _trace_memory
+    _enabled = False
+    if _trace_memory:
+        import tracemalloc
+        tracemalloc.stop()
+    _trace_memory = False
+
+
+def is_enabled():
+    return _enabled
+
+
+def reset():
+    with _lock:
+        _stats.clear()
+
+
+def _record(name, seconds, peak=None):
+    with _lock:
+        entry = _stats.get(name)
+        if entry is None:
+            entry = _stats[name] = [0, 0.0, 0.0, 0]
+        entry[0] += 1
+        entry[1] += seconds
+        if seconds > entry[2]:
+            entry[2] = seconds
+        if peak is not None and peak > entry[3]:
+            entry[3] = peak
+
+
+class _NullSpan:
+    """Shared do-nothing span handed out while instrumentation is disabled."""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("name", "start", "memory")
+
+    def __init__(self, name):
+        self.name = name
+        self.memory = None
+
+    def __enter__(self):
+        if _trace_memory:
+            import tracemalloc
+            stack = getattr(_local, "stack", None)
+            if stack is None:
+                stack = _local.stack = []
+            current, peak = tracemalloc.get_traced_memory()
+            if stack:
+                # Resetting the peak below would hide it from the enclosing span
+                stack[-1][1] = max(stack[-1][1], peak)
+            tracemalloc.reset_peak()
+            self.memory = [current, 0]
+            stack.append(self.memory)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.start
+        peak = None
+        if self.memory is not None:
+            import tracemalloc
+            _, traced_peak = tracemalloc.get_traced_memory()
+            stack = _local.stack
+            stack.pop()
+            absolute = max(self.memory[1], traced_peak)
+            if stack:
+                stack[-1][1] = max(stack[-1][1], absolute)
+            peak = absolute - self.memory[0]
+        _record(self.name, elapsed, peak)
+        return False
+
+
+def span(name):
+    """
+    Context manager timing a block. Returns a shared no-op when disabled.
+    """
+    if not _enabled:
+        return _NULL_SPAN
+    return _Span(name)
+
+
+def instrumented(name):
+    """
+    Decorator wrapping every call of a function in span(name).
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            with _Span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def snapshot():
+    """
+    Current metrics as {span: {"calls", "total_seconds", "max_seconds", "peak_bytes"}}.
+    """
+    with _lock:
+        items = sorted((name, list(entry)) for name, entry in _stats.items())
+    return {
+        name: {
+            "calls": calls,
+            "total_seconds": round(total, 6),
+            "mean_seconds": round(total / calls, 6) if calls else 0.0,
+            "max_seconds": round(longest, 6),
+            "peak_bytes": peak if _trace_memory or peak else None,
+        }
+        for name, (calls, total, longest, peak) in items
+    }
+
+
+def prometheus_text(prefix="cocomo_span"):
+    """
+    Render the metrics in the Prometheus text exposition format.
+    """
+    metrics = snapshot()
+    families = [
+        ("calls_total", "counter", "Number of completed spans.", "calls"),
+        ("seconds_total", "counter", "Total wall time spent in the span.", "total_seconds"),
+        ("seconds_max", "gauge", "Longest single span.", "max_seconds"),
+        ("peak_bytes", "gauge", "Largest tracemalloc peak above the span's starting memory.", "peak_bytes"),
+    ]
+    lines = []
+    for suffix, kind, help_text, key in families:
+        samples = [(name, values[key]) for name, values in metrics.items() if values[key] is not None]
+        if not samples:
+            continue
+        lines.append(f"# HELP {prefix}_{suffix} {help_text}")
+        lines.append(f"# TYPE {prefix}_{suffix} {kind}")
+        for name, value in samples:
+            lines.append(f'{prefix}_{suffix}{{span="{name}"}} {value}')
+    return "\n".join(lines) + "\n"
+
+
+def _write_atomic(path, text):
+    # Replace in one step so a scraper never reads a half-written file
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        f.write(text)
+    os.replace(tmp, path)
+
+
+def write_prometheus(path):
+    _write_atomic(path, prometheus_text())
+
+
+def write_json(path):
+    _write_atomic(path, json.dumps(snapshot(), indent=2))
+
+
+def write_metrics(path):
+    """
+    Write Prometheus text for *.prom paths, JSON otherwise.
+    """
+    if path.endswith(".prom"):
+        write_prometheus(path)
+    else:
+        write_json(path)
+
+
+def _configure_from_env():
+    mode = os.environ.get(INSTRUMENT_ENV, "").strip().lower()
+    if mode in ("1", "true", "yes", "on", "memory"):
+        enable(trace_memory=mode == "memory")
+        path = os.environ.get(METRICS_FILE_ENV)
+        if path:
+            atexit.register(write_metrics, path)
+
+
+_configure_from_env()
@@ -0,0 +1,268 @@
+# montecarlo.py
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from cocomo import COCOMO
+from data_handler import compile_catalogue
+
+PERCENTILES = (10, 50, 90)
+METRICS = ("Effort (PM)", "Development Time (Months)", "Average Staff")
+
+# Log-spaced histogram used to stream percentiles without keeping every draw.
+# 1e-3 .. 1e7 over 40000 bins gives a relative resolution of about 0.06%.
+HIST_LOG10_MIN = -3.0
+HIST_LOG10_MAX = 7.0
+HIST_BINS = 40000
+
+# Draws per independently seeded block. Shards are runs of whole blocks, so
+# the random streams (and results) do not depend on how many shards run.
+SEED_BLOCK = 131_072
+
+
+class _LogHistogram:
+    """
+    Fixed log10-binned histogram. Counts are integers, so merging shards is
+    order independent and the final percentiles are reproducible. Values
+    outside the binned range land in the edge bins and are counted in
+    clipped so callers can tell the tail percentiles are not exact.
+    """
+
+    def __init__(self, counts=None, clipped=0):
+        self.scale = HIST_BINS / (HIST_LOG10_MAX - HIST_LOG10_MIN)
+        self.counts = np.zeros(HIST_BINS, dtype=np.int64) if counts is None else counts
+        self.clipped = clipped
+
+    def add(self, values):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            pos = (np.log10(values) - HIST_LOG10_MIN) * self.scale
+        clipped = values.size - int(np.count_nonzero((pos >= 0) & (pos < HIST_BINS)))
+        if clipped:
+            self.clipped += clipped
+            pos = np.nan_to_num(pos, nan=0.0, posinf=HIST_BINS, neginf=0.0)
+        np.clip(pos, 0, HIST_BINS - 1, out=pos)
+        self.counts += np.bincount(pos.astype(np.intp), minlength=HIST_BINS)
+
+    def merge(self, counts, clipped):
+        self.counts += counts
+        self.clipped += clipped
+
+    def percentile(self, q):
+        total = self.counts.sum()
+        if total == 0:
+            return float("nan")
+        cum = np.cumsum(self.counts)
+        rank = q / 100.0 * total
+        i = int(np.searchsorted(cum, rank, side="left"))
+        i = min(i, HIST_BINS - 1)
+        below = cum[i - 1] if i else 0
+        frac = (rank - below) / self.counts[i] if self.counts[i] else 0.5
+        log_value = HIST_LOG10_MIN + (i + frac) / self.scale
+        return 10 ** log_value
+
+
+def _kloc_sampler(kloc):
+    """
+    Normalise a KLOC specification into a picklable (name, params) tuple.
+
+    Accepted forms: a number (fixed size), ("triangular", low, mode, high),
+    ("lognormal", median, sigma) or ("uniform", low, high).
+    """
+    if isinstance(kloc, (int, float)):
+        if kloc <= 0:
+            raise ValueError("KLOC must be positive")
+        return ("fixed", (float(kloc),))
+
+    name, *params = kloc
+    params = tuple(float(p) for p in params)
+    if name == "triangular":
+        low, mode, high = params
+        if not 0 < low <= mode <= high or low == high:
+            raise ValueError("Triangular KLOC needs 0 < low <= mode <= high")
+    elif name == "lognormal":
+        median, sigma = params
+        if median <= 0 or sigma < 0:
+            raise ValueError("Lognormal KLOC needs median > 0 and sigma >= 0")
+    elif name == "uniform":
+        low, high = params
+        if not 0 < low < high:
+            raise ValueError("Uniform KLOC needs 0 < low < high")
+    else:
+        raise ValueError(f"Unknown KLOC distribution: {name}")
+    return (name, params)
+
+
+def _sample_kloc(rng, spec, size):
+    name, params = spec
+    if name == "fixed":
+        return np.full(size, params[0])
+    if name == "triangular":
+        return rng.triangular(params[0], params[1], params[2], size)
+    if name == "lognormal":
+        return rng.lognormal(math.log(params[0]), params[1], size)
+    return rng.uniform(params[0], params[1], size)
+
+
+def _driver_tables(catalogue, driver_weights):
+    """
+    Build (log_values, cumulative_probabilities) per driver from rating weights.
+    Drivers without weights stay at Nominal and are folded into a constant.
+    """
+    driver_weights = driver_weights or {}
+    unknown = set(driver_weights) - set(catalogue.drivers)
+    if unknown:
+        raise ValueError(f"Unknown cost drivers: {', '.join(sorted(unknown))}")
+
+    constant = 0.0
+    tables = []
+    for row, driver in enumerate(catalogue.drivers):
+        weights = driver_weights.get(driver)
+        if not weights:
+            constant += catalogue.log_table[row, catalogue.nominal_codes[row]]
+            continue
+
+        levels, probs = [], []
+        for rating, weight in weights.items():
+            code = catalogue.level_index[row].get(rating)
+            if code is None:
+                raise ValueError(f"Invalid rating for {driver}: {rating}")
+            if weight < 0:
+                raise ValueError(f"Negative weight for {driver}: {rating}")
+            if weight > 0:
+                levels.append(catalogue.log_table[row, code])
+                probs.append(float(weight))
+        if not probs:
+            raise ValueError(f"No positive weights for {driver}")
+
+        if len(levels) == 1:
+            constant += levels[0]
+            continue
+        cum = np.cumsum(probs)
+        tables.append((np.array(levels), cum / cum[-1]))
+
+    return float(constant), tables
+
+
+def _run_shard(kloc_spec, coefficients, constant, tables, sizes, seeds):
+    """
+    Evaluate one shard, a run of seeded blocks, one vectorized pass per block.
+    Returns histogram counts, clipped counts and the per-block sums. Module
+    level so it can run in a worker process.
+    """
+    a, b, c, d = coefficients
+    hists = [_LogHistogram() for _ in METRICS]
+    block_sums = np.zeros((len(sizes), len(METRICS)))
+
+    for block, (n, seed) in enumerate(zip(sizes, seeds)):
+        rng = np.random.default_rng(seed)
+        log_eaf = np.full(n, constant)
+        for log_values, cum in tables:
+            idx = np.searchsorted(cum, rng.random(n), side="right")
+            np.minimum(idx, len(cum) - 1, out=idx)
+            log_eaf += log_values[idx]
+
+        kloc = _sample_kloc(rng, kloc_spec, n)
+        effort = a * (kloc ** b) * np.exp(log_eaf)
+        time = c * (effort ** d)
+        staff = effort / time
+
+        for i, values in enumerate((effort, time, staff)):
+            hists[i].add(values)
+            block_sums[block, i] = values.sum()
+
+    return sum(sizes), [(h.counts, h.clipped) for h in hists], block_sums
+
+
+class MonteCarloEstimator:
+    """
+    Monte Carlo uncertainty engine on top of COCOMO.
+
+    KLOC is sampled from a distribution and each cost driver rating from
+    per-driver probability weights over the levels of the driver catalogue.
+    Draws are evaluated in vectorized chunks and large runs are sharded
+    across a process pool with seeds spawned from one SeedSequence.
+    """
+
+    def __init__(self, cocomo=None, multipliers=None, chunk_size=1_000_000):
+        self.cocomo = cocomo or COCOMO()
+        self.catalogue = compile_catalogue(multipliers)
+        self.chunk_size = chunk_size
+
+    def stream(self, kloc, project_type, driver_weights=None, draws=1_000_000,
+               seed=None, workers=1, shards=None):
+        """
+        Run the simulation and yield a running percentile summary after each
+        finished shard. The last summary covers every draw.
+        """
+        try:
+            coefficients = self.cocomo.coefficients[project_type]
+        except KeyError:
+            raise ValueError("Invalid project type selected")
+        if draws <= 0:
+            raise ValueError("Number of draws must be positive")
+
+        kloc_spec = _kloc_sampler(kloc)
+        constant, tables = _driver_tables(self.catalogue, driver_weights)
+
+        # Every block has its own seed and shards only group whole blocks, so a
+        # seed gives the same results however many shards or workers run
+        block = max(1, min(self.chunk_size, SEED_BLOCK))
+        blocks = math.ceil(draws / block)
+        block_sizes = [block] * (blocks - 1) + [draws - block * (blocks - 1)]
+        block_seeds = np.random.SeedSequence(seed).spawn(blocks)
+        if shards is None:
+            shards = max(workers, math.ceil(draws / self.chunk_size))
+        shards = max(1, min(shards, blocks))
+        bounds = [i * blocks // shards for i in range(shards + 1)]
+        jobs = [(kloc_spec, coefficients, constant, tables, block_sizes[lo:hi], block_seeds[lo:hi])
+                for lo, hi in zip(bounds, bounds[1:])]
+
+        hists = [_LogHistogram() for _ in METRICS]
+        sums = np.zeros(len(METRICS))
+        done = 0
+
+        def merge(result):
+            nonlocal done
+            n, counts, block_sums = result
+            done += n
+            for h, (c, clipped) in zip(hists, counts):
+                h.merge(c, clipped)
+            # Add block by block so the floating-point sums do not depend on the grouping
+            for row in block_sums:
+                sums[:] += row
+            return self._summary(done, draws, hists, sums)
+
+        if workers <= 1:
+            for job in jobs:
+                yield merge(_run_shard(*job))
+            return
+
+        with ProcessPoolExecutor(max_workers=min(workers, os.cpu_count() or 1)) as pool:
+            futures = [pool.submit(_run_shard, *job) for job in jobs]
+            # Merge in shard order so the floating-point sums are reproducible too
+            for future in futures:
+                yield merge(future.result())
+
+    def run(self, kloc, project_type, driver_weights=None, draws=1_000_000,
+            seed=None, workers=1, shards=None):
+        """
+        Run the simulation to completion and return the final summary.
+        """
+        summary = None
+        for summary in self.stream(kloc, project_type, driver_weights, draws,
+                                   seed, workers, shards):
+            pass
+        return summary
+
+    @staticmethod
+    def _summary(done, draws, hists, sums):
+        summary = {"Draws": done, "Total Draws": draws}
+        for metric, h, total in zip(METRICS, hists, sums):
+            stats = {f"P{q}": round(float(h.percentile(q)), 2) for q in PERCENTILES}
+            stats["Mean"] = round(float(total / done), 2)
+            # Draws outside the histogram range; percentiles past them are clamped
+            stats["Clipped"] = h.clipped
+            summary[metric] = stats
+        return summary
@@ -0,0 +1,259 @@
+# records.py
+"""
+Compact estimate results.
+
+EstimateResult is a slotted namedtuple holding one estimate at full
+precision; as_dict() gives the rounded dict calculate_effort returns, for
+display. Batches use the RESULT_DTYPE structured array (41 bytes a row).
+
+Large runs can be written column by column to a directory of raw
+little-endian files plus meta.json and reopened memory-mapped:
+
+    with ColumnWriter("run1", {"kloc": "f8", "Effort (PM)": "f8", "name": "str"}) as writer:
+        writer.append({"kloc": kloc, "Effort (PM)": effort, "name": names})
+    columns = open_columns("run1")
+    columns["Effort (PM)"].mean()
+"""
+import json
+import os
+from collections import namedtuple
+
+import numpy as np
+
+# Display names used by calculate_effort, in field order
+DISPLAY_KEYS = ("Effort (PM)", "Development Time (Months)", "Average Staff", "EAF")
+# Decimal places calculate_effort rounds each value to
+DISPLAY_DIGITS = (2, 2, 2, 3)
+
+RESULT_DTYPE = np.dtype([
+    ("kloc", "<f8"),
+    ("project_type", "u1"),
+    ("effort", "<f8"),
+    ("time", "<f8"),
+    ("staff", "<f8"),
+    ("eaf", "<f8"),
+])
+
+
+class EstimateResult(namedtuple("EstimateResult", ["effort", "time", "staff", "eaf"])):
+    """
+    One estimate at full precision: effort (PM), time (months), average
+    staff and EAF.
+    """
+    __slots__ = ()
+
+    @classmethod
+    def from_values(cls, effort, time, eaf):
+        return cls(effort, time, effort / time, eaf)
+
+    @classmethod
+    def from_dict(cls, results):
+        return cls(*(float(results[key]) for key in DISPLAY_KEYS))
+
+    def as_dict(self, round_results=True):
+        """
+        The calculate_effort dict, rounded for display unless round_results is False.
+        """
+        if round_results:
+            return {key: round(value, digits) for key, value, digits in zip(DISPLAY_KEYS, self, DISPLAY_DIGITS)}
+        return dict(zip(DISPLAY_KEYS, self))
+
+
+def to_structured(kloc, project_types, results):
+    """
+    Pack calculate_effort_batch output (preferably round_results=False)
+    into a RESULT_DTYPE array.
+    """
+    effort = np.asarray(results["Effort (PM)"])
+    out = np.empty(effort.shape, dtype=RESULT_DTYPE)
+    out["kloc"] = kloc
+    out["project_type"] = project_types
+    for field, key in zip(("effort", "time", "staff", "eaf"), DISPLAY_KEYS):
+        out[field] = results[key]
+    return out
+
+
+def iter_results(records):
+    """
+    Yield an EstimateResult per row of a RESULT_DTYPE array.
+    """
+    for effort, time, staff, eaf in zip(*(records[f].tolist() for f in ("effort", "time", "staff", "eaf"))):
+        yield EstimateResult(effort, time, staff, eaf)
+
+
+# --- Memory-mapped columnar files ---
+
+META_FILE = "meta.json"
+FORMAT_VERSION = 1
+
+
+class ColumnWriter:
+    """
+    Append-only writer for a columnar result directory.
+
+    columns maps column names to numpy dtype strings, or "str" for text,
+    which is stored as a UTF-8 blob plus int64 end offsets. Chunks can be
+    appended as they are produced; meta.json is written on close, and not at
+    all if the with block raised, so a partial directory never opens.
+    """
+
+    def __init__(self, path, columns, meta=None):
+        if not columns:
+            raise ValueError("At least one column is required")
+        os.makedirs(path, exist_ok=True)
+        # A rewritten directory is incomplete until closed again
+        if os.path.exists(os.path.join(path, META_FILE)):
+            os.remove(os.path.join(path, META_FILE))
+        self.path = path
+        self.meta = dict(meta or {})
+        self.rows = 0
+        self._columns = []
+        for i, (name, dtype) in enumerate(columns.items()):
+            entry = {"name": name, "file": f"col_{i:03d}.bin"}
+            if dtype == "str":
+                entry.update(dtype="str", offsets=f"col_{i:03d}.off", bytes=0)
+            else:
+                entry["dtype"] = np.dtype(dtype).newbyteorder("<").str
+            self._columns.append(entry)
+        self._files = [open(os.path.join(path, c["file"]), "wb") for c in self._columns]
+        self._offsets = {c["name"]: open(os.path.join(path, c["offsets"]), "wb")
+                         for c in self._columns if c["dtype"] == "str"}
+
+    def append(self, chunk):
+        """
+        Append one chunk: {column: array or list}, all of equal length.
+        """
+        lengths = {len(chunk[c["name"]]) for c in self._columns}
+        if len(lengths) != 1:
+            raise ValueError("All columns in a chunk must have the same length")
+        for column, f in zip(self._columns, self._files):
+            values = chunk[column["name"]]
+            if column["dtype"] == "str":
+                encoded = [str(v).encode("utf-8") for v in values]
+                ends = column["bytes"] + np.cumsum([len(e) for e in encoded], dtype=np.int64)
+                f.write(b"".join(encoded))
+                self._offsets[column["name"]].write(ends.astype("<i8").tobytes())
+                if len(ends):
+                    column["bytes"] = int(ends[-1])
+            else:
+                f.write(np.ascontiguousarray(values, dtype=column["dtype"]).tobytes())
+        self.rows += lengths.pop()
+
+    def append_rows(self, rows):
+        """
+        Append a list of row dicts (e.g. cli.estimate_chunk output).
+        """
+        self.append({c["name"]: [row[c["name"]] for row in rows] for c in self._columns})
+
+    def close(self, complete=True):
+        """
+        Close the column files; meta.json is only written if complete.
+        """
+        for f in self._files + list(self._offsets.values()):
+            f.close()
+        if not complete:
+            return
+        with open(os.path.join(self.path, META_FILE), "w") as f:
+            json.dump({"format": FORMAT_VERSION, "rows": self.rows, "columns": self._columns,
+                       "meta": self.meta}, f, indent=2)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close(complete=exc[0] is None)
+        return False
+
+
+class ResultColumns:
+    """
+    Read-only view of a columnar result directory. Numeric columns are
+    np.memmap arrays; text columns decode lazily from their blob.
+    """
+
+    def __init__(self, path):
+        if not os.path.isfile(os.path.join(path, META_FILE)):
+            raise ValueError(f"Not a complete result directory: {path}")
+        with open(os.path.join(path, META_FILE)) as f:
+            header = json.load(f)
+        if header.get("format") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported result file format: {path}")
+        self.path = path
+        self.rows = header["rows"]
+        self.meta = header["meta"]
+        self._columns = {c["name"]: c for c in header["columns"]}
+        self._cache = {}
+
+    @property
+    def names(self):
+        return list(self._columns)
+
+    def __len__(self):
+        return self.rows
+
+    def _map(self, filename, dtype, count):
+        if count == 0:
+            return np.empty(0, dtype=dtype)
+        return np.memmap(os.path.join(self.path, filename), dtype=dtype, mode="r", shape=(count,))
+
+    def __getitem__(self, name):
+        """
+        The whole column: a memory-mapped array, or a list of str for text columns.
+        """
+        if name not in self._cache:
+            try:
+                column = self._columns[name]
+            except KeyError:
+                raise ValueError(f"Unknown column: {name}")
+            if column["dtype"] == "str":
+                self._cache[name] = _TextColumn(self._map(column["file"], "u1", column["bytes"]),
+                                                self._map(column["offsets"], "<i8", self.rows))
+            else:
+                self._cache[name] = self._map(column["file"], column["dtype"], self.rows)
+        return self._cache[name]
+
+    def iter_rows(self, fields=None, chunk_size=100_000):
+        """
+        Yield row dicts chunk by chunk, ready for export.export().
+        """
+        fields = list(fields or self._columns)
+        for lo in range(0, self.rows, chunk_size):
+            hi = min(lo + chunk_size, self.rows)
+            columns = [self[f][lo:hi] for f in fields]
+            columns = [c if isinstance(c, list) else c.tolist() for c in columns]
+            for values in zip(*columns):
+                yield dict(zip(fields, values))
+
+
+class _TextColumn:
+    """Sliceable text column backed by a UTF-8 blob and end offsets."""
+
+    def __init__(self, blob, ends):
+        self._blob = blob
+        self._ends = ends
+
+    def __len__(self):
+        return len(self._ends)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            lo, hi, step = index.indices(len(self))
+            if step != 1:
+                return [self[i] for i in range(lo, hi, step)]
+            if lo >= hi:
+                return []
+            start = int(self._ends[lo - 1]) if lo else 0
+            ends = self._ends[lo:hi] - start
+            data = bytes(self._blob[start:int(self._ends[hi - 1])])
+            text, prev = [], 0
+            for end in ends.tolist():
+                text.append(data[prev:end].decode("utf-8"))
+                prev = end
+            return text
+        index = range(len(self))[index]
+        start = int(self._ends[index - 1]) if index else 0
+        return bytes(self._blob[start:int(self._ends[index])]).decode("utf-8")
+
+
+def open_columns(path):
+    return ResultColumns(path)
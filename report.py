@@ -1,108 +1,292 @@
 # report.py
-from docx import Document
-from docx.shared import Pt, RGBColor, Inches
-from docx.enum.text import WD_PARAGRAPH_ALIGNMENT
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+import io
 import math
 import os
+import re
+import sys
 
-def generate_report(project_name, project_type, kloc, results, cost_drivers, cocomo, graph_path=None):
-    """
-    Generate a professional COCOMO report in DOCX format with tables and optional graph.
-    """
+from instrumentation import instrumented, span
 
-    doc = Document()
+# Styled empty document, built once per process and cloned for every report
+_TEMPLATE_BYTES = None
 
-    # Set default font to Arial (san-serif)
-    style = doc.styles['Normal']
-    style.font.name = 'Arial'
-    style.font.size = Pt(11)
 
-    # Section 1: Header
-    header = doc.add_heading(f"COCOMO Report: {project_name}", level=0)
-    header.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
-    date_paragraph = doc.add_paragraph(f"Date & Time: {datetime.now().strftime('%d-%m-%Y %H:%M:%S')}")
-    date_paragraph.alignment = WD_PARAGRAPH_ALIGNMENT.RIGHT
+def _template_bytes():
+    global _TEMPLATE_BYTES
+    if _TEMPLATE_BYTES is None:
+        from docx import Document
+        from docx.shared import Pt
+
+        doc = Document()
+
+        # Set default font to Arial (san-serif)
+        style = doc.styles['Normal']
+        style.font.name = 'Arial'
+        style.font.size = Pt(11)
+
+        buf = io.BytesIO()
+        doc.save(buf)
+        _TEMPLATE_BYTES = buf.getvalue()
+    return _TEMPLATE_BYTES
 
-    doc.add_paragraph("\n")  # spacing
 
-    # Section 2: Project Info
-    doc.add_heading("PROJECT INFORMATION", level=1)
-    doc.add_paragraph(f"Project Name: {project_name}")
-    doc.add_paragraph(f"Type of Project: {project_type}")
-    doc.add_paragraph(f"KLOC: {kloc}")
+def new_document():
+    """
+    Return a fresh document cloned from the cached, pre-styled template.
+    """
+    from docx import Document
+    return Document(io.BytesIO(_template_bytes()))
 
-    # ABCD coefficients
-    A, B, C, D = cocomo.coefficients[project_type]
-    doc.add_paragraph("Coefficients Used:")
-    doc.add_paragraph(f"A = {A}, B = {B}, C = {C}, D = {D}")
 
-    doc.add_paragraph("\n")  # spacing
+def report_filename(project_name):
+    return f"COCOMO_Report_{project_name.replace(' ', '_')}.docx"
 
-    # Section 3: Outputs Table
-    doc.add_heading("OUTPUTS", level=1)
-    table = doc.add_table(rows=1, cols=3)
-    table.style = 'Table Grid'  # Safe built-in style
 
-    hdr_cells = table.rows[0].cells
-    hdr_cells[0].text = 'Metric'
-    hdr_cells[1].text = 'Calculated'
-    hdr_cells[2].text = 'Ceiling Value'
+def _style_header(cells, size=None):
+    from docx.shared import Pt, RGBColor
 
-    for cell in hdr_cells:
+    for cell in cells:
         for paragraph in cell.paragraphs:
             run = paragraph.runs[0]
             run.font.name = 'Arial'
-            run.font.size = Pt(12)
+            if size:
+                run.font.size = Pt(size)
+                run.font.color.rgb = RGBColor(0, 0, 0)  # black text
             run.font.bold = True
-            run.font.color.rgb = RGBColor(0, 0, 0)  # black text
 
-    for key in ['Effort (PM)', 'Development Time (Months)', 'Average Staff']:
-        row_cells = table.add_row().cells
-        row_cells[0].text = key
-        row_cells[1].text = str(round(results[key], 2))
-        row_cells[2].text = str(math.ceil(results[key]))
 
-    # Formulas
-    doc.add_paragraph("\nFormulas Used:")
-    doc.add_paragraph(f"Effort = A * (KLOC ^ B) * EAF = {A} * ({kloc} ^ {B}) * EAF")
-    doc.add_paragraph(f"Duration = C * (Effort ^ D) = {C} * (Effort ^ {D})")
-    doc.add_paragraph("Staff = Effort / Duration")
+@instrumented("report.generate_report")
+def generate_report(project_name, project_type, kloc, results, cost_drivers, cocomo, graph_path=None,
+                    output_dir=None, filename=None, graph_image=None, staffing=None, staffing_image=None):
+    """
+    Generate a professional COCOMO report in DOCX format with tables and optional graph.
+    The graph is either a file at graph_path or in-memory PNG bytes / BytesIO
+    in graph_image. staffing (monthly staff, see staffing.staffing_profile)
+    adds a staffing table, with staffing_image as its chart. The report is
+    saved in output_dir (default: current directory) and its path returned.
+    """
+    with span("report.document"):
+        # deferred: python-docx is only needed once a report is requested
+        from docx.shared import Inches
+        from docx.enum.text import WD_PARAGRAPH_ALIGNMENT
 
-    # Optional Summary
-    doc.add_paragraph(f"\nSummary: The project requires approximately {math.ceil(results['Effort (PM)'])} "
-                      f"person-months, with an estimated duration of {math.ceil(results['Development Time (Months)'])} months "
-                      f"and average staffing of {math.ceil(results['Average Staff'])} persons.")
+        doc = new_document()
 
-    doc.add_paragraph("\n")  # spacing
+    # Section 1: Header
+    with span("report.header"):
+        header = doc.add_heading(f"COCOMO Report: {project_name}", level=0)
+        header.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
+        date_paragraph = doc.add_paragraph(f"Date & Time: {datetime.now().strftime('%d-%m-%Y %H:%M:%S')}")
+        date_paragraph.alignment = WD_PARAGRAPH_ALIGNMENT.RIGHT
 
-    # Section 4: Cost Drivers Table
-    doc.add_heading("COST DRIVERS (EAF)", level=1)
-    eaf_table = doc.add_table(rows=1, cols=2)
-    eaf_table.style = 'Table Grid'  # Safe built-in style
+        doc.add_paragraph("\n")  # spacing
 
-    hdr_cells = eaf_table.rows[0].cells
-    hdr_cells[0].text = 'Cost Driver'
-    hdr_cells[1].text = 'Multiplier Value'
+        # Section 2: Project Info
+        doc.add_heading("PROJECT INFORMATION", level=1)
+        doc.add_paragraph(f"Project Name: {project_name}")
+        doc.add_paragraph(f"Type of Project: {project_type}")
+        doc.add_paragraph(f"KLOC: {kloc}")
 
-    for cell in hdr_cells:
-        for paragraph in cell.paragraphs:
-            run = paragraph.runs[0]
-            run.font.name = 'Arial'
-            run.font.bold = True
+        # ABCD coefficients
+        A, B, C, D = cocomo.coefficients[project_type]
+        doc.add_paragraph("Coefficients Used:")
+        doc.add_paragraph(f"A = {A}, B = {B}, C = {C}, D = {D}")
+
+        doc.add_paragraph("\n")  # spacing
+
+    # Section 3: Outputs Table (all rows created up front instead of add_row)
+    with span("report.outputs"):
+        doc.add_heading("OUTPUTS", level=1)
+        metrics = ['Effort (PM)', 'Development Time (Months)', 'Average Staff']
+        table = doc.add_table(rows=1 + len(metrics), cols=3)
+        table.style = 'Table Grid'  # Safe built-in style
+
+        hdr_cells = table.rows[0].cells
+        hdr_cells[0].text = 'Metric'
+        hdr_cells[1].text = 'Calculated'
+        hdr_cells[2].text = 'Ceiling Value'
+        _style_header(hdr_cells, size=12)
+
+        for row, key in zip(table.rows[1:], metrics):
+            row_cells = row.cells
+            row_cells[0].text = key
+            row_cells[1].text = str(round(results[key], 2))
+            row_cells[2].text = str(math.ceil(results[key]))
+
+        # Formulas
+        doc.add_paragraph("\nFormulas Used:")
+        doc.add_paragraph(f"Effort = A * (KLOC ^ B) * EAF = {A} * ({kloc} ^ {B}) * EAF")
+        doc.add_paragraph(f"Duration = C * (Effort ^ D) = {C} * (Effort ^ {D})")
+        doc.add_paragraph("Staff = Effort / Duration")
+
+        # Optional Summary
+        doc.add_paragraph(f"\nSummary: The project requires approximately {math.ceil(results['Effort (PM)'])} "
+                          f"person-months, with an estimated duration of {math.ceil(results['Development Time (Months)'])} months "
+                          f"and average staffing of {math.ceil(results['Average Staff'])} persons.")
+
+        doc.add_paragraph("\n")  # spacing
+
+    # Section 4: Cost Drivers Table
+    with span("report.cost_drivers"):
+        doc.add_heading("COST DRIVERS (EAF)", level=1)
+        eaf_table = doc.add_table(rows=1 + len(cost_drivers), cols=2)
+        eaf_table.style = 'Table Grid'  # Safe built-in style
 
-    for driver, val in cost_drivers.items():
-        row_cells = eaf_table.add_row().cells
-        row_cells[0].text = driver
-        row_cells[1].text = str(val)
+        hdr_cells = eaf_table.rows[0].cells
+        hdr_cells[0].text = 'Cost Driver'
+        hdr_cells[1].text = 'Multiplier Value'
+        _style_header(hdr_cells)
+
+        for row, (driver, val) in zip(eaf_table.rows[1:], cost_drivers.items()):
+            row_cells = row.cells
+            row_cells[0].text = driver
+            row_cells[1].text = str(val)
 
     # Section 5: Graph (optional)
-    if graph_path and os.path.exists(graph_path):
-        doc.add_paragraph("\n")
-        doc.add_heading("Graphical Representation", level=1)
-        doc.add_picture(graph_path, width=Inches(5))
+    with span("report.graph"):
+        if isinstance(graph_image, (bytes, bytearray)):
+            graph_image = io.BytesIO(graph_image)
+        if graph_image is None and graph_path and os.path.exists(graph_path):
+            graph_image = graph_path
+        if graph_image is not None:
+            doc.add_paragraph("\n")
+            doc.add_heading("Graphical Representation", level=1)
+            doc.add_picture(graph_image, width=Inches(5))
+
+    # Section 6: Staffing Profile (optional)
+    if staffing is not None:
+        with span("report.staffing"):
+            doc.add_paragraph("\n")
+            doc.add_heading("STAFFING PROFILE", level=1)
+            staff_table = doc.add_table(rows=1 + len(staffing), cols=3)
+            staff_table.style = 'Table Grid'  # Safe built-in style
+
+            hdr_cells = staff_table.rows[0].cells
+            hdr_cells[0].text = 'Month'
+            hdr_cells[1].text = 'Staff'
+            hdr_cells[2].text = 'Cumulative Effort (PM)'
+            _style_header(hdr_cells)
+
+            cumulative = 0.0
+            for month, (row, staff) in enumerate(zip(staff_table.rows[1:], staffing), start=1):
+                cumulative += staff
+                row_cells = row.cells
+                row_cells[0].text = str(month)
+                row_cells[1].text = str(round(staff, 2))
+                row_cells[2].text = str(round(cumulative, 2))
+
+            if isinstance(staffing_image, (bytes, bytearray)):
+                staffing_image = io.BytesIO(staffing_image)
+            if staffing_image is not None:
+                doc.add_picture(staffing_image, width=Inches(5))
 
     # Save document
-    filename = f"COCOMO_Report_{project_name.replace(' ', '_')}.docx"
-    doc.save(filename)
+    with span("report.save"):
+        filename = filename or report_filename(project_name)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+            filename = os.path.join(output_dir, filename)
+        doc.save(filename)
     return filename
+
+
+# --- Bulk reports ---
+
+class _Coefficients:
+    """Minimal stand-in for COCOMO carrying only the coefficients a worker needs."""
+
+    def __init__(self, coefficients):
+        self.coefficients = coefficients
+
+
+def unique_filenames(project_names, output_dir):
+    """
+    Collision-free, filesystem-safe report file names for a list of projects.
+    Names already taken in output_dir or earlier in the list get a _2, _3, ... suffix.
+    """
+    taken = {name.lower() for name in os.listdir(output_dir)} if os.path.isdir(output_dir) else set()
+    names = []
+    for project_name in project_names:
+        stem = re.sub(r"[^A-Za-z0-9._-]+", "_", project_name).strip("._") or "Unnamed_Project"
+        candidate = f"COCOMO_Report_{stem}.docx"
+        n = 2
+        while candidate.lower() in taken:
+            candidate = f"COCOMO_Report_{stem}_{n}.docx"
+            n += 1
+        taken.add(candidate.lower())
+        names.append(candidate)
+    return names
+
+
+def _bulk_job(project, coefficients, output_dir, filename, include_graph=False):
+    from cache import shared_cache
+    from cocomo import COCOMO
+
+    cocomo = COCOMO(cache=shared_cache())
+    cocomo.coefficients = coefficients
+    results = project.get("results")
+    if results is None:
+        results = cocomo.calculate_effort(project["kloc"], project["project_type"], project["cost_drivers"])
+    graph_image = None
+    if include_graph:
+        from graph import render_results_png
+        graph_image = render_results_png(results, project["project_name"])
+    return generate_report(
+        project_name=project["project_name"],
+        project_type=project["project_type"],
+        kloc=project["kloc"],
+        results=results,
+        cost_drivers=project["cost_drivers"],
+        cocomo=_Coefficients(coefficients),
+        graph_path=project.get("graph_path"),
+        output_dir=output_dir,
+        filename=filename,
+        graph_image=graph_image
+    )
+
+
+def print_progress(done, total):
+    sys.stderr.write(f"\rReports: {done}/{total}")
+    if done == total:
+        sys.stderr.write("\n")
+    sys.stderr.flush()
+
+
+def generate_bulk_reports(projects, output_dir, cocomo=None, workers=None, progress=print_progress,
+                          include_graph=False):
+    """
+    Generate one DOCX report per project into output_dir using a process pool.
+
+    Each project is a dict with project_name, project_type, kloc and
+    cost_drivers ({driver: multiplier}); "results" and "graph_path" are
+    optional. With include_graph the results chart is rendered in memory
+    inside the worker. progress(done, total) is called after every report.
+    Returns the report paths in input order.
+    """
+    from cocomo import COCOMO
+
+    projects = list(projects)
+    coefficients = dict((cocomo or COCOMO()).coefficients)
+    os.makedirs(output_dir, exist_ok=True)
+    filenames = unique_filenames([p.get("project_name") or "Unnamed Project" for p in projects], output_dir)
+    total = len(projects)
+
+    paths = []
+    if workers == 1:
+        for project, filename in zip(projects, filenames):
+            paths.append(_bulk_job(project, coefficients, output_dir, filename, include_graph))
+            if progress:
+                progress(len(paths), total)
+        return paths
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        chunksize = max(1, min(32, total // ((workers or os.cpu_count() or 1) * 4)))
+        jobs = pool.map(_bulk_job, projects, [coefficients] * total, [output_dir] * total,
+                        filenames, [include_graph] * total, chunksize=chunksize)
+        for path in jobs:
+            paths.append(path)
+            if progress:
+                progress(len(paths), total)
+    return paths
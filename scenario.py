@@ -0,0 +1,191 @@
+# scenario.py
+"""
+Incremental what-if scenarios.
+
+A Scenario holds one project as driver codes plus a running log-sum of its
+multipliers, so changing a rating or the KLOC updates effort, time and staff
+in constant time instead of re-running calculate_effort. ScenarioSet keeps
+named branches of a baseline and compares them side by side.
+"""
+import math
+
+from cocomo import COCOMO
+from data_handler import load_catalogue
+
+METRICS = ("Effort (PM)", "Development Time (Months)", "Average Staff", "EAF")
+
+
+class Scenario:
+    __slots__ = ("name", "kloc", "project_type", "codes", "log_eaf", "_cocomo", "_catalogue", "_log_table",
+                 "_rows", "_results")
+
+    def __init__(self, kloc, project_type, ratings=None, cocomo=None, catalogue=None, name="Baseline"):
+        self._cocomo = cocomo or COCOMO()
+        self._catalogue = catalogue or load_catalogue()
+        # Plain lists: scalar lookups are much cheaper than numpy indexing
+        self._log_table = self._catalogue.log_table.tolist()
+        self._rows = {driver: row for row, driver in enumerate(self._catalogue.drivers)}
+        self.name = name
+        self.kloc = 0.0
+        self.project_type = None
+        self.set_kloc(kloc)
+        self.set_project_type(project_type)
+        self.codes = self._catalogue.encode(ratings or {}).tolist()
+        self.resync()
+
+    def branch(self, name):
+        """
+        Copy this scenario under a new name; edits to either do not affect the other.
+        """
+        other = Scenario.__new__(Scenario)
+        other._cocomo = self._cocomo
+        other._catalogue = self._catalogue
+        other._log_table = self._log_table
+        other._rows = self._rows
+        other.name = name
+        other.kloc = self.kloc
+        other.project_type = self.project_type
+        other.codes = list(self.codes)
+        other.log_eaf = self.log_eaf
+        other._results = self._results
+        return other
+
+    # --- Edits, each O(1) ---
+
+    def set_rating(self, driver, rating):
+        try:
+            row = self._rows[driver]
+        except KeyError:
+            raise ValueError(f"Unknown cost drivers: {driver}")
+        try:
+            code = self._catalogue.level_index[row][rating]
+        except KeyError:
+            raise ValueError(f"Invalid rating for {driver}: {rating}")
+        log_row = self._log_table[row]
+        self.log_eaf += log_row[code] - log_row[self.codes[row]]
+        self.codes[row] = code
+        self._results = None
+
+    def set_kloc(self, kloc):
+        kloc = float(kloc)
+        if kloc <= 0:
+            raise ValueError("KLOC must be positive")
+        self.kloc = kloc
+        self._results = None
+
+    def set_project_type(self, project_type):
+        if project_type not in self._cocomo.coefficients:
+            raise ValueError("Invalid project type selected")
+        self.project_type = project_type
+        self._results = None
+
+    def resync(self):
+        """
+        Recompute the log-sum from scratch, dropping accumulated rounding.
+        """
+        self.log_eaf = math.fsum(row[code] for row, code in zip(self._log_table, self.codes))
+        self._results = None
+
+    # --- Results ---
+
+    @property
+    def ratings(self):
+        return self._catalogue.decode(self.codes)
+
+    @property
+    def eaf(self):
+        return math.exp(self.log_eaf)
+
+    def results(self):
+        """
+        Same dict as COCOMO.calculate_effort, cached until the next edit.
+        """
+        if self._results is None:
+            a, b, c, d = self._cocomo.coefficients[self.project_type]
+            eaf = math.exp(self.log_eaf)
+            effort = a * (self.kloc ** b) * eaf
+            time = c * (effort ** d)
+            self._results = {
+                "Effort (PM)": round(effort, 2),
+                "Development Time (Months)": round(time, 2),
+                "Average Staff": round(effort / time, 2),
+                "EAF": round(eaf, 3)
+            }
+        return dict(self._results)
+
+    def changes_from(self, other):
+        """
+        {field: (other value, this value)} for every input that differs.
+        """
+        changes = {}
+        if self.kloc != other.kloc:
+            changes["KLOC"] = (other.kloc, self.kloc)
+        if self.project_type != other.project_type:
+            changes["Project Type"] = (other.project_type, self.project_type)
+        levels = self._catalogue.levels
+        for row, (mine, theirs) in enumerate(zip(self.codes, other.codes)):
+            if mine != theirs:
+                changes[self._catalogue.drivers[row]] = (levels[row][theirs], levels[row][mine])
+        return changes
+
+    def __repr__(self):
+        return f"Scenario({self.name!r}, kloc={self.kloc}, {self.project_type}, eaf={self.eaf:.3f})"
+
+
+class ScenarioSet:
+    """
+    Named scenarios branched from one baseline.
+    """
+
+    def __init__(self, baseline):
+        self.baseline = baseline
+        self.scenarios = {baseline.name: baseline}
+
+    def branch(self, name, source=None):
+        """
+        Create scenario name as a copy of source (default: the baseline).
+        """
+        if name in self.scenarios:
+            raise ValueError(f"Duplicate scenario name: {name}")
+        scenario = self[source if source is not None else self.baseline.name].branch(name)
+        self.scenarios[name] = scenario
+        return scenario
+
+    def remove(self, name):
+        if name == self.baseline.name:
+            raise ValueError("The baseline scenario cannot be removed")
+        del self[name]
+
+    def __getitem__(self, name):
+        try:
+            return self.scenarios[name]
+        except KeyError:
+            raise ValueError(f"Unknown scenario: {name}")
+
+    def __delitem__(self, name):
+        self[name]
+        del self.scenarios[name]
+
+    def __iter__(self):
+        return iter(self.scenarios.values())
+
+    def __len__(self):
+        return len(self.scenarios)
+
+    def diff(self, names=None):
+        """
+        Compare scenarios side by side against the baseline.
+
+        Returns {"Scenarios": [names], metric: [values], "<metric> Change": [values],
+        "Changes": [{field: (baseline, scenario)}]}. Each scenario reuses its
+        cached results, so only scenarios edited since the last call recompute.
+        """
+        names = list(names) if names is not None else list(self.scenarios)
+        base = self.baseline.results()
+        table = {"Scenarios": names}
+        rows = [self[name].results() for name in names]
+        for metric in METRICS:
+            table[metric] = [row[metric] for row in rows]
+            table[f"{metric} Change"] = [round(row[metric] - base[metric], 3) for row in rows]
+        table["Changes"] = [self[name].changes_from(self.baseline) for name in names]
+        return table
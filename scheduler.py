@@ -0,0 +1,343 @@
+# scheduler.py
+"""
+Resource-constrained portfolio scheduling.
+
+Projects (estimated with COCOMO) are packed onto a shared staff pool month
+by month. They are taken from a heap in priority order (lower number first,
+then earliest start) and each is placed at the earliest month where its
+staffing fits under the remaining capacity for its whole duration.
+
+Monthly load minus capacity lives in a segment tree that keeps the max and
+min of each node, so reserving a project is one range add and a search for
+the first run of months with enough headroom is one left-to-right descent.
+Months already found too crowded for a run are remembered, so projects
+queued behind a saturated pool jump straight past them instead of
+rescanning: a 20k project portfolio schedules in seconds.
+"""
+import bisect
+import heapq
+import math
+
+PROFILES = ("flat", "rayleigh")
+
+# Staff a month may be over capacity by, to absorb floating-point noise
+TOLERANCE = 1e-9
+
+
+class _SegmentTree:
+    """
+    Range add over a fixed array with max/min per node, and searches for the
+    first index at or below a threshold or over a per-index profile.
+
+    Adds that cover a whole node are kept in its tag and never pushed down:
+    a node's max and min include its own tag, and searches add up the tags
+    of the ancestors on their way down.
+    """
+
+    def __init__(self, values):
+        self.n = len(values)
+        size = 1
+        while size < self.n:
+            size *= 2
+        self.size = size
+        # Padding leaves can never be picked by either search
+        self.max = [-math.inf] * (2 * size)
+        self.min = [math.inf] * (2 * size)
+        self.tag = [0.0] * (2 * size)
+        self.max[size:size + self.n] = values
+        self.min[size:size + self.n] = values
+        for node in range(size - 1, 0, -1):
+            self.max[node] = max(self.max[2 * node], self.max[2 * node + 1])
+            self.min[node] = min(self.min[2 * node], self.min[2 * node + 1])
+
+    def _pull(self, node):
+        self.max[node] = max(self.max[2 * node], self.max[2 * node + 1]) + self.tag[node]
+        self.min[node] = min(self.min[2 * node], self.min[2 * node + 1]) + self.tag[node]
+
+    def add(self, lo, hi, value, node=1, node_lo=0, node_hi=None):
+        """Add value to every index in [lo, hi)."""
+        if node_hi is None:
+            node_hi = self.size
+        if hi <= node_lo or node_hi <= lo:
+            return
+        if lo <= node_lo and node_hi <= hi:
+            self.max[node] += value
+            self.min[node] += value
+            self.tag[node] += value
+            return
+        mid = (node_lo + node_hi) // 2
+        self.add(lo, hi, value, 2 * node, node_lo, mid)
+        self.add(lo, hi, value, 2 * node + 1, mid, node_hi)
+        self._pull(node)
+
+    def add_profile(self, lo, values, node=1, node_lo=0, node_hi=None):
+        """Add values[i] to index lo + i, in one pass over the range."""
+        if node_hi is None:
+            node_hi = self.size
+        if lo + len(values) <= node_lo or node_hi <= lo:
+            return
+        if node_hi - node_lo == 1:
+            value = values[node_lo - lo]
+            self.max[node] += value
+            self.min[node] += value
+            return
+        mid = (node_lo + node_hi) // 2
+        self.add_profile(lo, values, 2 * node, node_lo, mid)
+        self.add_profile(lo, values, 2 * node + 1, mid, node_hi)
+        self._pull(node)
+
+    def value(self, i):
+        node, node_lo, node_hi, offset = 1, 0, self.size, 0.0
+        while node_hi - node_lo > 1:
+            offset += self.tag[node]
+            mid = (node_lo + node_hi) // 2
+            if i < mid:
+                node, node_hi = 2 * node, mid
+            else:
+                node, node_lo = 2 * node + 1, mid
+        return self.max[node] + offset
+
+    def first_run(self, lo, threshold, length):
+        """
+        Start of the first run of length indices >= lo whose values are all
+        <= threshold, or -1. One left-to-right descent: nodes wholly over the
+        threshold restart the run past them, nodes wholly under extend it.
+        """
+        run_start = lo
+        stack = [(1, 0, self.size, 0.0)]
+        while stack:
+            node, node_lo, node_hi, offset = stack.pop()
+            if node_hi <= lo:
+                continue
+            if self.min[node] + offset > threshold:
+                run_start = node_hi
+                continue
+            if node_hi - node_lo == 1 or (node_lo >= lo and self.max[node] + offset <= threshold):
+                if self.max[node] + offset > threshold:
+                    run_start = node_hi
+                elif node_hi - run_start >= length:
+                    return run_start if run_start + length <= self.n else -1
+                continue
+            offset += self.tag[node]
+            mid = (node_lo + node_hi) // 2
+            stack.append((2 * node + 1, mid, node_hi, offset))
+            stack.append((2 * node, node_lo, mid, offset))
+        return -1
+
+    def first_over(self, lo, profile, tolerance=0.0, node=1, node_lo=0, node_hi=None, offset=0.0):
+        """
+        First index i in [lo, lo + len(profile)) with value + profile[i - lo]
+        > tolerance, or -1. A node is skipped when its max plus the largest
+        profile value it overlaps stays within tolerance.
+        """
+        if node_hi is None:
+            node_hi = self.size
+        a, b = max(node_lo, lo), min(node_hi, lo + len(profile))
+        if a >= b or self.max[node] + offset + max(profile[a - lo:b - lo]) <= tolerance:
+            return -1
+        if node_hi - node_lo == 1:
+            return node_lo
+        offset += self.tag[node]
+        mid = (node_lo + node_hi) // 2
+        found = self.first_over(lo, profile, tolerance, 2 * node, node_lo, mid, offset)
+        if found < 0:
+            found = self.first_over(lo, profile, tolerance, 2 * node + 1, mid, node_hi, offset)
+        return found
+
+    def values(self, lo, hi):
+        """Current values of [lo, hi) as a list."""
+        out = []
+
+        def collect(node, node_lo, node_hi, offset):
+            if hi <= node_lo or node_hi <= lo:
+                return
+            if node_hi - node_lo == 1:
+                out.append(self.max[node] + offset)
+                return
+            offset += self.tag[node]
+            mid = (node_lo + node_hi) // 2
+            collect(2 * node, node_lo, mid, offset)
+            collect(2 * node + 1, mid, node_hi, offset)
+
+        collect(1, 0, self.size, 0.0)
+        return out
+
+
+def demand_profile(effort, time, profile="flat", whole_people=False):
+    """
+    Monthly staff a project needs: flat effort / months, or a Rayleigh curve.
+    """
+    months = max(1, math.ceil(time))
+    if profile == "flat":
+        demand = [effort / months] * months
+    elif profile == "rayleigh":
+        from staffing import staffing_profiles  # deferred: needs numpy
+        demand = staffing_profiles(effort, time)[0].tolist()
+    else:
+        raise ValueError(f"Unknown staffing profile: {profile}")
+    if whole_people:
+        demand = [math.ceil(d - 1e-9) for d in demand]
+    return demand
+
+
+def schedule(projects, capacity, profile="flat", whole_people=False):
+    """
+    Pack projects onto a staff pool.
+
+    projects is an iterable of dicts holding "Effort (PM)" and "Development
+    Time (Months)" (e.g. calculate_effort results or cli.py rows) and
+    optionally "name", "priority" (default 0; lower runs first) and
+    "earliest_start" (month number, default 0). capacity is the headcount,
+    either constant or a per-month sequence whose last value repeats.
+
+    Returns {"Projects": [...], "Load": [...], "Capacity": [...],
+    "Utilization": [...], "Average Utilization", "Makespan"}. Each project
+    row has its start and finish month and its slip past earliest_start;
+    projects that can never fit are listed with "Scheduled": False.
+    """
+    projects = list(projects)
+    demands, heap = [], []
+    for i, project in enumerate(projects):
+        demand = demand_profile(project["Effort (PM)"], project["Development Time (Months)"], profile, whole_people)
+        earliest = int(project.get("earliest_start", 0))
+        if earliest < 0:
+            raise ValueError("earliest_start cannot be negative")
+        demands.append(demand)
+        heap.append((project.get("priority", 0), earliest, i))
+    heapq.heapify(heap)
+
+    # Even run back to back after the last earliest_start and the last capacity
+    # change, every project that can fit at all fits in this horizon
+    max_earliest = max([e for _, e, _ in heap] + [0])
+    if not isinstance(capacity, (int, float)):
+        capacity = list(capacity)
+        max_earliest = max(max_earliest, len(capacity))
+    horizon = max_earliest + sum(len(d) for d in demands) + 1
+    capacities = _capacity_list(capacity, horizon)
+    tree = _SegmentTree([-c for c in capacities])
+    zones = _DeadZones(tree)
+    peak_capacity = max(capacities)
+
+    rows = [None] * len(projects)
+    while heap:
+        priority, earliest, i = heapq.heappop(heap)
+        demand = demands[i]
+        start = None
+        if max(demand) <= peak_capacity:
+            start = _earliest_fit(zones, demand, earliest, horizon)
+        project = projects[i]
+        row = {
+            "name": project.get("name", f"Project {i + 1}"),
+            "priority": priority,
+            "earliest_start": earliest,
+            "Staff": round(max(demand), 2),
+            "Scheduled": start is not None,
+            "Start": start,
+            "Finish": start + len(demand) if start is not None else None,
+            "Slip": start - earliest if start is not None else None,
+        }
+        if start is not None:
+            _reserve(tree, demand, start)
+        rows[i] = row
+
+    makespan = max([r["Finish"] for r in rows if r["Scheduled"]], default=0)
+    load = [v + c for v, c in zip(tree.values(0, makespan), capacities)]
+    utilization = [round(l / c, 4) if c else 0.0 for l, c in zip(load, capacities)]
+    return {
+        "Projects": rows,
+        "Load": [round(l, 4) for l in load],
+        "Capacity": capacities[:makespan],
+        "Utilization": utilization,
+        "Average Utilization": round(sum(load) / sum(capacities[:makespan]), 4) if makespan else 0.0,
+        "Makespan": makespan,
+    }
+
+
+def _capacity_list(capacity, horizon):
+    if isinstance(capacity, (int, float)):
+        capacities = [float(capacity)] * horizon
+    else:
+        capacities = [float(c) for c in capacity]
+        if not capacities:
+            raise ValueError("capacity must not be empty")
+        capacities += [capacities[-1]] * (horizon - len(capacities))
+    if min(capacities) < 0:
+        raise ValueError("capacity cannot be negative")
+    return capacities
+
+
+class _DeadZones:
+    """
+    Remembers, per (run length, bucketed headroom), the windows of months
+    where no such run can start. Headroom only shrinks as projects are
+    reserved, so a dead window stays dead, and it is dead for any run at
+    least as long that needs at least as much: later searches jump over it
+    instead of walking the same crowded stretch of the tree again.
+    """
+
+    RATIO = 1.25
+
+    def __init__(self, tree):
+        self.tree = tree
+        # key -> (starts, ends) of sorted, disjoint, non-touching windows
+        self.windows = {}
+
+    def first_run(self, lo, need, length):
+        """First month >= lo that can start length months of need headroom."""
+        if need <= 0:
+            return self.tree.first_run(lo, TOLERANCE, length)
+        bucket = math.floor(math.log(need) / math.log(self.RATIO))
+        starts, ends = self.windows.setdefault((length, bucket), ([], []))
+        i = bisect.bisect_right(starts, lo) - 1
+        dead_lo = starts[i] if i >= 0 and lo < ends[i] else lo
+        # Search for the bucket's floor, which lower-bounds the exact answer
+        bound = self.tree.first_run(max(lo, ends[i]) if i >= 0 else lo, -self.RATIO ** bucket + TOLERANCE, length)
+        if bound < 0:
+            bound = self.tree.n
+        if dead_lo < bound:
+            # Merge [dead_lo, bound) with every window it overlaps or touches
+            first = bisect.bisect_left(ends, dead_lo)
+            last = bisect.bisect_right(starts, bound)
+            merged = (min([dead_lo] + starts[first:last]), max([bound] + ends[first:last]))
+            starts[first:last] = [merged[0]]
+            ends[first:last] = [merged[1]]
+        return self.tree.first_run(bound, -need + TOLERANCE, length)
+
+
+def _earliest_fit(zones, demand, start, horizon):
+    tree = zones.tree
+    length = len(demand)
+    top = max(demand)
+    peak = demand.index(top)
+    # Core: the months around the peak that need at least half of it. Any
+    # start must give them a run of that much headroom
+    core_lo, core_hi = peak, peak + 1
+    while core_lo > 0 and demand[core_lo - 1] >= top / 2:
+        core_lo -= 1
+    while core_hi < length and demand[core_hi] >= top / 2:
+        core_hi += 1
+    need = min(demand[core_lo:core_hi])
+    while True:
+        month = zones.first_run(start + core_lo, need, core_hi - core_lo)
+        if month < 0:
+            return None
+        start = month - core_lo
+        if start + length > horizon:
+            return None
+        if need == top and core_hi - core_lo == length:
+            return start
+        clash = tree.first_over(start, demand, TOLERANCE)
+        if clash < 0:
+            return start
+        # Each later start puts an earlier month of the profile on the clash;
+        # the first that fits its headroom is the next candidate
+        headroom = -tree.value(clash)
+        start = next((clash - m for m in range(clash - start - 1, -1, -1) if demand[m] <= headroom + TOLERANCE),
+                     clash + 1)
+
+
+def _reserve(tree, demand, start):
+    if min(demand) == max(demand):
+        tree.add(start, start + len(demand), demand[0])
+    else:
+        tree.add_profile(start, demand)
@@ -0,0 +1,126 @@
+# sensitivity.py
+import numpy as np
+
+from cocomo import COCOMO
+from data_handler import compile_catalogue
+
+# Default relative KLOC perturbations used for the KLOC row of the tornado
+KLOC_STEPS = (-0.2, 0.2)
+
+
+def _effort_scale(cocomo, kloc, project_types):
+    """
+    a * KLOC^b per project (effort with EAF = 1).
+    """
+    codes = cocomo.encode_project_types(project_types)
+    table = cocomo.coefficient_table()[codes]
+    return table[..., 0] * np.asarray(kloc, dtype=float) ** table[..., 1]
+
+
+def level_efforts(kloc, project_type, ratings, cocomo=None, catalogue=None):
+    """
+    Effort for every alternative rating of every driver, holding the others fixed.
+
+    Returns a (15, max_levels) array aligned with catalogue.levels; padding
+    cells for levels a driver does not have are NaN.
+    """
+    cocomo = cocomo or COCOMO()
+    catalogue = catalogue or compile_catalogue()
+    codes = catalogue.encode(ratings)
+
+    base_log = catalogue.log_eaf(codes)
+    current = catalogue.log_table[np.arange(len(codes)), codes]
+    # Swap each driver's current log-multiplier for every level in one pass
+    log_eaf = base_log - current[:, None] + catalogue.log_table
+    return _effort_scale(cocomo, kloc, project_type) * np.exp(log_eaf)
+
+
+def tornado(kloc, project_type, ratings, cocomo=None, catalogue=None, kloc_steps=KLOC_STEPS):
+    """
+    Ranked tornado table for one project.
+
+    Each row covers one driver (or KLOC) with the ratings giving the lowest
+    and highest effort and the swing between them, sorted by swing.
+    """
+    cocomo = cocomo or COCOMO()
+    catalogue = catalogue or compile_catalogue()
+    codes = catalogue.encode(ratings)
+    efforts = level_efforts(kloc, project_type, ratings, cocomo, catalogue)
+    baseline = float(efforts[0, codes[0]])
+
+    low_idx = np.nanargmin(efforts, axis=1)
+    high_idx = np.nanargmax(efforts, axis=1)
+    rows = []
+    for r, driver in enumerate(catalogue.drivers):
+        low, high = efforts[r, low_idx[r]], efforts[r, high_idx[r]]
+        rows.append({
+            "Driver": driver,
+            "Current": catalogue.levels[r][codes[r]],
+            "Low Rating": catalogue.levels[r][low_idx[r]],
+            "Low Effort": round(float(low), 2),
+            "High Rating": catalogue.levels[r][high_idx[r]],
+            "High Effort": round(float(high), 2),
+            "Swing": round(float(high - low), 2)
+        })
+
+    if kloc_steps:
+        steps = np.asarray(kloc_steps, dtype=float)
+        klocs = kloc * (1 + steps)
+        kloc_efforts = _effort_scale(cocomo, klocs, [project_type] * len(klocs)) * catalogue.eaf(codes)
+        lo, hi = int(np.argmin(kloc_efforts)), int(np.argmax(kloc_efforts))
+        rows.append({
+            "Driver": "KLOC",
+            "Current": kloc,
+            "Low Rating": round(float(klocs[lo]), 2),
+            "Low Effort": round(float(kloc_efforts[lo]), 2),
+            "High Rating": round(float(klocs[hi]), 2),
+            "High Effort": round(float(kloc_efforts[hi]), 2),
+            "Swing": round(float(kloc_efforts[hi] - kloc_efforts[lo]), 2)
+        })
+
+    rows.sort(key=lambda row: row["Swing"], reverse=True)
+    return {"Baseline Effort": round(baseline, 2), "Rows": rows}
+
+
+def tornado_batch(kloc, project_types, codes, cocomo=None, catalogue=None, kloc_steps=KLOC_STEPS):
+    """
+    Vectorized driver sensitivity for a portfolio.
+
+    kloc and project_types have shape (N,), codes is the (N, 15) rating code
+    matrix. Returns baseline effort (N,), low/high effort and swing arrays of
+    shape (N, 15 [+1 for KLOC]) and a ranking array of column indices sorted
+    by descending swing. Column names are in "Columns".
+    """
+    cocomo = cocomo or COCOMO()
+    catalogue = catalogue or compile_catalogue()
+    codes = np.asarray(codes)
+    kloc = np.asarray(kloc, dtype=float)
+
+    scale = _effort_scale(cocomo, kloc, project_types)
+    log_eaf = catalogue.log_eaf(codes)
+    baseline = scale * np.exp(log_eaf)
+
+    current = catalogue.log_table[np.arange(codes.shape[1]), codes]
+    min_log = np.nanmin(catalogue.log_table, axis=1)
+    max_log = np.nanmax(catalogue.log_table, axis=1)
+    low = baseline[:, None] * np.exp(min_log - current)
+    high = baseline[:, None] * np.exp(max_log - current)
+    columns = list(catalogue.drivers)
+
+    if kloc_steps:
+        steps = np.asarray(kloc_steps, dtype=float)
+        step_efforts = np.stack([_effort_scale(cocomo, kloc * (1 + s), project_types) for s in steps], axis=1)
+        step_efforts *= np.exp(log_eaf)[:, None]
+        low = np.column_stack([low, step_efforts.min(axis=1)])
+        high = np.column_stack([high, step_efforts.max(axis=1)])
+        columns.append("KLOC")
+
+    swing = high - low
+    return {
+        "Columns": columns,
+        "Baseline Effort": baseline,
+        "Low Effort": low,
+        "High Effort": high,
+        "Swing": swing,
+        "Ranking": np.argsort(-swing, axis=1, kind="stable")
+    }
@@ -0,0 +1,309 @@
+# server.py
+"""
+Local asyncio HTTP estimation service.
+
+    python server.py --port 8765
+
+Endpoints (JSON bodies use the same record shape as cli.py):
+    GET  /health          -> {"status": "ok"}
+    POST /estimate        {"kloc": 32, "project_type": "organic", "RELY": "High"}
+    POST /estimate/bulk   JSON array or NDJSON of records, streamed back as NDJSON
+
+Concurrent /estimate requests are coalesced into micro-batches and evaluated
+with the vectorized COCOMO.calculate_effort_batch path.
+"""
+import argparse
+import asyncio
+import json
+import math
+import sys
+
+import numpy as np
+
+from cli import RESULT_FIELDS, chunked, estimate_chunk
+from cocomo import COCOMO, PROJECT_TYPES
+from data_handler import compile_catalogue
+
+MAX_BODY = 512 * 1024 * 1024
+BULK_CHUNK = 10_000
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           413: "Payload Too Large", 500: "Internal Server Error"}
+
+
+class MicroBatcher:
+    """
+    Collect single estimates for up to max_delay seconds (or max_batch items)
+    and evaluate them in one vectorized call.
+    """
+
+    def __init__(self, cocomo, max_batch=1024, max_delay=0.002):
+        self.cocomo = cocomo
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.queue = asyncio.Queue()
+        self.batches = 0
+        self.items = 0
+        self._task = None
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def estimate(self, kloc, project_type, eaf):
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((kloc, project_type, eaf, future))
+        return await future
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            deadline = loop.time() + self.max_delay
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            self._evaluate(batch)
+
+    def _evaluate(self, batch):
+        self.batches += 1
+        self.items += len(batch)
+        kloc = np.array([item[0] for item in batch])
+        eaf = np.array([item[2] for item in batch])
+        codes = np.array([item[1] for item in batch])
+        try:
+            results = self.cocomo.calculate_effort_batch(kloc, codes, eaf)
+        except Exception as e:
+            for item in batch:
+                if not item[3].done():
+                    item[3].set_exception(e)
+            return
+        columns = [results[f].tolist() for f in RESULT_FIELDS]
+        for i, item in enumerate(batch):
+            if not item[3].done():
+                item[3].set_result({f: col[i] for f, col in zip(RESULT_FIELDS, columns)})
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class EstimationServer:
+    def __init__(self, host="127.0.0.1", port=8765, max_batch=1024, max_delay=0.002):
+        self.host = host
+        self.port = port
+        self.cocomo = COCOMO()
+        self.type_codes = {name: i for i, name in enumerate(PROJECT_TYPES)}
+        self.batcher = MicroBatcher(self.cocomo, max_batch, max_delay)
+        self.server = None
+
+    async def start(self):
+        self.batcher.start()
+        self.server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+        await self.batcher.stop()
+
+    async def serve_forever(self):
+        await self.start()
+        print(f"COCOMO service listening on http://{self.host}:{self.port}", file=sys.stderr)
+        async with self.server:
+            await self.server.serve_forever()
+
+    # --- HTTP plumbing ---
+
+    async def _handle_connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, path, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    await self._send_json(writer, 400, {"error": "Malformed request line"}, False)
+                    break
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                try:
+                    length = int(headers.get("content-length", 0) or 0)
+                    if length < 0:
+                        raise ValueError
+                except ValueError:
+                    await self._send_json(writer, 400, {"error": "Invalid Content-Length"}, False)
+                    break
+                if length > MAX_BODY:
+                    await self._send_json(writer, 413, {"error": "Request body too large"}, False)
+                    break
+                body = await reader.readexactly(length) if length else b""
+
+                keep_alive = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+                await self._dispatch(writer, method, path, body, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def _dispatch(self, writer, method, path, body, keep_alive):
+        try:
+            if path == "/health":
+                if method != "GET":
+                    raise HTTPError(405, "Use GET")
+                await self._send_json(writer, 200, {"status": "ok", "batches": self.batcher.batches,
+                                                    "batched_items": self.batcher.items}, keep_alive)
+            elif path == "/estimate":
+                if method != "POST":
+                    raise HTTPError(405, "Use POST")
+                result = await self._estimate_single(self._parse_json(body))
+                await self._send_json(writer, 200, result, keep_alive)
+            elif path == "/estimate/bulk":
+                if method != "POST":
+                    raise HTTPError(405, "Use POST")
+                await self._estimate_bulk(writer, self._parse_records(body), keep_alive)
+            else:
+                raise HTTPError(404, f"No route for {path}")
+        except HTTPError as e:
+            await self._send_json(writer, e.status, {"error": str(e)}, keep_alive)
+        except (TypeError, ValueError) as e:
+            await self._send_json(writer, 400, {"error": str(e)}, keep_alive)
+
+    @staticmethod
+    def _parse_json(body):
+        try:
+            return json.loads(body)
+        except ValueError:
+            raise HTTPError(400, "Body is not valid JSON")
+
+    @staticmethod
+    def _parse_records(body):
+        text = body.decode("utf-8").strip()
+        if text.startswith("["):
+            records = json.loads(text)
+        else:
+            records = [json.loads(line) for line in text.splitlines() if line.strip()]
+        if not all(isinstance(r, dict) for r in records):
+            raise HTTPError(400, "Each record must be a JSON object")
+        return records
+
+    async def _send_json(self, writer, status, payload, keep_alive):
+        body = json.dumps(payload).encode()
+        writer.write(self._head(status, "application/json", keep_alive,
+                                f"Content-Length: {len(body)}") + body)
+        await writer.drain()
+
+    @staticmethod
+    def _head(status, content_type, keep_alive, extra):
+        return (f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+                f"Content-Type: {content_type}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+                f"{extra}\r\n\r\n").encode()
+
+    # --- Estimation ---
+
+    async def _estimate_single(self, record):
+        if not isinstance(record, dict):
+            raise HTTPError(400, "Body must be a JSON object")
+        for field in ("kloc", "project_type"):
+            if field not in record:
+                raise HTTPError(400, f"Missing field: {field}")
+        kloc = self._positive(record["kloc"], "kloc")
+        project_type = record["project_type"]
+        code = self.type_codes.get(project_type) if isinstance(project_type, str) else None
+        if code is None:
+            raise HTTPError(400, "Invalid project type selected")
+
+        if record.get("eaf") not in (None, ""):
+            eaf = self._positive(record["eaf"], "eaf")
+        else:
+            # Looked up per request so edits to multipliers.json are picked up live
+            catalogue = compile_catalogue()
+            ratings = {d: record[d] for d in catalogue.drivers if record.get(d) not in (None, "")}
+            eaf = float(catalogue.eaf(catalogue.encode(ratings)))
+        return await self.batcher.estimate(kloc, code, eaf)
+
+    @staticmethod
+    def _positive(value, field):
+        try:
+            number = float(value)
+        except (TypeError, ValueError):
+            raise HTTPError(400, f"Invalid {field}: {value!r}")
+        if not (math.isfinite(number) and number > 0):
+            raise HTTPError(400, f"{field} must be a positive number")
+        return number
+
+    async def _estimate_bulk(self, writer, records, keep_alive):
+        # Chunks run in the default executor so one large request does not
+        # stall the event loop for other clients
+        loop = asyncio.get_running_loop()
+        chunks = chunked(records, BULK_CHUNK)
+
+        # Validate the first chunk before committing to a 200 response
+        first = next(chunks, None)
+        first_rows = await loop.run_in_executor(None, estimate_chunk, *first) if first else []
+
+        writer.write(self._head(200, "application/x-ndjson", keep_alive, "Transfer-Encoding: chunked"))
+        rows = first_rows
+        while True:
+            if rows:
+                data = "".join(json.dumps(row) + "\n" for row in rows).encode()
+                writer.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+                await writer.drain()
+            nxt = next(chunks, None)
+            if nxt is None:
+                break
+            try:
+                rows = await loop.run_in_executor(None, estimate_chunk, *nxt)
+            except (TypeError, ValueError) as e:
+                # Headers are already sent: report the error in-band and stop
+                data = (json.dumps({"error": str(e)}) + "\n").encode()
+                writer.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+                break
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local COCOMO estimation service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--max-batch", type=int, default=1024, help="largest micro-batch")
+    parser.add_argument("--max-delay-ms", type=float, default=2.0, help="how long to wait to fill a micro-batch")
+    args = parser.parse_args(argv)
+
+    server = EstimationServer(args.host, args.port, args.max_batch, args.max_delay_ms / 1000)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,107 @@
+# staffing.py
+"""
+Rayleigh (Norden/Putnam) monthly staffing profiles.
+
+The cumulative effort of a project follows
+
+    E(t) = K * (1 - exp(-t^2 / (2 * td^2)))
+
+with td chosen so that SHARE of the effort is spent by the estimated
+development time T, i.e. td = T / sqrt(2 * ln(1 / (1 - SHARE))). The curve is
+cut at T and rescaled so every profile sums to the estimated effort. Month m
+then needs E(m + 1) - E(m) person-months, i.e. that many people on average.
+
+Profiles for many projects are built as one (N, months) array, and
+portfolio_load() sums them onto a shared monthly timeline with bincount.
+"""
+import math
+
+import numpy as np
+
+# Share of the total effort the Rayleigh curve reaches by the development time
+SHARE = 0.95
+
+
+def peak_time(time, share=SHARE):
+    """
+    Rayleigh td (month of peak staffing) for development times T.
+    """
+    return np.asarray(time, dtype=float) / math.sqrt(-2 * math.log(1 - share))
+
+
+def staffing_profiles(effort, time, share=SHARE, months=None):
+    """
+    Monthly staff for each project as an (N, months) array.
+
+    effort and time are arrays (or scalars) from calculate_effort(_batch).
+    Row i holds ceil(time[i]) non-zero months summing to effort[i]; months
+    defaults to the longest project.
+    """
+    effort = np.atleast_1d(np.asarray(effort, dtype=float))
+    time = np.atleast_1d(np.asarray(time, dtype=float))
+    if (time <= 0).any():
+        raise ValueError("Development time must be positive")
+    if months is None:
+        months = int(np.ceil(time.max())) if time.size else 0
+
+    td = peak_time(time, share)
+    t = np.minimum(np.arange(months + 1, dtype=float), time[:, None])
+    cumulative = 1 - np.exp(-t ** 2 / (2 * td[:, None] ** 2))
+    # Renormalise so the curve cut at T still adds up to the full effort
+    cumulative *= (effort / cumulative[:, -1])[:, None]
+    return np.diff(cumulative, axis=1)
+
+
+def staffing_profile(results, share=SHARE):
+    """
+    Monthly staff list for one calculate_effort result dict.
+    """
+    profile = staffing_profiles(results["Effort (PM)"], results["Development Time (Months)"], share)[0]
+    return profile.tolist()
+
+
+def _month_offsets(start):
+    """
+    Integer month offsets and the timeline origin for start dates given as
+    month numbers or datetime64 values.
+    """
+    start = np.asarray(start)
+    if start.dtype.kind == "M":
+        months = start.astype("datetime64[M]")
+        origin = months.min()
+        return (months - origin).astype(np.int64), origin
+    offsets = start.astype(np.int64)
+    origin = int(offsets.min())
+    return offsets - origin, origin
+
+
+def portfolio_load(effort, time, start=None, share=SHARE, chunk_size=50_000):
+    """
+    Sum the staffing curves of many projects onto one monthly timeline.
+
+    start gives each project's first month, as integer month numbers or
+    datetime64 dates (default: all start together). Projects are processed
+    in chunks so memory stays bounded. Returns (months, staff): month labels
+    (ints or datetime64[M]) and the total staff needed in each month.
+    """
+    effort = np.atleast_1d(np.asarray(effort, dtype=float))
+    time = np.atleast_1d(np.asarray(time, dtype=float))
+    if effort.shape != time.shape:
+        raise ValueError("effort and time must have the same length")
+    if effort.size == 0:
+        return np.arange(0), np.zeros(0)
+    offsets, origin = _month_offsets(np.zeros(effort.size, dtype=np.int64) if start is None else start)
+    if offsets.shape != effort.shape:
+        raise ValueError("start must have one entry per project")
+
+    length = int((offsets + np.ceil(time).astype(np.int64)).max())
+    load = np.zeros(length)
+    for lo in range(0, effort.size, chunk_size):
+        hi = lo + chunk_size
+        profiles = staffing_profiles(effort[lo:hi], time[lo:hi], share)
+        index = offsets[lo:hi, None] + np.arange(profiles.shape[1])
+        load += np.bincount(index.ravel(), weights=profiles.ravel(), minlength=length)[:length]
+
+    months = np.arange(length)
+    labels = origin + months if isinstance(origin, np.datetime64) else months + origin
+    return labels, load
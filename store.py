@@ -0,0 +1,233 @@
+# store.py
+import json
+import sqlite3
+import threading
+from datetime import datetime
+
+DEFAULT_DB = "cocomo_estimates.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS estimates (
+    id INTEGER PRIMARY KEY,
+    created_at TEXT NOT NULL,
+    day TEXT NOT NULL,
+    project_name TEXT,
+    project_type TEXT NOT NULL,
+    kloc REAL NOT NULL,
+    cost_drivers TEXT,
+    coefficients_version TEXT NOT NULL,
+    effort REAL NOT NULL,
+    time REAL NOT NULL,
+    staff REAL NOT NULL,
+    eaf REAL NOT NULL
+);
+"""
+
+# Covering indexes: type and date rollups never touch the table itself. day is
+# bucketed on insert so date rollups scan idx_estimates_day in order, without
+# computing a key per row or sorting.
+INDEXES = {
+    "idx_estimates_type": "estimates (project_type, effort, time, staff)",
+    "idx_estimates_day": "estimates (day, created_at, effort, time, staff)",
+    "idx_estimates_effort": "estimates (effort)",
+}
+
+INSERT = ("INSERT INTO estimates (created_at, day, project_name, project_type, kloc, cost_drivers,"
+          " coefficients_version, effort, time, staff, eaf) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)")
+
+# (key grouped in SQL, bucket applied to that key). Months fold the per-day
+# groups, so they use the day index too.
+GROUPS = {
+    "project_type": ("project_type", "k"),
+    "day": ("day", "k"),
+    "month": ("day", "substr(k, 1, 7)"),
+    "coefficients_version": ("coefficients_version", "k"),
+}
+
+# Batches at least this large, into a table no larger than the batch, drop the
+# indexes and rebuild them afterwards: one sort beats a million b-tree inserts
+REBUILD_MIN_ROWS = 100_000
+
+
+def _now():
+    return datetime.now().isoformat(sep=" ", timespec="seconds")
+
+
+class EstimateStore:
+    """
+    SQLite persistence for estimates: inputs, driver multipliers,
+    coefficient version and outputs, with indexes on project type,
+    date and effort for portfolio rollups.
+    """
+
+    def __init__(self, path=DEFAULT_DB, batch_size=50_000):
+        self.path = path
+        self.batch_size = batch_size
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        # A large page cache keeps index maintenance in memory during bulk inserts
+        self.conn.execute("PRAGMA cache_size=-131072")
+        self.conn.execute("PRAGMA temp_store=MEMORY")
+        self.conn.executescript(SCHEMA)
+        self._migrate()
+        self._create_indexes()
+
+    def _migrate(self):
+        # Databases written before the day bucket existed
+        columns = [r[1] for r in self.conn.execute("PRAGMA table_info(estimates)")]
+        if "day" not in columns:
+            with self.conn:
+                self.conn.execute("ALTER TABLE estimates ADD COLUMN day TEXT NOT NULL DEFAULT ''")
+                self.conn.execute("UPDATE estimates SET day = substr(created_at, 1, 10)")
+                self.conn.execute("DROP INDEX IF EXISTS idx_estimates_created")
+
+    def _create_indexes(self):
+        for name, target in INDEXES.items():
+            self.conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {target}")
+
+    def _drop_indexes(self):
+        for name in INDEXES:
+            self.conn.execute(f"DROP INDEX IF EXISTS {name}")
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # --- Writes ---
+
+    def record(self, kloc, project_type, results, cost_drivers=None, project_name=None,
+               coefficients_version="boehm-1981", created_at=None):
+        """
+        Store one calculate_effort result and return its row id.
+        """
+        created_at = created_at or _now()
+        row = (created_at, created_at[:10], project_name, project_type, float(kloc),
+               json.dumps(cost_drivers) if cost_drivers is not None else None, coefficients_version,
+               results["Effort (PM)"], results["Development Time (Months)"],
+               results["Average Staff"], results["EAF"])
+        with self._lock, self.conn:
+            cur = self.conn.execute(INSERT, row)
+        return cur.lastrowid
+
+    def record_batch(self, kloc, project_types, results, project_names=None, cost_drivers=None,
+                     coefficients_version="boehm-1981", created_at=None):
+        """
+        Store a calculate_effort_batch result (1-D columns of equal length) in
+        one transaction, fed to executemany batch_size rows at a time.
+        project_types may be names or PROJECT_TYPES codes. Returns the number
+        of rows stored.
+        """
+        import numpy as np
+        from cocomo import PROJECT_TYPES
+
+        created_at = created_at or _now()
+        columns = [np.ravel(results[k]).tolist() for k in
+                   ("Effort (PM)", "Development Time (Months)", "Average Staff", "EAF")]
+        kloc = np.ravel(kloc).astype(float).tolist()
+        types = [PROJECT_TYPES[t] if isinstance(t, int) else str(t) for t in np.ravel(project_types).tolist()]
+        n = len(kloc)
+        if any(len(column) != n for column in columns + [types]):
+            raise ValueError("kloc, project_types and results must have the same length")
+        names = project_names if project_names is not None else [None] * n
+        drivers = ([json.dumps(d) for d in cost_drivers] if cost_drivers is not None else [None] * n)
+
+        rows = zip([created_at] * n, [created_at[:10]] * n, names, types, kloc, drivers,
+                   [coefficients_version] * n, *columns)
+        stored = 0
+        with self._lock, self.conn:
+            self.conn.execute("BEGIN")
+            existing = self.conn.execute("SELECT MAX(id) FROM estimates").fetchone()[0] or 0
+            rebuild = n >= REBUILD_MIN_ROWS and n >= existing
+            if rebuild:
+                self._drop_indexes()
+            while True:
+                chunk = list(_take(rows, self.batch_size))
+                if not chunk:
+                    break
+                self.conn.executemany(INSERT, chunk)
+                stored += len(chunk)
+            if rebuild:
+                self._create_indexes()
+        return stored
+
+    # --- Reads ---
+
+    def _where(self, project_type, since, until, min_effort, max_effort):
+        clauses, params = [], []
+        # The day bounds are implied by the created_at ones but let SQLite seek idx_estimates_day
+        for clause, value in (("project_type = ?", project_type),
+                              ("day >= ?", since and since[:10]), ("created_at >= ?", since),
+                              ("day <= ?", until and until[:10]), ("created_at < ?", until),
+                              ("effort >= ?", min_effort), ("effort <= ?", max_effort)):
+            if value is not None:
+                clauses.append(clause)
+                params.append(value)
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    def rollup(self, group_by="project_type", project_type=None, since=None, until=None,
+               min_effort=None, max_effort=None):
+        """
+        Portfolio aggregates grouped by project_type, day, month or
+        coefficients_version. Dates filter on created_at ("YYYY-MM-DD ...").
+        """
+        try:
+            key, bucket = GROUPS[group_by]
+        except KeyError:
+            raise ValueError(f"Cannot group by {group_by}")
+        where, params = self._where(project_type, since, until, min_effort, max_effort)
+        sql = (f"SELECT {bucket}, SUM(n), SUM(effort), MAX(max_effort), SUM(time), SUM(staff) FROM"
+               f" (SELECT {key} AS k, COUNT(*) AS n, SUM(effort) AS effort, MAX(effort) AS max_effort,"
+               f" SUM(time) AS time, SUM(staff) AS staff FROM estimates{where} GROUP BY 1)"
+               f" GROUP BY 1 ORDER BY 1")
+        with self._lock:
+            rows = self.conn.execute(sql, params).fetchall()
+        return [{
+            group_by: r[0],
+            "Count": r[1],
+            "Total Effort (PM)": round(r[2], 2),
+            "Mean Effort (PM)": round(r[2] / r[1], 2),
+            "Max Effort (PM)": round(r[3], 2),
+            "Mean Development Time (Months)": round(r[4] / r[1], 2),
+            "Total Staff": round(r[5], 2)
+        } for r in rows]
+
+    def query(self, project_type=None, since=None, until=None, min_effort=None, max_effort=None,
+              limit=1000, order_by="effort DESC"):
+        """
+        Fetch stored estimates as dicts, newest or largest first.
+        """
+        if order_by not in ("effort DESC", "effort ASC", "created_at DESC", "created_at ASC"):
+            raise ValueError(f"Cannot order by {order_by}")
+        where, params = self._where(project_type, since, until, min_effort, max_effort)
+        sql = f"SELECT * FROM estimates{where} ORDER BY {order_by} LIMIT ?"
+        with self._lock:
+            cur = self.conn.execute(sql, params + [limit])
+            names = [c[0] for c in cur.description]
+            rows = cur.fetchall()
+        out = []
+        for row in rows:
+            record = dict(zip(names, row))
+            if record["cost_drivers"]:
+                record["cost_drivers"] = json.loads(record["cost_drivers"])
+            out.append(record)
+        return out
+
+    def count(self):
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM estimates").fetchone()[0]
+
+
+def _take(iterator, n):
+    for _ in range(n):
+        try:
+            yield next(iterator)
+        except StopIteration:
+            return
@@ -0,0 +1,69 @@
+import json
+import math
+
+import numpy as np
+import pytest
+
+from calibration import Calibrator
+from cocomo import COCOMO, load_coefficients, save_coefficients
+
+
+def _history(n=20):
+    rng = np.random.default_rng(3)
+    kloc = rng.uniform(5, 200, n)
+    effort = 3.0 * kloc ** 1.1
+    time = 2.4 * effort ** 0.36
+    return kloc, effort, time
+
+
+def test_fit_recovers_the_generating_coefficients():
+    kloc, effort, time = _history()
+    calibrator = Calibrator()
+    calibrator.update(kloc, ["organic"] * len(kloc), np.ones(len(kloc)), effort, time)
+
+    a, b, c, d = calibrator.fit()["coefficients"]["organic"]
+    assert (a, b, c, d) == pytest.approx((3.0, 1.1, 2.4, 0.36), rel=1e-4)
+
+
+@pytest.mark.parametrize("field", ["kloc", "eaf", "effort"])
+@pytest.mark.parametrize("value", [math.nan, math.inf, 0.0])
+def test_non_finite_or_non_positive_rows_are_rejected_with_their_row(field, value):
+    kloc, effort, time = _history(5)
+    columns = {"kloc": kloc, "eaf": np.ones(5), "effort": effort}
+    columns[field][3] = value
+
+    calibrator = Calibrator()
+    calibrator.rows = 10
+    with pytest.raises(ValueError, match="Row 14: "):
+        calibrator.update(columns["kloc"], ["organic"] * 5, columns["eaf"], columns["effort"], time)
+
+
+def test_records_with_nan_effort_are_rejected():
+    records = [{"kloc": "10", "project_type": "organic", "actual_effort": "nan"}]
+    with pytest.raises(ValueError, match="Row 1: "):
+        Calibrator().update_records(records)
+
+
+def test_fit_refuses_unusable_coefficients():
+    # Effort falling with size gives a negative exponent b
+    kloc = np.array([10.0, 20.0, 40.0, 80.0])
+    calibrator = Calibrator()
+    calibrator.update(kloc, ["organic"] * 4, np.ones(4), 1000.0 / kloc)
+
+    with pytest.raises(ValueError, match="organic"):
+        calibrator.fit()
+
+
+def test_load_coefficients_rejects_non_finite_values(tmp_path):
+    kloc, effort, time = _history()
+    calibrator = Calibrator()
+    calibrator.update(kloc, ["organic"] * len(kloc), np.ones(len(kloc)), effort, time)
+    path = tmp_path / "coefficients.json"
+    save_coefficients(calibrator.fit(), path)
+    assert COCOMO(coefficients_path=str(path)).coefficients["organic"][0] == pytest.approx(3.0, rel=1e-4)
+
+    data = json.loads(path.read_text())
+    data["coefficients"]["organic"] = [float("nan"), 1.05, 2.5, 0.38]
+    path.write_text(json.dumps(data))
+    with pytest.raises(ValueError, match="positive and finite"):
+        load_coefficients(str(path))
@@ -0,0 +1,56 @@
+import json
+
+import pytest
+
+from cli import estimate_chunk, main
+
+
+def test_chunk_estimates_rows_with_ratings_and_eaf_override():
+    rows = [
+        {"name": "a", "kloc": "10", "project_type": "organic", "RELY": "High"},
+        {"name": "b", "kloc": 20, "project_type": "embedded", "eaf": "0.9"},
+    ]
+    out = estimate_chunk(1, rows)
+
+    assert [r["name"] for r in out] == ["a", "b"]
+    assert out[0]["EAF"] == 1.15
+    assert out[1]["EAF"] == 0.9
+
+
+@pytest.mark.parametrize("row, message", [
+    ({"kloc": 10, "project_type": "organic", "eaf": -1}, "Row 1: eaf must be a positive number"),
+    ({"kloc": 10, "project_type": "organic", "eaf": "nan"}, "Row 1: eaf must be a positive number"),
+    ({"kloc": 10, "project_type": "organic", "eaf": "high"}, "Row 1: invalid eaf"),
+    ({"kloc": 0, "project_type": "organic"}, "Row 1: kloc must be a positive number"),
+    ({"kloc": None, "project_type": "organic"}, "Row 1: invalid kloc"),
+    ({"project_type": "organic"}, "Row 1: missing kloc"),
+    (5, "Row 1: expected an object, got int"),
+    ([1], "Row 1: expected an object, got list"),
+])
+def test_bad_rows_raise_value_error(row, message):
+    with pytest.raises(ValueError, match=message):
+        estimate_chunk(1, [row])
+
+
+def test_bad_jsonl_row_fails_the_run_without_output(tmp_path, capsys):
+    src = tmp_path / "in.jsonl"
+    src.write_text(json.dumps({"kloc": 10, "project_type": "organic"}) + "\n"
+                   + json.dumps({"kloc": 10, "project_type": "organic", "eaf": -1}) + "\n")
+
+    assert main([str(src), "-o", str(tmp_path / "out.jsonl"), "--chunk-size", "1"]) == 1
+    assert "Row 2: eaf must be a positive number" in capsys.readouterr().err
+
+
+def test_failed_columns_run_leaves_no_readable_store(tmp_path, capsys):
+    from records import open_columns
+
+    src = tmp_path / "in.jsonl"
+    src.write_text(json.dumps({"kloc": 10, "project_type": "organic"}) + "\n"
+                   + json.dumps({"kloc": 10, "project_type": "organic", "eaf": -1}) + "\n")
+    out = tmp_path / "bad.cols"
+
+    assert main([str(src), "-o", str(out), "--chunk-size", "1"]) == 1
+    assert "Row 2: eaf must be a positive number" in capsys.readouterr().err
+    assert (out / "col_000.bin").exists()
+    with pytest.raises(ValueError, match="Not a complete result directory"):
+        open_columns(out)
@@ -0,0 +1,33 @@
+import numpy as np
+import pytest
+
+from cocomo import COCOMO, PROJECT_TYPES
+
+
+def test_batch_matches_scalar_estimates():
+    model = COCOMO()
+    kloc = [0.5, 12.0, 40.0, 250.0, 1000.0]
+    types = ["organic", "semi-detached", "embedded", "organic", "embedded"]
+    eaf = [1.0, 0.85, 1.3, 1.12, 0.7]
+
+    batch = model.calculate_effort_batch(kloc, types, eaf)
+    for i, (k, t, e) in enumerate(zip(kloc, types, eaf)):
+        scalar = model.calculate_effort(k, t, {"EAF": e})
+        assert {key: float(values[i]) for key, values in batch.items()} == scalar
+
+
+def test_batch_accepts_codes_and_broadcasts_multi_dimensional_input():
+    model = COCOMO()
+    kloc = np.array([[10.0, 20.0, 30.0], [40.0, 50.0, 60.0]])
+    codes = np.array([0, 1, 2])
+
+    batch = model.calculate_effort_batch(kloc, codes, 1.1, round_results=False)
+    assert batch["Effort (PM)"].shape == kloc.shape
+    for (row, col), k in np.ndenumerate(kloc):
+        a, b, c, d = model.coefficients[PROJECT_TYPES[col]]
+        assert batch["Effort (PM)"][row, col] == pytest.approx(a * k ** b * 1.1)
+
+
+def test_batch_rejects_unknown_project_type():
+    with pytest.raises(ValueError, match="Invalid project type"):
+        COCOMO().calculate_effort_batch([10.0], ["huge"], [1.0])
@@ -0,0 +1,38 @@
+import pytest
+
+from detailed import DetailedCOCOMO, phase_multiplier_table
+
+
+SPEC = {
+    "name": "System",
+    "children": [
+        {"name": "Core", "ratings": {"TOOL": "High"}, "children": [
+            {"name": "Parser", "kloc": 12, "ratings": {"TOOL": "Low"}},
+            {"name": "Planner", "kloc": 8},
+        ]},
+    ],
+}
+
+
+def test_module_rating_overrides_inherited_rating():
+    model = DetailedCOCOMO.from_dict(SPEC, "organic")
+    table = phase_multiplier_table()
+
+    assert model.module_eaf("Parser") == pytest.approx(table["TOOL"]["Low"])
+    assert model.module_eaf("Planner") == pytest.approx(table["TOOL"]["High"])
+    assert model.estimate("Parser")["EAF"] == table["TOOL"]["Low"][0]
+
+
+def test_incremental_override_edits_match_rebuild():
+    model = DetailedCOCOMO.from_dict(SPEC, "organic")
+    model.set_rating("Core", "TOOL", "Very High")
+    model.set_rating("System", "TOOL", "Very Low")
+    model.set_rating("Parser", "TOOL", None)
+    model.set_rating("Planner", "TOOL", "Nominal")
+    model.set_rating("Core", "TOOL", None)
+    incremental = model.estimate()
+
+    model.rebuild()
+    assert incremental == model.estimate()
+    assert model.module_eaf("Parser") == pytest.approx(phase_multiplier_table()["TOOL"]["Very Low"])
+    assert model.module_eaf("Planner") == pytest.approx((1.0,) * 4)
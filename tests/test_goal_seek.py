@@ -0,0 +1,25 @@
+import pytest
+
+from cocomo import COCOMO
+from goal_seek import cheapest_driver_mix, max_kloc
+
+
+def test_max_kloc_inverts_the_effort_equation():
+    result = max_kloc("organic", max_effort=100.0)
+    effort = COCOMO().calculate_effort(result["KLOC"], "organic", {})["Effort (PM)"]
+    assert effort == pytest.approx(100.0, abs=0.05)
+    assert result["Binding Constraint"] == "effort"
+
+
+def test_cheapest_mix_meets_the_cap_and_is_sorted_by_cost():
+    solutions, _ = cheapest_driver_mix(50, "embedded", max_effort=250, max_solutions=3)
+
+    assert solutions
+    assert all(s["Effort (PM)"] <= 250 for s in solutions)
+    assert [s["Cost"] for s in solutions] == sorted(s["Cost"] for s in solutions)
+
+
+@pytest.mark.parametrize("max_solutions", [0, -1])
+def test_cheapest_mix_rejects_non_positive_max_solutions(max_solutions):
+    with pytest.raises(ValueError, match="max_solutions"):
+        cheapest_driver_mix(50, "embedded", max_effort=250, max_solutions=max_solutions)
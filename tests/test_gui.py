@@ -0,0 +1,55 @@
+import threading
+
+from gui import BackgroundTask
+
+
+class FakeRoot:
+    """Runs root.after callbacks on demand instead of from a Tk main loop."""
+
+    def __init__(self):
+        self.pending = []
+
+    def after(self, delay, callback):
+        self.pending.append(callback)
+
+    def pump(self):
+        while self.pending:
+            self.pending.pop(0)()
+
+
+def _task(work, **callbacks):
+    root = FakeRoot()
+    seen = {"done": [], "discarded": [], "progress": []}
+    task = BackgroundTask(root, work, 2, lambda *args: seen["progress"].append(args[0]),
+                          seen["done"].append, None, seen["discarded"].append)
+    return root, task, seen
+
+
+def test_finished_task_delivers_its_result():
+    root, task, seen = _task(lambda step: step("working") or "report.docx")
+    task.start()
+    while task.running():
+        root.pump()
+
+    assert seen["done"] == ["report.docx"]
+    assert seen["discarded"] == []
+
+
+def test_cancel_after_the_last_step_discards_the_result():
+    finished = threading.Event()
+
+    def work(step):
+        step("Writing report...")
+        finished.set()
+        return "report.docx"
+
+    root, task, seen = _task(work)
+    task.start()
+    finished.wait(5)
+    task.cancel()
+    while task.running():
+        root.pump()
+
+    assert seen["done"] == []
+    assert seen["discarded"] == ["report.docx"]
+    assert seen["progress"][-1] == "Cancelled"
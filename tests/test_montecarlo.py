@@ -0,0 +1,30 @@
+from montecarlo import MonteCarloEstimator
+
+
+def test_same_seed_gives_same_summary_for_any_worker_count():
+    estimator = MonteCarloEstimator(chunk_size=5_000)
+    weights = {"RELY": {"Low": 1, "Nominal": 2, "High": 1}}
+    kloc = ("triangular", 20, 40, 80)
+
+    serial = estimator.run(kloc, "organic", weights, draws=10_000, seed=42, workers=1)
+    parallel = estimator.run(kloc, "organic", weights, draws=10_000, seed=42, workers=4)
+
+    assert serial == parallel
+
+
+def test_default_chunk_size_still_shards_across_workers():
+    estimator = MonteCarloEstimator()
+    kloc = ("lognormal", 50, 0.4)
+
+    partials = list(estimator.stream(kloc, "embedded", draws=300_000, seed=7, workers=2))
+    serial = estimator.run(kloc, "embedded", draws=300_000, seed=7, workers=1)
+
+    assert len(partials) == 2
+    assert partials[-1] == serial
+
+
+def test_draws_outside_the_histogram_range_are_counted():
+    summary = MonteCarloEstimator().run(1e7, "organic", draws=1_000, seed=1)
+
+    assert summary["Effort (PM)"]["Clipped"] == 1_000
+    assert summary["Development Time (Months)"]["Clipped"] == 0
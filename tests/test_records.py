@@ -0,0 +1,33 @@
+import pytest
+
+from records import ColumnWriter, open_columns
+
+COLUMNS = {"name": "str", "Effort (PM)": "f8"}
+
+
+def test_columns_round_trip(tmp_path):
+    path = tmp_path / "run.cols"
+    with ColumnWriter(path, COLUMNS, {"model": "cocomo81"}) as writer:
+        writer.append({"name": ["a", "b"], "Effort (PM)": [1.5, 2.5]})
+        writer.append_rows([{"name": "c", "Effort (PM)": 3.5}])
+
+    columns = open_columns(path)
+    assert len(columns) == 3
+    assert columns.meta == {"model": "cocomo81"}
+    assert columns["name"][:] == ["a", "b", "c"]
+    assert columns["Effort (PM)"].tolist() == [1.5, 2.5, 3.5]
+
+
+def test_failed_write_leaves_no_readable_directory(tmp_path):
+    path = tmp_path / "run.cols"
+    with ColumnWriter(path, COLUMNS) as writer:
+        writer.append({"name": ["a"], "Effort (PM)": [1.0]})
+
+    with pytest.raises(RuntimeError):
+        with ColumnWriter(path, COLUMNS) as writer:
+            writer.append({"name": ["b"], "Effort (PM)": [2.0]})
+            raise RuntimeError("estimate failed")
+
+    assert not (path / "meta.json").exists()
+    with pytest.raises(ValueError, match="Not a complete result directory"):
+        open_columns(path)
@@ -0,0 +1,69 @@
+import random
+import time
+
+from scheduler import demand_profile, schedule
+
+
+def test_project_waits_for_capacity_ramp():
+    project = {"Effort (PM)": 50, "Development Time (Months)": 10}
+    result = schedule([project], [0] * 20 + [10])
+
+    row = result["Projects"][0]
+    assert row["Scheduled"]
+    assert row["Start"] == 20
+    assert result["Capacity"][19:21] == [0.0, 10.0]
+
+
+def test_constant_capacity_starts_immediately():
+    project = {"Effort (PM)": 50, "Development Time (Months)": 10}
+    row = schedule([project], 10)["Projects"][0]
+    assert (row["Start"], row["Finish"]) == (0, 10)
+
+
+def _first_fit(projects, capacity, profile):
+    # Month-by-month reference: try every start until the whole profile fits
+    order = sorted(range(len(projects)), key=lambda i: (projects[i]["priority"], projects[i]["earliest_start"], i))
+    load, starts = {}, {}
+    for i in order:
+        project = projects[i]
+        demand = demand_profile(project["Effort (PM)"], project["Development Time (Months)"], profile)
+        if max(demand) > capacity:
+            starts[i] = None
+            continue
+        start = project["earliest_start"]
+        while any(load.get(start + m, 0.0) + d > capacity + 1e-9 for m, d in enumerate(demand)):
+            start += 1
+        for m, d in enumerate(demand):
+            load[start + m] = load.get(start + m, 0.0) + d
+        starts[i] = start
+    return [starts[i] for i in range(len(projects))]
+
+
+def test_matches_month_by_month_first_fit():
+    rng = random.Random(7)
+    for profile in ("flat", "rayleigh"):
+        for _ in range(20):
+            projects = [{"Effort (PM)": rng.uniform(1, 200), "Development Time (Months)": rng.uniform(1, 20),
+                         "priority": rng.randint(0, 3), "earliest_start": rng.randint(0, 30)}
+                        for _ in range(rng.randint(1, 60))]
+            capacity = rng.uniform(15, 40)
+            rows = schedule(projects, capacity, profile)["Projects"]
+            assert [row["Start"] for row in rows] == _first_fit(projects, capacity, profile)
+
+
+def test_scales_to_a_large_saturated_portfolio():
+    rng = random.Random(0)
+    projects = []
+    for _ in range(20_000):
+        months = rng.uniform(6, 30)
+        projects.append({"Effort (PM)": rng.uniform(2, 40) * months, "Development Time (Months)": months,
+                         "priority": rng.randint(0, 5), "earliest_start": rng.randint(0, 24)})
+
+    started = time.perf_counter()
+    result = schedule(projects, 400)
+    elapsed = time.perf_counter() - started
+
+    assert all(row["Scheduled"] for row in result["Projects"])
+    assert result["Average Utilization"] > 0.9
+    # Rescanning the crowded months for every project took minutes here
+    assert elapsed < 30
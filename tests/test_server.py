@@ -0,0 +1,64 @@
+import asyncio
+import json
+
+import pytest
+
+from server import BULK_CHUNK, EstimationServer
+
+
+async def _post(path, payload):
+    server = await EstimationServer("127.0.0.1", 0).start()
+    try:
+        reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+        body = payload if isinstance(payload, bytes) else json.dumps(payload).encode()
+        writer.write(f"POST {path} HTTP/1.1\r\nContent-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode()
+                     + body)
+        await writer.drain()
+        response = await reader.read()
+        writer.close()
+    finally:
+        await server.stop()
+    head, _, body = response.partition(b"\r\n\r\n")
+    return int(head.split()[1]), body
+
+
+def post(path, payload):
+    return asyncio.run(_post(path, payload))
+
+
+def _chunks(body):
+    """Decode a chunked transfer-encoded body into NDJSON records."""
+    records = []
+    while True:
+        size, _, body = body.partition(b"\r\n")
+        size = int(size, 16)
+        if not size:
+            return records
+        records += [json.loads(line) for line in body[:size].splitlines()]
+        body = body[size + 2:]
+
+
+def test_single_estimate():
+    status, body = post("/estimate", {"kloc": 10, "project_type": "organic"})
+    assert status == 200
+    assert json.loads(body)["Effort (PM)"] == 26.93
+
+
+@pytest.mark.parametrize("path", ["/estimate", "/estimate/bulk"])
+@pytest.mark.parametrize("eaf", [-1, 0, "nan"])
+def test_invalid_eaf_is_a_bad_request(path, eaf):
+    record = {"kloc": 10, "project_type": "organic", "eaf": eaf}
+    status, body = post(path, [record] if path.endswith("bulk") else record)
+    assert status == 400
+    assert "eaf" in json.loads(body)["error"]
+
+
+def test_bulk_error_after_the_first_chunk_is_reported_in_band():
+    good = {"kloc": 10, "project_type": "organic"}
+    records = [good] * BULK_CHUNK + [dict(good, eaf=-1)]
+    status, body = post("/estimate/bulk", records)
+
+    rows = _chunks(body)
+    assert status == 200
+    assert len(rows) == BULK_CHUNK + 1
+    assert "eaf must be a positive number" in rows[-1]["error"]
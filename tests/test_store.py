@@ -0,0 +1,92 @@
+import sqlite3
+
+import numpy as np
+import pytest
+
+import store
+from cocomo import COCOMO
+from store import EstimateStore
+
+
+@pytest.fixture
+def db():
+    with EstimateStore(":memory:") as s:
+        yield s
+
+
+def test_batch_path_records_scalar_and_multi_dimensional_batches(db):
+    model = COCOMO(store=db)
+    model.calculate_effort_batch(10.0, "organic", 1.0)
+    batch = model.calculate_effort_batch([[10.0, 20.0], [30.0, 40.0]], [0, 2], 1.1)
+
+    assert db.count() == 5
+    stored = db.query(project_type="embedded", order_by="effort ASC")
+    assert [r["kloc"] for r in stored] == [20.0, 40.0]
+    assert [r["effort"] for r in stored] == batch["Effort (PM)"][:, 1].tolist()
+
+
+def test_calculate_effort_records_unless_told_not_to(db):
+    model = COCOMO(store=db)
+    model.calculate_effort(10, "organic", {}, "preview", record=False)
+    model.calculate_effort(10, "organic", {}, "saved")
+
+    assert [r["project_name"] for r in db.query()] == ["saved"]
+
+
+def test_batch_rows_match_scalar_records(db):
+    kloc = np.array([5.0, 50.0, 500.0])
+    COCOMO(store=db).calculate_effort_batch(kloc, ["organic", "semi-detached", "embedded"], [1.0, 0.9, 1.2])
+
+    scalar = COCOMO()
+    for row in db.query(order_by="effort ASC"):
+        expected = scalar.calculate_effort(row["kloc"], row["project_type"], {"EAF": row["eaf"]})
+        assert (row["effort"], row["time"], row["staff"]) == (expected["Effort (PM)"],
+                                                              expected["Development Time (Months)"],
+                                                              expected["Average Staff"])
+
+
+def _results(effort):
+    return {"Effort (PM)": effort, "Development Time (Months)": 10.0, "Average Staff": effort / 10, "EAF": 1.0}
+
+
+def test_date_rollups_and_filters(db):
+    for created_at, effort in [("2026-01-05 09:00:00", 10.0), ("2026-01-05 17:00:00", 30.0),
+                               ("2026-01-20 12:00:00", 20.0), ("2026-02-01 08:00:00", 40.0)]:
+        db.record(10, "organic", _results(effort), created_at=created_at)
+
+    months = db.rollup("month")
+    assert [(r["month"], r["Count"], r["Total Effort (PM)"], r["Mean Effort (PM)"], r["Max Effort (PM)"])
+            for r in months] == [("2026-01", 3, 60.0, 20.0, 30.0), ("2026-02", 1, 40.0, 40.0, 40.0)]
+    assert [(r["day"], r["Count"]) for r in db.rollup("day")] == [("2026-01-05", 2), ("2026-01-20", 1),
+                                                                 ("2026-02-01", 1)]
+    assert db.rollup("month", since="2026-01-05 12:00:00", until="2026-02-01")[0]["Count"] == 2
+
+
+def test_old_databases_gain_the_day_bucket(tmp_path):
+    path = str(tmp_path / "old.db")
+    conn = sqlite3.connect(path)
+    conn.executescript("""
+        CREATE TABLE estimates (id INTEGER PRIMARY KEY, created_at TEXT NOT NULL, project_name TEXT,
+            project_type TEXT NOT NULL, kloc REAL NOT NULL, cost_drivers TEXT, coefficients_version TEXT NOT NULL,
+            effort REAL NOT NULL, time REAL NOT NULL, staff REAL NOT NULL, eaf REAL NOT NULL);
+        CREATE INDEX idx_estimates_created ON estimates (created_at, effort, time, staff);
+    """)
+    conn.execute("INSERT INTO estimates (created_at, project_type, kloc, coefficients_version, effort, time,"
+                 " staff, eaf) VALUES ('2025-12-31 23:00:00', 'organic', 10, 'boehm-1981', 26.93, 8.74, 3.08, 1)")
+    conn.commit()
+    conn.close()
+
+    with EstimateStore(path) as db:
+        assert db.rollup("month")[0]["month"] == "2025-12"
+        indexes = {r[1] for r in db.conn.execute("PRAGMA index_list(estimates)")}
+    assert indexes == set(store.INDEXES)
+
+
+def test_large_batches_rebuild_the_indexes(db, monkeypatch):
+    monkeypatch.setattr(store, "REBUILD_MIN_ROWS", 10)
+    COCOMO(store=db).calculate_effort_batch(np.linspace(1, 100, 50), "organic", 1.0)
+
+    assert db.count() == 50
+    assert {r[1] for r in db.conn.execute("PRAGMA index_list(estimates)")} == set(store.INDEXES)
+    plan = db.conn.execute("EXPLAIN QUERY PLAN SELECT day, SUM(effort) FROM estimates GROUP BY day").fetchall()
+    assert "idx_estimates_day" in plan[0][-1]